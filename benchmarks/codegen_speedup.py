@@ -0,0 +1,60 @@
+"""Micro-benchmark of solving a nonlinear MPC with the NLP functions evaluated
+symbolically and with the same functions compiled via ``init_solver(codegen=True)``.
+
+A nonlinear MPC (built via :meth:`csnlp.wrappers.Mpc.set_nonlinear_dynamics`) is solved
+repeatedly with ``ipopt``, and the average time per solve is reported in both cases,
+together with the time taken to build (or reload) the solver.
+
+Run with ``python benchmarks/codegen_speedup.py``.
+"""
+
+import tempfile
+from time import perf_counter
+from timeit import repeat
+
+import casadi as cs
+import numpy as np
+
+from csnlp import Nlp
+from csnlp.wrappers import Mpc
+
+N = 40
+NUMBER = 20
+OPTS = {"expand": True, "print_time": False, "ipopt": {"print_level": 0, "sb": "yes"}}
+
+
+def build_mpc() -> Mpc:
+    mpc = Mpc(Nlp(name="pendulum"), N)
+    x, _ = mpc.state("x", 2)
+    u, _ = mpc.action("u", lb=-2, ub=2)
+    dt = 0.05
+
+    def f(x, u):
+        return x + dt * cs.vertcat(x[1], -9.81 * cs.sin(x[0]) - 0.1 * x[1] + u)
+
+    mpc.set_nonlinear_dynamics(f)
+    mpc.minimize(cs.sumsqr(x) + 0.1 * cs.sumsqr(u))
+    return mpc
+
+
+def time_it(func) -> float:
+    """Returns the best average time per call, in milliseconds."""
+    return min(repeat(func, number=NUMBER, repeat=3)) / NUMBER * 1e3
+
+
+def main() -> None:
+    pars = {"x_0": np.asarray([np.pi / 2, 0.0])}
+    print(f"{'':<14}{'build [s]':>12}{'solve [ms]':>12}")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        runs = (("symbolic", False), ("compiled", True), ("reloaded", True))
+        for label, codegen in runs:
+            mpc = build_mpc()
+            t0 = perf_counter()
+            mpc.init_solver(OPTS, cache_dir=cache_dir, codegen=codegen)
+            t_build = perf_counter() - t0
+            t_solve = time_it(lambda: mpc.solve(pars))
+            print(f"{label:<14}{t_build:>12.3f}{t_solve:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
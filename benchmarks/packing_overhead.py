@@ -0,0 +1,46 @@
+"""Micro-benchmark of packing the parameters' values of an NLP into the flat vector that
+is passed to the solver.
+
+An NLP with many parameters is built, and the average time to pack a dictionary of
+values is reported for symbolic substitution via
+:func:`csnlp.core.solutions.subsevalf` (as it used to be done at every solve) and for
+:meth:`csnlp.core.layout.VectorLayout.pack`.
+
+Run with ``python benchmarks/packing_overhead.py``.
+"""
+
+from timeit import repeat
+
+import numpy as np
+
+from csnlp import Nlp
+from csnlp.core.solutions import subsevalf
+
+N_PARS = 1000
+NUMBER = 100
+
+
+def time_it(func) -> float:
+    """Returns the best average time per call, in microseconds."""
+    return min(repeat(func, number=NUMBER, repeat=5)) / NUMBER * 1e6
+
+
+def main() -> None:
+    np_random = np.random.default_rng(42)
+    nlp = Nlp()
+    pars = {}
+    for i in range(N_PARS):
+        shape = tuple(np_random.integers(1, 4, size=2))
+        nlp.parameter(f"p{i}", shape)
+        pars[f"p{i}"] = np_random.normal(size=shape)
+    layout = nlp._p_layout
+
+    t_subsevalf = time_it(lambda: subsevalf(nlp.p, nlp.parameters, pars))
+    t_pack = time_it(lambda: layout.pack(pars))
+    print(f"packing {N_PARS} parameters (np={nlp.np})")
+    print(f"{'subsevalf [us]':<16}{t_subsevalf:>12.2f}")
+    print(f"{'pack [us]':<16}{t_pack:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
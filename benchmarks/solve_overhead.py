@@ -0,0 +1,69 @@
+"""Micro-benchmark of the per-solve overhead of :meth:`csnlp.Nlp.solve`.
+
+A small QP (of the kind solved at high rates in MPC loops) is solved repeatedly with
+``qrqp``, and the average time per solve is reported when the static solver arguments
+(``lbx``, ``ubx``, ``lbg`` and ``ubg``) are rebuilt at every call (as they used to be)
+and when they are taken from the cache. The time spent just building the arguments is
+reported as well, together with the time per call of :meth:`csnlp.Nlp.solve_raw`.
+
+Run with ``python benchmarks/solve_overhead.py``.
+"""
+
+from timeit import repeat
+
+import numpy as np
+
+from csnlp import Nlp
+from csnlp.core.cache import invalidate_cache
+
+N_VARS = 40
+N_CONS = 20
+NUMBER = 500
+
+
+def build_qp() -> Nlp:
+    np_random = np.random.default_rng(42)
+    nlp = Nlp()
+    x = nlp.variable("x", (N_VARS, 1), lb=-10, ub=10)[0]
+    p = nlp.parameter("p", (N_VARS, 1))
+    A = np_random.normal(size=(N_CONS, N_VARS))
+    nlp.constraint("c_eq", A[: N_CONS // 2] @ x, "==", 0)
+    nlp.constraint("c_ineq", A[N_CONS // 2 :] @ x, "<=", 1)
+    nlp.minimize(0.5 * (x.T @ x) + p.T @ x)
+    nlp.init_solver({"print_iter": False, "print_header": False}, "qrqp", "conic")
+    return nlp
+
+
+def time_it(func) -> float:
+    """Returns the best average time per call, in microseconds."""
+    return min(repeat(func, number=NUMBER, repeat=5)) / NUMBER * 1e6
+
+
+def main() -> None:
+    nlp = build_qp()
+    pars = {"p": np.ones(N_VARS)}
+    clear_args_cache = invalidate_cache(Nlp._static_solver_args)(lambda _: None)
+
+    def args_rebuilt():
+        clear_args_cache(nlp)
+        return nlp._static_solver_args
+
+    def solve_rebuilt():
+        clear_args_cache(nlp)
+        return nlp.solve(pars)
+
+    t_args_before = time_it(args_rebuilt)
+    t_args_after = time_it(lambda: nlp._static_solver_args)
+    t_solve_before = time_it(solve_rebuilt)
+    t_solve_after = time_it(lambda: nlp.solve(pars))
+    p = nlp.layout.p.pack(pars)
+    t_solve_raw = time_it(lambda: nlp.solve_raw(p))
+
+    print(f"{'':<20}{'rebuilt [us]':>14}{'cached [us]':>14}")
+    print(f"{'solver arguments':<20}{t_args_before:>14.2f}{t_args_after:>14.2f}")
+    print(f"{'whole solve':<20}{t_solve_before:>14.2f}{t_solve_after:>14.2f}")
+    print(f"{'raw solve':<20}{'':>14}{t_solve_raw:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,12 @@ Overview
 
 It contains the following submodules:
 
+- :mod:`csnlp.core.aio`: contains a mixin class that exposes the solve methods of
+  :class:`csnlp.Nlp` and of its wrappers as asyncio coroutines, which run the solver in
+  an executor with back-pressure, timeouts and cancellation.
+- :mod:`csnlp.core.bounds`: contains a growable storage for the lower and upper bounds
+  of the primal variables of an instance of :class:`csnlp.Nlp`, which keeps track of
+  where each variable's bounds are located.
 - :mod:`csnlp.core.cache`: a collection of methods to handle caching in the package. In
   particular, it offers a decorator :func:`invalidate_cache` that allows to invalidate
   the cache of a given set of other cached properties or methods when the decorated
@@ -21,13 +27,37 @@ It contains the following submodules:
   CasADi does not support jacobian or hessian for matrices (or at least, they will be
   flattened). These  "higher-order" functions allows to compute the jacobian and hessian
   of a matrix w.r.t. another matrix.
+- :mod:`csnlp.core.hooks`: contains a mixin class that allows to register lightweight
+  callbacks around the solve path of :class:`csnlp.Nlp` and of its wrappers, e.g., for
+  profiling and tracing.
+- :mod:`csnlp.core.layout`: contains classes describing how named symbols are laid out
+  in the flat vectors passed to the solver, which allow to pack and unpack numerical
+  values into and from such vectors without symbolic substitutions.
+- :mod:`csnlp.core.monitor`: contains a monitor of the iterations of NLP solvers, built
+  on CasADi's ``iteration_callback``, which records convergence traces and allows to
+  stop the solver early, e.g., under a time budget.
 - :mod:`csnlp.core.scaling`: a collection of classes to perform scaling of variables in
   an :class:`csnlp.Nlp` instance wrapped with :class:`csnlp.wrappers.NlpScaling`. The
   classes in this module inform the wrapper on which variables or parameters to scale
   and how to scale them.
+- :mod:`csnlp.core.shm`: contains a collection of named arrays laid out in a single
+  block of shared memory, to exchange the inputs and outputs of solvers with worker
+  processes without pickling them.
 - :mod:`csnlp.core.solutions`: contains classes and methods to store the solution of an
   NLP problem after a call to :meth:`csnlp.Nlp.solve` or
   :meth:`csnlp.multistart.MultistartNlp.solve_multi`.
+- :mod:`csnlp.core.solver_cache`: contains a persistent, on-disk cache of solvers,
+  keyed by a structural fingerprint of the NLP, so that identical solvers built in
+  different processes are only constructed once. It also handles code generation and
+  compilation of the NLP functions into cached shared libraries.
+- :mod:`csnlp.core.solver_pool`: contains a thread-safe pool of independent instances
+  of the solver of an instance of :class:`csnlp.Nlp`, which allows to serve solves from
+  multiple threads at once, each with its own stats, and a persistent pool of worker
+  processes, each holding a copy of the solver, e.g., for
+  :meth:`csnlp.Nlp.solve_batch`.
+- :mod:`csnlp.core.telemetry`: contains a bounded ring buffer of the timings and solver
+  statistics of the solves of an instance of :class:`csnlp.Nlp`, with percentile
+  summaries and an exporter to a plain-text metrics format.
 
 Submodules
 ==========
@@ -36,10 +66,19 @@ Submodules
    :toctree: generated
    :template: module.rst
 
+   aio
+   bounds
    cache
    data
    debug
    derivatives
+   hooks
+   layout
+   monitor
    scaling
+   shm
    solutions
+   solver_cache
+   solver_pool
+   telemetry
 """
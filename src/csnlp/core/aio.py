@@ -0,0 +1,128 @@
+"""Contains a mixin class that exposes the solve methods of instances of
+:class:`csnlp.Nlp` and of its wrappers as coroutines, which run the blocking call to the
+solver in an executor, so that many NLPs can be served from a single asyncio event
+loop."""
+
+import asyncio
+from concurrent.futures import Executor
+from functools import partial
+from typing import Any, Callable, Optional, TypeVar
+from weakref import WeakKeyDictionary
+
+T = TypeVar("T")
+
+
+class _AsyncState:
+    """Internal state of the asynchronous solves of an instance."""
+
+    __slots__ = ("executor", "max_in_flight", "in_flight", "semaphore", "loop")
+
+    def __init__(self, executor: Optional[Executor], max_in_flight: int) -> None:
+        self.executor = executor
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.semaphore: Optional[asyncio.Semaphore] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def release(
+        self, semaphore: asyncio.Semaphore, future: Optional[asyncio.Future]
+    ) -> None:
+        """Releases the slot of a solve once its call in the executor is done."""
+        if semaphore is self.semaphore:  # otherwise, the loop has changed since
+            self.in_flight -= 1
+            semaphore.release()
+        if future is not None and not future.cancelled():
+            future.exception()  # mark as retrieved, e.g., if the caller timed out
+
+
+_ASYNC_STATES: "WeakKeyDictionary[Any, _AsyncState]" = WeakKeyDictionary()
+"""States of the asynchronous solves. They are kept out of the instances, so that these
+can still be copied and pickled (executors and semaphores can be neither)."""
+
+
+class SupportsAsyncSolve:
+    """Mixin class that allows to run the (blocking) solve methods of an instance as
+    coroutines (e.g., :meth:`csnlp.Nlp.solve_async`), so that the calls to the solver
+    do not stall the event loop. Each call is run in an executor (by default, the
+    loop's default one), and is subject to
+
+    - back-pressure: at most ``max_in_flight`` solves of the instance are handed to the
+      executor at once, while the others wait for a free slot
+    - timeouts: if a solve takes longer than its ``timeout``,
+      :class:`asyncio.TimeoutError` is raised
+    - cancellation: the waiting coroutine can be cancelled at any time.
+
+    Since a call running in a thread cannot be interrupted, a solve that timed out or
+    was cancelled keeps running in the executor until completion (and keeps its slot
+    until then), and its result is discarded. To bound the solver's run itself, see the
+    ``deadline`` argument of :meth:`csnlp.Nlp.solve`.
+
+    The configuration (see :meth:`init_async`) is per instance, and is neither copied
+    nor pickled with it.
+    """
+
+    def init_async(
+        self, executor: Optional[Executor] = None, max_in_flight: int = 1
+    ) -> None:
+        """Configures the asynchronous solves of this instance.
+
+        Parameters
+        ----------
+        executor : concurrent.futures.Executor, optional
+            Executor in which to run the solves. By default, ``None``, i.e., the default
+            executor of the running event loop.
+        max_in_flight : int, optional
+            Maximum number of solves of this instance that can be run at once. By
+            default, ``1``, i.e., the solves are run one at a time, which also ensures
+            that the stats of the solver attached to each solution are the ones of its
+            own run. Larger values are only safe for solvers that can be called
+            concurrently.
+
+        Raises
+        ------
+        ValueError
+            Raises if ``max_in_flight`` is not positive; or if solves are in flight.
+        """
+        if max_in_flight < 1:
+            raise ValueError("Maximum number of in-flight solves must be positive.")
+        if self.solves_in_flight:
+            raise ValueError("Cannot configure while solves are in flight.")
+        _ASYNC_STATES[self] = _AsyncState(executor, max_in_flight)
+
+    @property
+    def solves_in_flight(self) -> int:
+        """Gets the number of asynchronous solves of this instance currently running in
+        the executor."""
+        state = _ASYNC_STATES.get(self)
+        return 0 if state is None else state.in_flight
+
+    async def _run_async(
+        self, func: Callable[..., T], timeout: Optional[float], *args: Any
+    ) -> T:
+        """Internal utility to run the given blocking function in the executor, subject
+        to the back-pressure of this instance and to the given timeout (which includes
+        the wait for a free slot)."""
+        state = _ASYNC_STATES.get(self)
+        if state is None:
+            state = _ASYNC_STATES[self] = _AsyncState(None, 1)
+        loop = asyncio.get_running_loop()
+        if state.loop is not loop:
+            # semaphores are bound to the loop they are used in, and the solves still in
+            # flight in a previous loop can no longer notify their completion
+            state.semaphore = asyncio.Semaphore(state.max_in_flight)
+            state.loop = loop
+            state.in_flight = 0
+        semaphore = state.semaphore
+
+        async def run() -> T:
+            await semaphore.acquire()
+            state.in_flight += 1
+            try:
+                future = loop.run_in_executor(state.executor, partial(func, *args))
+            except BaseException:
+                state.release(semaphore, None)
+                raise
+            future.add_done_callback(partial(state.release, semaphore))
+            return await asyncio.shield(future)
+
+        return await asyncio.wait_for(run(), timeout)
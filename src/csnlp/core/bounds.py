@@ -0,0 +1,174 @@
+"""Contains a growable storage for the lower and upper bounds of the primal variables of
+an instance of :class:`csnlp.Nlp`. Bounds are kept in preallocated arrays that grow
+geometrically, so that adding variables one at a time costs amortised constant time per
+entry, and each variable's location in the bound vectors is indexed by name."""
+
+from typing import Literal, Optional, Union
+
+import numpy as np
+import numpy.typing as npt
+
+
+class BoundsStore:
+    """Storage for the lower and upper bounds of the primal variables of an NLP, with
+    amortised-growth arrays and a name-to-slice index of the variables.
+
+    Parameters
+    ----------
+    remove_redundant : bool, optional
+        If ``True``, then redundant bounds (i.e., ``-inf`` lower bounds and ``+inf``
+        upper bounds) are masked. By default, ``True``.
+    capacity : int, optional
+        Initial capacity of the arrays. By default, ``16``.
+    """
+
+    def __init__(self, remove_redundant: bool = True, capacity: int = 16) -> None:
+        self.remove_redundant = remove_redundant
+        self._n = 0
+        self._lb = np.empty(capacity, dtype=float)
+        self._ub = np.empty(capacity, dtype=float)
+        self._lb_mask = np.empty(capacity, dtype=bool)
+        self._ub_mask = np.empty(capacity, dtype=bool)
+        self._slices: dict[str, slice] = {}
+
+    def __len__(self) -> int:
+        """Gets the number of bounded entries, i.e., the number of primal variables."""
+        return self._n
+
+    @property
+    def lb(self) -> npt.NDArray[np.floating]:
+        """Gets the lower bounds as a vector (a view of the internal storage)."""
+        return self._lb[: self._n]
+
+    @property
+    def ub(self) -> npt.NDArray[np.floating]:
+        """Gets the upper bounds as a vector (a view of the internal storage)."""
+        return self._ub[: self._n]
+
+    @property
+    def lb_mask(self) -> npt.NDArray[np.bool_]:
+        """Gets the mask of redundant lower bounds (a view of the internal storage)."""
+        return self._lb_mask[: self._n]
+
+    @property
+    def ub_mask(self) -> npt.NDArray[np.bool_]:
+        """Gets the mask of redundant upper bounds (a view of the internal storage)."""
+        return self._ub_mask[: self._n]
+
+    @property
+    def slices(self) -> dict[str, slice]:
+        """Gets the slices of each variable in the bound vectors."""
+        return self._slices
+
+    def masked(self, which: Literal["lb", "ub"]) -> np.ma.MaskedArray:
+        """Gets the lower or upper bounds as a masked array, where redundant bounds are
+        masked (if ``remove_redundant=True``).
+
+        Parameters
+        ----------
+        which : {"lb", "ub"}
+            Which bounds to return.
+
+        Returns
+        -------
+        np.ma.MaskedArray
+            The masked vector of bounds. Its mask is :data:`numpy.ma.nomask` if no
+            entry is masked.
+        """
+        if which == "lb":
+            data, mask, fill_value = self.lb, self.lb_mask, -np.inf
+        else:
+            data, mask, fill_value = self.ub, self.ub_mask, +np.inf
+        if not mask.any():
+            mask = np.ma.nomask
+        return np.ma.masked_array(data, mask, fill_value=fill_value)
+
+    def nonmasked_idx(
+        self, which: Literal["lb", "ub"]
+    ) -> Union[slice, npt.NDArray[np.int64]]:
+        """Gets the indices of the non-masked lower or upper bounds (or the full slice,
+        if no bound is masked)."""
+        mask = self.lb_mask if which == "lb" else self.ub_mask
+        return np.flatnonzero(~mask) if mask.any() else slice(None)
+
+    def append(
+        self, name: str, lb: npt.NDArray[np.floating], ub: npt.NDArray[np.floating]
+    ) -> tuple[int, int]:
+        """Appends the bounds of a new variable.
+
+        Parameters
+        ----------
+        name : str
+            Name of the variable.
+        lb, ub : 1D arrays of floats
+            The flattened (in Fortran order) lower and upper bounds of the variable.
+
+        Returns
+        -------
+        tuple of 2 ints
+            The number of non-redundant lower and upper bounds of the new variable.
+        """
+        n = self._n
+        size = lb.size
+        new_n = n + size
+        if new_n > self._lb.size:
+            self._grow(new_n)
+        self._lb[n:new_n] = lb
+        self._ub[n:new_n] = ub
+        lb_mask = self._lb_mask[n:new_n]
+        ub_mask = self._ub_mask[n:new_n]
+        if self.remove_redundant:
+            np.equal(lb, -np.inf, out=lb_mask)
+            np.equal(ub, +np.inf, out=ub_mask)
+        else:
+            lb_mask.fill(False)
+            ub_mask.fill(False)
+        self._slices[name] = slice(n, new_n)
+        self._n = new_n
+        return size - int(lb_mask.sum()), size - int(ub_mask.sum())
+
+    def remove(
+        self,
+        name: str,
+        which: Literal["lb", "ub"],
+        idx: Optional[npt.NDArray[np.int64]] = None,
+    ) -> int:
+        """Removes the lower or upper bounds of (some entries of) the given variable,
+        i.e., sets them to ``-/+ inf`` and, if ``remove_redundant=True``, masks them.
+
+        Parameters
+        ----------
+        name : str
+            Name of the variable.
+        which : {"lb", "ub"}
+            Which bounds to remove.
+        idx : 1D array of ints, optional
+            Indices (w.r.t. the flattened variable) of the entries whose bounds are to
+            be removed. If ``None``, the bounds of all entries are removed.
+
+        Returns
+        -------
+        int
+            The number of non-redundant bounds of the variable after the removal.
+        """
+        slc = self._slices[name]
+        if which == "lb":
+            data, mask, value = self._lb[slc], self._lb_mask[slc], -np.inf
+        else:
+            data, mask, value = self._ub[slc], self._ub_mask[slc], +np.inf
+        if idx is None:
+            idx = slice(None)
+        data[idx] = value
+        if self.remove_redundant:
+            mask[idx] = True
+        return data.size - int(mask.sum())
+
+    def _grow(self, min_capacity: int) -> None:
+        """Internal utility to (at least) double the capacity of the arrays."""
+        capacity = max(min_capacity, 2 * self._lb.size)
+        n = self._n
+        for attr in ("_lb", "_ub", "_lb_mask", "_ub_mask"):
+            old = getattr(self, attr)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:n] = old[:n]
+            setattr(self, attr, new)
@@ -0,0 +1,90 @@
+"""Contains a mixin class that allows to register lightweight callbacks (i.e., hooks)
+around the solve path of instances of :class:`csnlp.Nlp` and of its wrappers, e.g., for
+profiling and tracing purposes."""
+
+from time import perf_counter
+from typing import Callable, Literal
+
+SolveStage = Literal["before_pack", "before_solver", "after_solver", "after_solution"]
+SolveHook = Callable[[SolveStage, str, float], None]
+
+SOLVE_STAGES: tuple[SolveStage, ...] = (
+    "before_pack",
+    "before_solver",
+    "after_solver",
+    "after_solution",
+)
+"""Stages of the solve path at which hooks are called, in chronological order."""
+
+
+class SupportsSolveHooks:
+    """Mixin class that allows to register hooks that are called at each stage of the
+    solve path (see :data:`SOLVE_STAGES`), i.e.,
+
+    - ``"before_pack"``: when the call to ``solve`` begins, before its inputs are
+      processed (e.g., packed into vectors, or scaled by a wrapper)
+    - ``"before_solver"``: right before the call to the solver (or, for wrappers, to the
+      wrapped NLP)
+    - ``"after_solver"``: right after the call to the solver (or to the wrapped NLP)
+    - ``"after_solution"``: once the solution has been built, right before returning.
+
+    An instance only calls the hooks of the stages that delimit some work of its own:
+    :class:`csnlp.Nlp` calls all of them, while wrappers return the solution of the
+    wrapped NLP as is, so they never call ``"after_solution"``, and call
+    ``"before_pack"`` only if they process the inputs (e.g.,
+    :class:`csnlp.wrappers.NlpScaling`). Thus, the interval between two consecutive
+    stages always measures the cost of some step of the solve path.
+
+    Each hook is called as ``hook(stage, name, timestamp)``, where ``name`` identifies
+    the NLP (or the wrapper) and ``timestamp`` is given by :func:`time.perf_counter`.
+    Hooks are registered per instance, so that, for a wrapped NLP, the latency of each
+    layer of the wrapper chain can be attributed separately. When no hook is
+    registered, the overhead on the solve path is a single truth check per stage.
+    """
+
+    _solve_hooks: tuple[SolveHook, ...] = ()
+
+    @property
+    def solve_hooks(self) -> tuple[SolveHook, ...]:
+        """Gets the hooks registered on this instance."""
+        return self._solve_hooks
+
+    @property
+    def _solve_hook_name(self) -> str:
+        """Internal name passed to the hooks to identify this instance."""
+        return self.name
+
+    def add_solve_hook(self, hook: SolveHook) -> None:
+        """Registers a hook to be called at each stage of the solve path.
+
+        Parameters
+        ----------
+        hook : callable
+            The hook, called as ``hook(stage, name, timestamp)``.
+        """
+        self._solve_hooks = (*self._solve_hooks, hook)
+
+    def remove_solve_hook(self, hook: SolveHook) -> None:
+        """Unregisters a hook previously registered via :meth:`add_solve_hook`.
+
+        Parameters
+        ----------
+        hook : callable
+            The hook to unregister.
+
+        Raises
+        ------
+        ValueError
+            Raises if the hook is not registered.
+        """
+        hooks = list(self._solve_hooks)
+        hooks.remove(hook)
+        self._solve_hooks = tuple(hooks)
+
+    def _run_solve_hooks(self, stage: SolveStage) -> None:
+        """Internal utility to call the registered hooks for the given stage. To keep
+        the overhead near zero, callers should first check that hooks are present."""
+        timestamp = perf_counter()
+        name = self._solve_hook_name
+        for hook in self._solve_hooks:
+            hook(stage, name, timestamp)
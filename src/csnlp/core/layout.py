@@ -0,0 +1,209 @@
+"""Contains classes describing how named symbols (e.g., the parameters or the primal
+variables of an instance of :class:`csnlp.Nlp`) are laid out in the flat vectors that
+are passed to and returned by the CasADi solvers. Layouts allow to pack dictionaries of
+numerical values into such vectors (and to unpack them) with plain NumPy slicing, i.e.,
+without any symbolic substitution."""
+
+from collections.abc import Iterator, Mapping
+from typing import Any, NamedTuple, Optional, Union
+
+import casadi as cs
+import numpy as np
+import numpy.typing as npt
+
+
+class VectorLayout(Mapping[str, slice]):
+    """Layout of a vector made of the vertical concatenation of named symbols, each
+    flattened in column-major (i.e., Fortran) order, as in :func:`casadi.vvcat`. It is
+    a read-only mapping from each name to the corresponding slice of the vector.
+
+    Parameters
+    ----------
+    shapes : dict of (str, tuple of 2 ints)
+        The shapes of the symbols, in the order in which they are concatenated.
+    """
+
+    __slots__ = ("_slices", "_shapes", "_size")
+
+    def __init__(self, shapes: Mapping[str, tuple[int, int]]) -> None:
+        slices: dict[str, slice] = {}
+        offset = 0
+        for name, (n_rows, n_cols) in shapes.items():
+            numel = n_rows * n_cols
+            slices[name] = slice(offset, offset + numel)
+            offset += numel
+        self._slices = slices
+        self._shapes = {n: tuple(s) for n, s in shapes.items()}
+        self._size = offset
+
+    @classmethod
+    def from_symbols(cls, symbols: Mapping[str, Union[cs.SX, cs.MX]]) -> "VectorLayout":
+        """Creates the layout of the concatenation of the given symbols.
+
+        Parameters
+        ----------
+        symbols : dict of (str, casadi.SX or MX)
+            The named symbols, in the order in which they are concatenated.
+
+        Returns
+        -------
+        VectorLayout
+            The layout of the vector.
+        """
+        return cls({n: s.shape for n, s in symbols.items()})
+
+    @property
+    def size(self) -> int:
+        """Gets the size of the whole vector."""
+        return self._size
+
+    @property
+    def shapes(self) -> dict[str, tuple[int, int]]:
+        """Gets the shapes of the symbols in the vector."""
+        return self._shapes
+
+    def __getitem__(self, name: str) -> slice:
+        return self._slices[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._slices)
+
+    def __len__(self) -> int:
+        return len(self._slices)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(size={self._size}, names={list(self)})"
+
+    def pack(
+        self,
+        values: Mapping[str, npt.ArrayLike],
+        default: Optional[float] = None,
+        out: Optional[npt.NDArray[np.floating]] = None,
+    ) -> npt.NDArray[np.floating]:
+        """Packs the given numerical values into a flat vector with this layout.
+
+        Parameters
+        ----------
+        values : dict of (str, array_like)
+            The numerical values of the symbols. Each value must either have exactly
+            the shape of the corresponding symbol, be a vector with the same number of
+            elements (only if the symbol is a vector as well), or be broadcastable to
+            the symbol's shape. Entries whose name is not in the layout are ignored.
+        default : float, optional
+            The value used to fill the symbols that are missing from ``values``. If
+            ``None``, missing symbols raise an error.
+        out : array of floats, optional
+            The 1D buffer to write the vector into. If ``None``, a new one is allocated.
+
+        Returns
+        -------
+        array of floats
+            The packed 1D vector.
+
+        Raises
+        ------
+        KeyError
+            Raises if a symbol is missing and no ``default`` is given.
+        ValueError
+            Raises if a value cannot be broadcast to the shape of its symbol, or if
+            ``out`` has the wrong size.
+        """
+        if out is None:
+            out = np.empty(self._size, dtype=float)
+        elif out.shape != (self._size,):
+            raise ValueError(
+                f"Expected buffer of shape ({self._size},); got {out.shape} instead."
+            )
+        shapes = self._shapes
+        for name, slc in self._slices.items():
+            value = values.get(name)
+            if value is None:
+                if default is None:
+                    raise KeyError(name)
+                out[slc] = default
+            else:
+                out[slc] = _flatten_like(value, shapes[name], name)
+        return out
+
+    def unpack(self, vector: npt.ArrayLike) -> dict[str, npt.NDArray[np.floating]]:
+        """Unpacks a flat vector with this layout into a dictionary of arrays, each with
+        the shape of the corresponding symbol.
+
+        Parameters
+        ----------
+        vector : array_like
+            The flat vector to be unpacked.
+
+        Returns
+        -------
+        dict of (str, array of floats)
+            The values of each symbol.
+        """
+        vector = np.asarray(vector, dtype=float).reshape(-1, order="F")
+        shapes = self._shapes
+        return {
+            n: vector[slc].reshape(shapes[n], order="F")
+            for n, slc in self._slices.items()
+        }
+
+
+class NlpLayout(NamedTuple):
+    """Layouts of the flat vectors that are passed to and returned by the solver of an
+    instance of :class:`csnlp.Nlp`."""
+
+    x: VectorLayout
+    """Layout of the primal variables (and of their bounds and multipliers), i.e.,
+    ``x0``, ``x``, ``lam_x0`` and ``lam_x``."""
+
+    p: VectorLayout
+    """Layout of the parameters ``p``."""
+
+    g: VectorLayout
+    """Layout of the constraints (equalities first, then inequalities) and of their
+    multipliers, i.e., ``lam_g0`` and ``lam_g``."""
+
+
+class SolutionLayout(NamedTuple):
+    """Immutable description of where each primal and dual variable of an instance of
+    :class:`csnlp.Nlp` lies in the flat vectors of a solution. It is shared by all the
+    :class:`csnlp.core.solutions.CompactSolution` of the same NLP structure."""
+
+    x: VectorLayout
+    """Layout of the primal variables."""
+
+    p: VectorLayout
+    """Layout of the parameters."""
+
+    g: VectorLayout
+    """Layout of the constraints (equalities first, then inequalities)."""
+
+    lbx_idx: dict[str, npt.NDArray[np.int64]]
+    """Indices in the primal vector of the non-redundant lower bounds of each variable,
+    i.e., of the entries of the multipliers ``lam_lb_{name}``."""
+
+    ubx_idx: dict[str, npt.NDArray[np.int64]]
+    """Same as :attr:`lbx_idx`, but for the upper bounds."""
+
+    g_names: dict[str, str]
+    """Names of the multipliers of each constraint (``lam_g_{name}`` for equalities,
+    ``lam_h_{name}`` for inequalities), mapped to the constraint's name."""
+
+
+def _flatten_like(
+    value: Any, shape: tuple[int, int], name: str
+) -> Union[float, npt.NDArray[np.floating]]:
+    """Internal utility to flatten, in Fortran order, a value for the given shape."""
+    if isinstance(value, (int, float)):
+        return value
+    value = value.full() if isinstance(value, cs.DM) else np.asarray(value, dtype=float)
+    if value.shape == shape or (
+        (shape[0] == 1 or shape[1] == 1) and value.size == shape[0] * shape[1]
+    ):
+        return value.reshape(-1, order="F")
+    try:
+        return np.broadcast_to(value, shape).reshape(-1, order="F")
+    except ValueError as e:
+        raise ValueError(
+            f"Cannot broadcast value of shape {value.shape} to shape {shape} of "
+            f"'{name}'."
+        ) from e
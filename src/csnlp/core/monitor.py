@@ -0,0 +1,213 @@
+"""Contains a monitor of the iterations of NLP solvers, built on CasADi's
+``iteration_callback`` option, which records convergence traces into a preallocated
+array and allows to stop the solver early, e.g., to solve under a time budget."""
+
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple, Optional
+
+import casadi as cs
+import numpy as np
+import numpy.typing as npt
+
+if TYPE_CHECKING:
+    from ..nlps.objective import HasObjective
+
+COLUMNS = ("iter", "time", "f", "inf_pr", "inf_du", "mu")
+"""Columns of the trace recorded by :class:`IterationMonitor`."""
+
+
+class IterationInfo(NamedTuple):
+    """Information on an iteration of the solver, passed to the early-stop predicate of
+    :class:`IterationMonitor`."""
+
+    iter: int
+    """Index of the iteration."""
+
+    time: float
+    """Wall time elapsed since the start of the solver's run, in seconds."""
+
+    f: float
+    """Value of the objective at the current iterate."""
+
+    inf_pr: float
+    """Primal infeasibility, i.e., the maximum violation of the constraints and bounds
+    at the current iterate."""
+
+    inf_du: float
+    """Dual infeasibility, i.e., the infinity norm of the gradient of the Lagrangian at
+    the current iterate."""
+
+
+def time_budget(
+    seconds: float, tol: float = float("inf")
+) -> Callable[[IterationInfo], bool]:
+    """Creates an early-stop predicate for :class:`IterationMonitor` that stops the
+    solver once the given time budget is spent, provided the current iterate is feasible
+    up to the given tolerance (otherwise, the solver is let run until it is).
+
+    Parameters
+    ----------
+    seconds : float
+        Time budget of each solver's run, in seconds.
+    tol : float, optional
+        Tolerance on the primal infeasibility of the iterate. By default, ``inf``, i.e.,
+        the solver is stopped as soon as the time budget is spent.
+
+    Returns
+    -------
+    callable from IterationInfo to bool
+        The early-stop predicate.
+    """
+    return lambda info: info.time >= seconds and info.inf_pr <= tol
+
+
+class _IterationCallback(cs.Callback):
+    """Internal CasADi callback that forwards the solver's iterates to the monitor."""
+
+    def __init__(self, monitor: "IterationMonitor", nx: int, ng: int) -> None:
+        cs.Callback.__init__(self)
+        self._monitor = monitor
+        self._sizes = {"x": nx, "lam_x": nx, "g": ng, "lam_g": ng, "f": 1}
+        self.construct("iteration_monitor", {})
+
+    def get_n_in(self) -> int:
+        return cs.nlpsol_n_out()
+
+    def get_n_out(self) -> int:
+        return 1
+
+    def get_name_in(self, i: int) -> str:
+        return cs.nlpsol_out(i)
+
+    def get_name_out(self, i: int) -> str:
+        return "ret"
+
+    def get_sparsity_in(self, i: int) -> cs.Sparsity:
+        n = self._sizes.get(cs.nlpsol_out(i))
+        return cs.Sparsity(0, 0) if n is None else cs.Sparsity.dense(n)
+
+    def eval(self, arg: list[cs.DM]) -> list[int]:
+        out = dict(zip(cs.nlpsol_out(), arg))
+        return [int(self._monitor._record(out))]
+
+
+class IterationMonitor:
+    """Opt-in monitor of the iterations of the solver of an instance of
+    :class:`csnlp.Nlp`, to be passed to :meth:`csnlp.Nlp.init_solver`. At each iteration
+    of a solver's run, it records the iteration index, the elapsed time, the objective,
+    and the primal and dual infeasibilities (see :class:`IterationInfo`) into a
+    preallocated array (see :attr:`trace`), and optionally stops the solver early if the
+    given predicate is satisfied.
+
+    Parameters
+    ----------
+    max_iter : int, optional
+        Number of iterations that can be recorded per solver's run. Further iterations
+        are not recorded, but are still passed to the predicate. By default, ``1000``.
+    stop : callable from IterationInfo to bool, optional
+        Early-stop predicate called at each iteration. If it returns ``True``, the
+        solver is asked to stop, and returns the current iterate (e.g., IPOPT stops with
+        status ``"User_Requested_Stop"``). See, e.g., :func:`time_budget`. By default,
+        the solver is never stopped early.
+
+    Notes
+    -----
+    The infeasibilities are computed on the unscaled NLP, so they might differ from the
+    ones reported by the solver (e.g., IPOPT reports them for its internally scaled
+    problem). The barrier parameter ``"mu"`` is not available during the run, and is
+    filled in from the solver's stats once the run ends, if these contain it (e.g., for
+    IPOPT); otherwise, it is NaN. The monitor is bound to the structure of the NLP when
+    the solver is initialized, so it should not be shared by different NLPs.
+    """
+
+    def __init__(
+        self,
+        max_iter: int = 1000,
+        stop: Optional[Callable[[IterationInfo], bool]] = None,
+    ) -> None:
+        self.stop = stop
+        self._data = np.full((max_iter, len(COLUMNS)), np.nan)
+        self._n = 0
+        self._stopped = False
+        self._t0 = 0.0
+        self._args: dict[str, npt.NDArray[np.floating]] = {}
+        self._callback: Optional[_IterationCallback] = None
+        self._grad_lag: Optional[cs.Function] = None
+
+    @property
+    def trace(self) -> npt.NDArray[np.floating]:
+        """Gets the trace of the last solver's run, i.e., an array with a row per
+        recorded iteration and a column per entry of :data:`COLUMNS` (a view of the
+        internal storage, which is overwritten by the next run)."""
+        return self._data[: min(self._n, self._data.shape[0])]
+
+    @property
+    def n_iter(self) -> int:
+        """Gets the number of iterations of the last solver's run."""
+        return self._n
+
+    @property
+    def stopped(self) -> bool:
+        """Gets whether the last solver's run was stopped early by the predicate."""
+        return self._stopped
+
+    def _bind(self, nlp: "HasObjective") -> _IterationCallback:
+        """Internal utility to bind the monitor to the given NLP, returning the callback
+        to be passed to the solver as ``iteration_callback``."""
+        x = nlp._x
+        con = cs.vertcat(nlp._g, nlp._h)
+        ng = con.shape[0]
+        lam_g = nlp._sym_type.sym("lam_g", ng)
+        lam_x = nlp._sym_type.sym("lam_x", x.shape[0])
+        grad = cs.gradient(nlp._f + cs.dot(lam_g, con), x) + lam_x
+        self._grad_lag = cs.Function("grad_lag", (x, nlp._p, lam_g, lam_x), (grad,))
+        self._callback = _IterationCallback(self, x.shape[0], ng)
+        return self._callback
+
+    def _start(self, kwargs: dict[str, Any]) -> None:
+        """Internal utility to reset the monitor at the start of a solver's run."""
+        self._args = {
+            n: np.asarray(kwargs.get(n, ()), dtype=float).reshape(-1)
+            for n in ("p", "lbx", "ubx", "lbg", "ubg")
+        }
+        self._data.fill(np.nan)
+        self._n = 0
+        self._stopped = False
+        self._t0 = perf_counter()
+
+    def _finish(self, stats: dict[str, Any]) -> None:
+        """Internal utility to complete the trace with the solver's stats."""
+        self._args = {}
+        mu = stats.get("iterations", {}).get("mu")
+        if mu is not None:
+            n = min(len(mu), self.trace.shape[0])
+            self._data[:n, COLUMNS.index("mu")] = mu[:n]
+
+    def _record(self, out: dict[str, cs.DM]) -> bool:
+        """Internal utility to record an iterate, returning whether to stop."""
+        elapsed = perf_counter() - self._t0
+        args = self._args
+        if not args:
+            return False  # not started, e.g., the solver is run by a multistart NLP
+        x = out["x"].full().reshape(-1)
+        g = out["g"].full().reshape(-1)
+        inf_pr = max(
+            np.max(args["lbg"] - g, initial=0.0),
+            np.max(g - args["ubg"], initial=0.0),
+            np.max(args["lbx"] - x, initial=0.0),
+            np.max(x - args["ubx"], initial=0.0),
+        )
+        grad = self._grad_lag(x, args["p"], out["lam_g"], out["lam_x"])
+        inf_du = np.max(np.abs(grad.full()), initial=0.0)
+        info = IterationInfo(self._n, elapsed, float(out["f"]), inf_pr, inf_du)
+        if self._n < self._data.shape[0]:
+            self._data[self._n, :5] = info
+        self._n += 1
+        stop = self.stop is not None and self.stop(info)
+        self._stopped |= stop
+        return stop
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_callback"] = state["_grad_lag"] = None  # rebound at solver's init
+        return state
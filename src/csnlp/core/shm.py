@@ -0,0 +1,77 @@
+"""Contains a collection of named numerical arrays laid out in a single block of shared
+memory, which allows to exchange the inputs and outputs of solvers with worker processes
+without pickling them."""
+
+from collections.abc import Iterator, Mapping
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional
+
+import numpy as np
+import numpy.typing as npt
+
+_ITEMSIZE = np.dtype(float).itemsize
+
+
+class SharedArrays(Mapping[str, npt.NDArray[np.floating]]):
+    """Named 2D arrays of floats laid out one after the other in a single block of
+    shared memory. Arrays are stored in column-major order, i.e., as the matrices
+    concatenated via :func:`casadi.hcat` (e.g., in
+    :class:`csnlp.multistart.MappedMultistartNlp`), so that each column (e.g., the
+    initial guess of one start) is contiguous in memory.
+
+    The arrays are created by the parent process (``name=None``), and attached to by
+    its worker processes via :attr:`name` and :attr:`shapes`. The creator is
+    responsible for releasing the memory (see :meth:`unlink`).
+
+    Parameters
+    ----------
+    shapes : dict of (str, tuple of 2 ints)
+        The names and shapes of the arrays.
+    name : str, optional
+        Name of an existing block of shared memory to attach to. By default, ``None``,
+        i.e., a new block is created.
+    """
+
+    def __init__(
+        self, shapes: Mapping[str, tuple[int, int]], name: Optional[str] = None
+    ) -> None:
+        self.shapes = dict(shapes)
+        size = sum(r * c for r, c in self.shapes.values()) * _ITEMSIZE
+        if name is None:
+            self._shm = SharedMemory(create=True, size=max(size, 1))
+        else:
+            # NOTE: workers share the resource tracker of their parent, which thus keeps
+            # tracking the block until the creator unlinks it
+            self._shm = SharedMemory(name)
+        self._arrays: dict[str, npt.NDArray[np.floating]] = {}
+        offset = 0
+        for n, shape in self.shapes.items():
+            self._arrays[n] = np.ndarray(shape, float, self._shm.buf, offset, order="F")
+            offset += shape[0] * shape[1] * _ITEMSIZE
+
+    @property
+    def name(self) -> str:
+        """Gets the name of the block of shared memory."""
+        return self._shm.name
+
+    def __getitem__(self, name: str) -> npt.NDArray[np.floating]:
+        return self._arrays[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._arrays)
+
+    def __len__(self) -> int:
+        return len(self._arrays)
+
+    def close(self) -> None:
+        """Detaches from the block of shared memory. Views of the arrays must not be
+        used afterwards."""
+        self._arrays.clear()
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Detaches from and releases the block of shared memory. To be called once, by
+        the creator, once no process needs the arrays anymore."""
+        self.close()
+        self._shm.unlink()
+
@@ -1,11 +1,15 @@
 """Contains classes and methods to store the solution of an NLP problem after a call
 to :meth:`csnlp.Nlp.solve` or :meth:`csnlp.multistart.MultistartNlp.solve_multi`."""
 
+from collections import OrderedDict as _OrderedDict
 from collections.abc import Iterable as _Iterable
 from functools import cached_property as _cached_property
 from itertools import product as _product
+from threading import Lock as _Lock
 from typing import TYPE_CHECKING
 from typing import Any as _Any
+from typing import Literal as _Literal
+from typing import NamedTuple as _NamedTuple
 from typing import Optional
 from typing import Protocol as _Protocol
 from typing import TypeVar as _TypeVar
@@ -20,6 +24,7 @@ from .data import cs2array as _cs2array
 
 if TYPE_CHECKING:
     from ..nlps.nlp import Nlp
+    from .layout import SolutionLayout
 
 SymType = _TypeVar("SymType", cs.SX, cs.MX)
 SymOrNumType = _TypeVar("SymOrNumType", cs.SX, cs.MX, cs.DM, int, float, np.ndarray)
@@ -58,6 +63,52 @@ def _is_infeas(status: str, solver_plugin: str) -> Optional[bool]:
     return None
 
 
+class _ValueFunctionCache:
+    """Internal LRU cache of the functions compiled to evaluate expressions at the
+    solutions of an NLP. Functions are keyed by the structural version of the NLP (see
+    ``_structure_version`` in :class:`csnlp.Nlp`) and by the identity of the
+    expressions, which are kept alive by the cache so that identities are not reused.
+    The cache is shared by all solutions of the same type, so it is thread-safe.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        self.maxsize = maxsize
+        self._entries: _OrderedDict[
+            tuple[int, tuple[int, ...]], tuple[tuple[_Any, ...], Optional[cs.Function]]
+        ] = _OrderedDict()
+        self._lock = _Lock()
+
+    def get(
+        self, version: int, exprs: tuple[SymType, ...], sym: SymType
+    ) -> Optional[cs.Function]:
+        """Gets the function evaluating the given expressions w.r.t. the given symbols,
+        compiling it on a miss. Returns ``None`` if the expressions cannot be compiled
+        (e.g., because they depend on symbols other than ``sym``)."""
+        key = (version, tuple(map(id, exprs)))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and all(a is b for a, b in zip(entry[0], exprs)):
+                self._entries.move_to_end(key)
+                return entry[1]
+        # compile outside of the lock, so that other threads are not held up; if two
+        # threads miss the same key, both compile it and the last one is kept
+        try:
+            func = cs.Function("value", (sym,), exprs, {"cse": True})
+        except RuntimeError:
+            func = None  # e.g., free symbols
+        with self._lock:
+            self._entries[key] = (exprs, func)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return func
+
+    def clear(self) -> None:
+        """Clears the cache."""
+        with self._lock:
+            self._entries.clear()
+
+
 class Solution(_Protocol[SymType]):
     """Class containing information on the solution of a solver's run for an instance of
     :class:`csnlp.Nlp`.
@@ -66,8 +117,17 @@ class Solution(_Protocol[SymType]):
     -----
     This class is merely a protocol, and as such it just defines the interface of how a
     solution should look like, plus some minor implementations.
+
+    Evaluations of expressions at a solution (see :meth:`value` and :meth:`values`) go
+    through functions that are compiled once per expression and cached (with LRU
+    policy) at the level of the solution's type, so that evaluating the same
+    expressions at many solutions of the same NLP (e.g., a stage cost at every step of
+    a closed loop) does not re-traverse the expression graph every time.
     """
 
+    _structure_version: Optional[int] = None
+    _value_cache: _ValueFunctionCache
+
     @property
     def f(self) -> float:
         """Optimal value of the objective function."""
@@ -245,10 +305,57 @@ class Solution(_Protocol[SymType]):
             free. This can occur when there are symbols that are outside the solution's
             variables, and thus have not been substituted by a numerical value.
         """
+        if eval and isinstance(expr, (cs.SX, cs.MX)):
+            func = self._value_function((expr,))
+            if func is not None:
+                return func(self.x_and_lam_and_p)
         return subsevalf(
             expr, self.x_and_lam_and_p_sym, self.x_and_lam_and_p, eval=eval
         )
 
+    def values(
+        self, exprs: Union[dict[str, SymType], _Iterable[SymType]]
+    ) -> Union[dict[str, cs.DM], list[cs.DM]]:
+        """Computes the values of several expressions at this solution at once, i.e.,
+        with a single call to a function compiled for all of them.
+
+        Parameters
+        ----------
+        exprs : dict of (str, casadi.SX or MX) or iterable of casadi.SX or MX
+            The symbolic expressions to be evaluated at the solution's values.
+
+        Returns
+        -------
+        dict of (str, casadi.DM) or list of casadi.DM
+            The values of the expressions, in a dict with the same keys as ``exprs`` if
+            a dict, otherwise in a list with the same order.
+
+        Raises
+        ------
+        RuntimeError
+            Raises if there are symbolic variables that are not in the solution's
+            variables, and thus cannot be substituted by a numerical value.
+        """
+        names = list(exprs.keys()) if isinstance(exprs, dict) else None
+        exprs = tuple(exprs.values() if names is not None else exprs)
+        func = self._value_function(exprs)
+        if func is None:
+            outs = [self.value(e) for e in exprs]
+        else:
+            outs = func.call([self.x_and_lam_and_p])
+        return outs if names is None else dict(zip(names, outs))
+
+    def _value_function(
+        self, exprs: tuple[Union[SymType, np.ndarray], ...]
+    ) -> Optional[cs.Function]:
+        """Internal utility to get the compiled function that evaluates the given
+        expressions at the solution, or ``None`` if not possible."""
+        version = self._structure_version
+        sym = self.x_and_lam_and_p_sym
+        if version is None or not all(isinstance(e, type(sym)) for e in exprs):
+            return None
+        return self._value_cache.get(version, exprs, sym)
+
     @staticmethod
     def from_casadi_solution(
         sol_with_stats: dict[str, _Any], nlp: "Nlp[SymType]"
@@ -334,6 +441,12 @@ class EagerSolution(Solution[SymType]):
         Optimal values of the dual variables.
     stats : dict
         Stats of the solver run that generated this solution.
+    solver_plugin : str
+        The solver plugin used to generate this solution.
+    structure_version : int, optional
+        Identifier of the structure of the NLP that generated this solution, used to
+        cache the compiled functions of :meth:`value` and :meth:`values`. If ``None``,
+        expressions are evaluated by symbolic substitution.
 
     Notes
     -----
@@ -342,6 +455,8 @@ class EagerSolution(Solution[SymType]):
     solver has finished its run.
     """
 
+    _value_cache = _ValueFunctionCache()
+
     def __init__(
         self,
         f: float,
@@ -359,6 +474,7 @@ class EagerSolution(Solution[SymType]):
         dual_vals: dict[str, cs.DM],
         stats: dict[str, _Any],
         solver_plugin: str,
+        structure_version: Optional[int] = None,
     ) -> None:
         self._f = f
 
@@ -378,6 +494,7 @@ class EagerSolution(Solution[SymType]):
 
         self._stats = stats
         self._solver_plugin = solver_plugin
+        self._structure_version = structure_version
 
     @property
     def f(self) -> float:
@@ -474,6 +591,7 @@ class EagerSolution(Solution[SymType]):
             dual_vals,
             stats,
             nlp.unwrapped._solver_plugin,
+            nlp.unwrapped._structure_version,
         )
 
 
@@ -503,6 +621,12 @@ class LazySolution(Solution[SymType]):
         Indexes of the non-masked (i.e., valid, finite) upper-bounds.
     stats : dict
         Stats of the solver run that generated this solution.
+    solver_plugin : str
+        The solver plugin used to generate this solution.
+    structure_version : int, optional
+        Identifier of the structure of the NLP that generated this solution, used to
+        cache the compiled functions of :meth:`value` and :meth:`values`. If ``None``,
+        expressions are evaluated by symbolic substitution.
 
     Notes
     -----
@@ -510,6 +634,8 @@ class LazySolution(Solution[SymType]):
     the values and properties of the solution are computed lazily only when requested.
     """
 
+    _value_cache = _ValueFunctionCache()
+
     def __init__(
         self,
         solution: dict[str, cs.DM],
@@ -523,6 +649,7 @@ class LazySolution(Solution[SymType]):
         nonmasked_ubx_idx: Union[slice, npt.NDArray[np.int64]],
         stats: dict[str, _Any],
         solver_plugin: str,
+        structure_version: Optional[int] = None,
     ) -> None:
         self._sol = solution
         self._p_sym = p_sym
@@ -535,6 +662,7 @@ class LazySolution(Solution[SymType]):
         self._nonmasked_ubx_idx = nonmasked_ubx_idx
         self._stats = stats
         self._solver_plugin = solver_plugin
+        self._structure_version = structure_version
 
     @_cached_property
     def f(self) -> float:
@@ -626,6 +754,258 @@ class LazySolution(Solution[SymType]):
             nonmasked_ubx_idx,
             stats,
             nlp.unwrapped._solver_plugin,
+            nlp.unwrapped._structure_version,
+        )
+
+
+class RawSolution(_NamedTuple):
+    """Lightweight record of the solution of a solver's run, as returned by
+    :meth:`csnlp.Nlp.solve_raw`. All vectors are flat numpy arrays laid out as in the
+    solver (see :attr:`csnlp.Nlp.layout`)."""
+
+    x: npt.NDArray[np.floating]
+    """Optimal values of the primal variables."""
+
+    lam_g: npt.NDArray[np.floating]
+    """Optimal values of the multipliers of the equality and inequality constraints."""
+
+    lam_x: npt.NDArray[np.floating]
+    """Optimal values of the multipliers of the primal variables' bounds (negative for
+    active lower bounds, positive for active upper bounds)."""
+
+    f: float
+    """Optimal value of the objective function."""
+
+    success: bool
+    """Whether the solver's run was successful."""
+
+    status: str
+    """Return status of the solver."""
+
+    stats: Optional[dict[str, _Any]] = None
+    """Statistics of the solver's run, if requested."""
+
+
+_STATUS_NAMES: list[str] = []
+"""Return statuses of the solvers encountered so far, indexed by their integer code."""
+_STATUS_CODES: dict[str, int] = {}
+"""Integer codes of the return statuses in :data:`_STATUS_NAMES`."""
+_STATUS_LOCK = _Lock()
+
+
+def _status_code(status: str) -> int:
+    """Internal utility to get the integer code of a return status, registering it on
+    its first occurrence. Codes are only valid within the current process."""
+    code = _STATUS_CODES.get(status)
+    if code is None:
+        with _STATUS_LOCK:
+            code = _STATUS_CODES.get(status)
+            if code is None:
+                code = len(_STATUS_NAMES)
+                _STATUS_NAMES.append(status)
+                _STATUS_CODES[status] = code
+    return code
+
+
+class CompactSolution:
+    """Compact, symbol-free record of the solution of a solver's run for an instance of
+    :class:`csnlp.Nlp`, meant for logging large numbers of solutions. It holds only the
+    flat numerical vectors returned by the solver and a few scalar statistics, while
+    name-based access (e.g., ``sol.vals["x"]``) goes through a layout that is shared by
+    all the solutions of the same NLP structure.
+
+    Parameters
+    ----------
+    x : array of floats
+        Optimal values of the primal variables in a vector.
+    lam_g : array of floats
+        Optimal values of the equality and inequality dual variables in a vector.
+    lam_x : array of floats
+        Optimal values of the multipliers of the primal variables' bounds in a vector
+        (negative for active lower bounds, positive for active upper bounds).
+    p : array of floats
+        Values of the parameters for which this solution was generated.
+    f : float
+        Optimal value of the NLP at the solution.
+    status : str
+        Return status of the solver.
+    success : bool
+        Whether the solver's run was successful.
+    iter_count : int, optional
+        Number of iterations of the solver, if available.
+    t_wall : float, optional
+        Total wall time of the solver's run, if available.
+    layout : SolutionLayout
+        The layout of the NLP that generated this solution (see
+        :class:`csnlp.core.layout.SolutionLayout`).
+
+    Notes
+    -----
+    Contrarily to :class:`EagerSolution` and :class:`LazySolution`, this class does not
+    implement the :class:`Solution` protocol, since it holds no symbols (thus,
+    expressions cannot be evaluated at it via, e.g., :meth:`Solution.value`). Being
+    symbol-free, it can be pickled as is. The return status is stored as a small
+    integer code (see :attr:`status_code`), which is shared by all the solutions with
+    the same status and decoded only when :attr:`status` is accessed.
+    """
+
+    __slots__ = (
+        "x",
+        "lam_g",
+        "lam_x",
+        "p",
+        "f",
+        "status_code",
+        "success",
+        "iter_count",
+        "t_wall",
+        "layout",
+    )
+
+    def __init__(
+        self,
+        x: npt.ArrayLike,
+        lam_g: npt.ArrayLike,
+        lam_x: npt.ArrayLike,
+        p: npt.ArrayLike,
+        f: float,
+        status: str,
+        success: bool,
+        iter_count: Optional[int],
+        t_wall: Optional[float],
+        layout: "SolutionLayout",
+    ) -> None:
+        self.x = np.asarray(x, dtype=np.float64).reshape(-1)
+        self.lam_g = np.asarray(lam_g, dtype=np.float64).reshape(-1)
+        self.lam_x = np.asarray(lam_x, dtype=np.float64).reshape(-1)
+        self.p = np.asarray(p, dtype=np.float64).reshape(-1)
+        self.f = float(f)
+        self.status_code = _status_code(str(status))
+        self.success = bool(success)
+        self.iter_count = iter_count
+        self.t_wall = t_wall
+        self.layout = layout
+
+    @property
+    def status(self) -> str:
+        """Gets the return status of the solver."""
+        return _STATUS_NAMES[self.status_code]
+
+    @property
+    def vals(self) -> dict[str, npt.NDArray[np.floating]]:
+        """Gets the optimal values of the primal variables, unpacked by name."""
+        return self.layout.x.unpack(self.x)
+
+    @property
+    def pars(self) -> dict[str, npt.NDArray[np.floating]]:
+        """Gets the values of the parameters, unpacked by name."""
+        return self.layout.p.unpack(self.p)
+
+    @property
+    def dual_vals(self) -> dict[str, npt.NDArray[np.floating]]:
+        """Gets the optimal values of the dual variables, unpacked by name as in
+        :attr:`Solution.dual_vals`."""
+        layout = self.layout
+        g = layout.g
+        lam_g = self.lam_g
+        dual_vals = {
+            n: lam_g[g[c]].reshape(g.shapes[c], order="F")
+            for n, c in layout.g_names.items()
+        }
+        lam_x = self.lam_x
+        for n, idx in layout.lbx_idx.items():
+            dual_vals[f"lam_lb_{n}"] = -np.minimum(lam_x[idx], 0).reshape(-1, 1)
+        for n, idx in layout.ubx_idx.items():
+            dual_vals[f"lam_ub_{n}"] = np.maximum(lam_x[idx], 0).reshape(-1, 1)
+        return dual_vals
+
+    @staticmethod
+    def from_casadi_solution(
+        sol_with_stats: dict[str, _Any], nlp: "Nlp[SymType]"
+    ) -> "CompactSolution":
+        """Creates a new compact solution from a CasADi solution.
+
+        Parameters
+        ----------
+        sol_with_stats : dict of (str, cs.DM) and one entry with stats, i.e., Any
+            The solution dictionary from the CasADi solver, which contains the optimal
+            values of the primal and dual variables, as well as the parameters, and the
+            solver's statistics.
+        nlp : Nlp[SymType]
+            The NLP instance for which the solution was computed.
+
+        Returns
+        -------
+        CompactSolution
+            The compact solution corresponding to the CasADi solution.
+        """
+        stats = sol_with_stats["stats"]
+        return CompactSolution(
+            sol_with_stats["x"],
+            sol_with_stats["lam_g"],
+            sol_with_stats["lam_x"],
+            sol_with_stats["p"],
+            sol_with_stats["f"],
+            stats.get("return_status", ""),
+            stats.get("success", False),
+            stats.get("iter_count"),
+            stats.get("t_wall_total"),
+            nlp.unwrapped._solution_layout,
+        )
+
+    @staticmethod
+    def from_solution(sol: Solution, nlp: "Nlp[SymType]") -> "CompactSolution":
+        """Compacts an existing solution, e.g., as returned by :meth:`csnlp.Nlp.solve`.
+
+        Parameters
+        ----------
+        sol : Solution
+            The solution to be compacted.
+        nlp : Nlp[SymType]
+            The NLP instance for which the solution was computed.
+
+        Returns
+        -------
+        CompactSolution
+            The compact version of the given solution.
+        """
+        layout = nlp.unwrapped._solution_layout
+        lam_x = np.zeros(layout.x.size)
+        lam_lbx_and_ubx = np.asarray(sol.lam_lbx_and_ubx, dtype=np.float64).ravel()
+        no_idx = np.empty(0, dtype=int)
+        lbx_idx = np.concatenate((no_idx, *layout.lbx_idx.values()))
+        ubx_idx = np.concatenate((no_idx, *layout.ubx_idx.values()))
+        lam_x[lbx_idx] -= lam_lbx_and_ubx[: lbx_idx.size]
+        lam_x[ubx_idx] += lam_lbx_and_ubx[lbx_idx.size :]
+        stats = sol.stats
+        return CompactSolution(
+            sol.x,
+            sol.lam_g_and_h,
+            lam_x,
+            sol.p,
+            sol.f,
+            sol.status,
+            sol.success,
+            stats.get("iter_count"),
+            stats.get("t_wall_total"),
+            layout,
+        )
+
+    def __getstate__(self) -> dict[str, _Any]:
+        state = {s: getattr(self, s) for s in self.__slots__}
+        # codes are process-local, so the status itself is pickled
+        state["status"] = _STATUS_NAMES[state.pop("status_code")]
+        return state
+
+    def __setstate__(self, state: dict[str, _Any]) -> None:
+        self.status_code = _status_code(state.pop("status"))
+        for s, v in state.items():
+            setattr(self, s, v)
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(f={self.f},success={self.success},"
+            f"status={self.status})"
         )
 
 
@@ -749,3 +1129,81 @@ def subsevalf(
         return _internal_subsevalf_np(expr, old, new, eval)
     else:
         return _internal_subsevalf_cs(expr, old, new, eval)
+
+
+def evaluate_many(
+    expr: SymType,
+    sols: _Iterable[Solution[SymType]],
+    parallelization: _Literal[
+        "serial", "unroll", "inline", "thread", "openmp"
+    ] = "serial",
+    max_num_threads: Optional[int] = None,
+) -> npt.NDArray[np.floating]:
+    """Evaluates the same expression at many solutions at once, i.e., by stacking the
+    solutions' values (see :attr:`Solution.x_and_lam_and_p`) column-wise and calling
+    the compiled function of the expression (see :meth:`Solution.value`) mapped over
+    them via :func:`casadi.Function.map`.
+
+    Parameters
+    ----------
+    expr : casadi.SX or MX
+        The symbolic expression to be evaluated at the solutions' values.
+    sols : iterable of Solution
+        The solutions, e.g., as returned by
+        :meth:`csnlp.multistart.MultistartNlp.solve_multi` with
+        ``return_all_sols=True``, or logged along a closed-loop simulation. They must
+        all stem from the same NLP, without structural changes in between.
+    parallelization : "serial", "unroll", "inline", "thread", "openmp"
+        The type of parallelization to use (see :func:`casadi.Function.map`). By
+        default, ``"serial"`` is selected.
+    max_num_threads : int, optional
+        Maximum number of threads to use in parallelization; if ``None``, the number of
+        threads is equal to the number of solutions.
+
+    Returns
+    -------
+    array of floats
+        The values of the expression at each solution, with shape
+        ``(n_sols, *expr.shape)``.
+
+    Raises
+    ------
+    ValueError
+        Raises if no solutions are given, or if they stem from NLPs with different
+        structures.
+    RuntimeError
+        Raises if there are symbolic variables that are not in the solutions' variables,
+        and thus cannot be substituted by a numerical value.
+    """
+    sols = list(sols)
+    if not sols:
+        raise ValueError("No solutions were given.")
+    first = sols[0]
+    version = first._structure_version
+    sym = first.x_and_lam_and_p_sym
+    if version is None:
+        compatible = all(
+            s._structure_version is None and s.x_and_lam_and_p_sym.shape == sym.shape
+            for s in sols
+        )
+    else:
+        compatible = all(s._structure_version == version for s in sols)
+    if not compatible:
+        raise ValueError("Solutions stem from NLPs with different structures.")
+
+    if version is None:
+        func = cs.Function("value", (sym,), (expr,), {"cse": True})
+    else:
+        func = first._value_function((expr,))
+        if func is None:
+            raise RuntimeError(
+                "Cannot evaluate the expression, as it depends on symbols other than "
+                "the solutions' variables."
+            )
+
+    n = len(sols)
+    values = np.column_stack([s.x_and_lam_and_p.full() for s in sols])
+    mapped_func = func.map(n, parallelization, max_num_threads or n)
+    out = mapped_func(values).full()
+    n_rows, n_cols = expr.shape
+    return out.reshape(n_rows, n, n_cols).transpose(1, 0, 2)
@@ -0,0 +1,234 @@
+"""Contains a persistent, on-disk cache of the solvers built by
+:meth:`csnlp.Nlp.init_solver`. Solvers are serialized with CasADi's own serialization
+and keyed by a structural fingerprint of the NLP, i.e., a hash of everything that goes
+into the construction of the solver (the symbolic problem, the solver plugin and its
+options), so that a process building the same NLP can reload the solver instead of
+constructing it again from scratch.
+
+The same fingerprint keys the shared libraries compiled from the C code generated for
+the functions of the NLP (objective, constraints and their derivatives), which can be
+loaded by NLP solvers in place of the symbolic expressions. The C compiler and its flags
+are taken from the ``CC`` and ``CFLAGS`` environment variables, if set."""
+
+import hashlib
+import os
+import shlex
+import subprocess
+import tempfile
+import warnings
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+import casadi as cs
+import numpy as np
+
+_LIB_SUFFIX = ".dll" if os.name == "nt" else ".so"
+_DEFAULT_CFLAGS = "-O2"
+
+
+def _canonical(obj: Any) -> Any:
+    """Internal utility to convert solver options into a canonical, hashable form.
+    Raises ``TypeError`` if an option cannot be converted (e.g., a callback)."""
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    if isinstance(obj, (np.generic, np.ndarray)):
+        return obj.tolist()
+    if isinstance(obj, cs.DM):
+        return obj.full().tolist()
+    if isinstance(obj, Mapping):
+        return sorted((str(k), _canonical(v)) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return [_canonical(o) for o in obj]
+    raise TypeError(f"Cannot fingerprint object of type {type(obj).__name__}.")
+
+
+def fingerprint(
+    func: Callable[..., cs.Function],
+    solver: str,
+    problem: Mapping[str, Union[cs.SX, cs.MX]],
+    opts: Mapping[str, Any],
+) -> Optional[str]:
+    """Computes the structural fingerprint of a solver, i.e., a hash of the arguments
+    that would be passed to :func:`casadi.nlpsol` or :func:`casadi.qpsol` to build it.
+    The name of the solver function is left out, since it depends on the name of the
+    NLP, which, if not given, is assigned in order of creation and thus differs across
+    processes.
+
+    Parameters
+    ----------
+    func : callable
+        The solver constructor, i.e., :func:`casadi.nlpsol` or :func:`casadi.qpsol`.
+    solver : str
+        Name of the solver plugin.
+    problem : dict of (str, casadi.SX or MX)
+        The symbolic problem, i.e., with keys ``"x"``, ``"p"``, ``"g"`` and ``"f"``.
+    opts : dict
+        The options of the solver (including the ``"discrete"`` flags, if any).
+
+    Returns
+    -------
+    str or None
+        The hexadecimal SHA-256 fingerprint, or ``None`` if the options cannot be
+        fingerprinted (e.g., because they contain callbacks), in which case the solver
+        should not be cached.
+    """
+    try:
+        canonical_opts = _canonical(opts)
+    except TypeError:
+        return None
+    names = ("x", "p", "g", "f")
+    exprs = [problem[n] for n in names]
+    expr_func = cs.Function("problem", exprs[:2], exprs[2:], names[:2], names[2:])
+    h = hashlib.sha256()
+    h.update(cs.__version__.encode())
+    h.update(repr((func.__name__, solver, canonical_opts)).encode())
+    h.update(expr_func.serialize().encode())
+    return h.hexdigest()
+
+
+class SolverDiskCache:
+    """A directory of serialized solvers, keyed by their fingerprints (see
+    :func:`fingerprint`).
+
+    Parameters
+    ----------
+    directory : str or path-like
+        The directory where solvers are stored. It is created if it does not exist.
+    """
+
+    def __init__(self, directory: Union[str, os.PathLike]) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def path(self, key: str) -> Path:
+        """Gets the path of the file of the solver with the given key."""
+        return self.directory / f"{key}.casadi"
+
+    def library_path(self, key: str) -> Path:
+        """Gets the path of the compiled shared library with the given key."""
+        return self.directory / f"{key}{_LIB_SUFFIX}"
+
+    def load(self, key: str) -> Optional[cs.Function]:
+        """Loads the solver with the given key, or returns ``None`` if not cached (or if
+        the file cannot be deserialized)."""
+        path = self.path(key)
+        if not path.is_file():
+            return None
+        try:
+            return cs.Function.load(str(path))
+        except RuntimeError:
+            return None
+
+    def save(self, key: str, solver: cs.Function) -> None:
+        """Saves the solver under the given key. The file is written atomically, so that
+        concurrent processes never read a partially written solver."""
+        path = self.path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        solver.save(str(tmp))
+        os.replace(tmp, path)
+
+    def compile(self, key: str, solver: cs.Function) -> Path:
+        """Generates the C code of the functions the given solver depends on (as
+        :meth:`casadi.Function.generate_dependencies` does) and compiles it into a
+        shared library under the given key. As in :meth:`save`, the library is written
+        atomically.
+
+        Returns
+        -------
+        Path
+            The path of the compiled shared library.
+
+        Raises
+        ------
+        subprocess.CalledProcessError
+            Raises if the compilation fails.
+        """
+        path = self.library_path(key)
+        compiler = os.environ.get("CC", "cc")
+        cflags = shlex.split(os.environ.get("CFLAGS", _DEFAULT_CFLAGS))
+        with tempfile.TemporaryDirectory(dir=self.directory) as tmpdir:
+            c_file = "nlp.c"
+            codegen = cs.CodeGenerator(c_file)
+            codegen.add(solver.oracle())
+            for name in solver.get_function():
+                codegen.add(solver.get_function(name))
+            codegen.generate(f"{tmpdir}{os.sep}")
+            tmp = os.path.join(tmpdir, path.name)
+            cmd = [compiler, *cflags, "-fPIC", "-shared", c_file, "-o", tmp]
+            subprocess.run(cmd, cwd=tmpdir, check=True, capture_output=True)
+            os.replace(tmp, path)
+        return path
+
+
+def build_solver(
+    func: Callable[..., cs.Function],
+    name: str,
+    solver: str,
+    problem: Mapping[str, Union[cs.SX, cs.MX]],
+    opts: Mapping[str, Any],
+    cache_dir: Union[None, str, os.PathLike] = None,
+    codegen: bool = False,
+) -> cs.Function:
+    """Builds a solver, or reloads it from the on-disk cache if an identical one was
+    already built and saved.
+
+    Parameters
+    ----------
+    func, solver, problem, opts
+        See :func:`fingerprint`.
+    name : str
+        Name of the solver function. A solver reloaded from the cache keeps the name it
+        was built with.
+    cache_dir : str or path-like, optional
+        The directory of the on-disk cache. If ``None``, the solver is always built and
+        never saved, unless ``codegen=True``, in which case the compiled libraries are
+        cached in a temporary directory.
+    codegen : bool, optional
+        If ``True``, the functions of the problem are generated as C code, compiled into
+        a shared library (cached under the problem's fingerprint) and loaded into the
+        solver, instead of being evaluated symbolically. Only NLP solvers support this.
+        If the options cannot be fingerprinted (see :func:`fingerprint`), a warning is
+        raised and the solver is built symbolically, since the library could never be
+        reused. By default, ``False``.
+
+    Returns
+    -------
+    casadi.Function
+        The built or reloaded solver.
+
+    Raises
+    ------
+    ValueError
+        Raises if ``codegen=True`` and ``func`` is not :func:`casadi.nlpsol`.
+    """
+    if codegen:
+        if func is not cs.nlpsol:
+            raise ValueError("Code generation is only supported for NLP solvers.")
+        key = fingerprint(func, solver, problem, opts)
+        if key is None:
+            warnings.warn(
+                "Solver options cannot be fingerprinted, so code generation is skipped"
+                " and the solver is built symbolically.",
+                RuntimeWarning,
+            )
+            return func(name, solver, problem, opts)
+        if cache_dir is None:
+            cache_dir = os.path.join(tempfile.gettempdir(), "csnlp_codegen")
+        cache = SolverDiskCache(cache_dir)
+        library = cache.library_path(key)
+        if not library.is_file():
+            cache.compile(key, func(name, solver, problem, opts))
+        # the compiled functions cannot be expanded into SX
+        lib_opts = {k: v for k, v in opts.items() if k != "expand"}
+        return func(name, solver, str(library), lib_opts)
+
+    key = None if cache_dir is None else fingerprint(func, solver, problem, opts)
+    if key is None:
+        return func(name, solver, problem, opts)
+    cache = SolverDiskCache(cache_dir)
+    solver_func = cache.load(key)
+    if solver_func is None:
+        solver_func = func(name, solver, problem, opts)
+        cache.save(key, solver_func)
+    return solver_func
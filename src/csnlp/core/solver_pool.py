@@ -0,0 +1,366 @@
+"""Contains a thread-safe pool of independent instances of the solver of an instance of
+:class:`csnlp.Nlp`, which allows to serve solves from multiple threads at once, and a
+persistent pool of worker processes, each holding its own copy of the solver."""
+
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from multiprocessing.context import BaseContext
+from queue import Empty, SimpleQueue
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+import casadi as cs
+import numpy as np
+import numpy.typing as npt
+from joblib.memory import MemorizedFunc
+
+from .shm import SharedArrays
+
+if TYPE_CHECKING:
+    from ..nlps.objective import HasObjective
+
+_WORKER_SOLVER: Optional[cs.Function] = None
+"""Copy of the solver held by each worker process (e.g., of a
+:class:`SolverProcessPool`)."""
+
+_WORKER_ARRAYS: Optional[SharedArrays] = None
+"""Shared arrays of the inputs and outputs of the solver, attached to by each worker
+process."""
+
+SHARED_OUTPUTS = ("x", "lam_g", "lam_x", "f")
+"""Outputs of the solver that workers write in place into the shared arrays."""
+
+
+def _init_worker(
+    serialized_solver: str,
+    shared: Optional[tuple[str, dict[str, tuple[int, int]]]] = None,
+) -> None:
+    """Internal utility to load the solver in a worker process and, if given the name
+    and shapes of the shared arrays of its inputs and outputs, to attach to them."""
+    global _WORKER_SOLVER, _WORKER_ARRAYS
+    _WORKER_SOLVER = cs.Function.deserialize(serialized_solver)
+    if shared is not None:
+        _WORKER_ARRAYS = SharedArrays(shared[1], shared[0])
+
+
+def _solve_in_worker(kwargs: dict[str, npt.ArrayLike]) -> dict[str, Any]:
+    """Internal utility to run the solver of a worker process and get its stats."""
+    sol = _WORKER_SOLVER(**kwargs)
+    sol["stats"] = _WORKER_SOLVER.stats()
+    return sol
+
+
+def _solve_shared_in_worker(
+    j: int,
+    has_x0: bool,
+    shared: Optional[tuple[str, dict[str, tuple[int, int]]]] = None,
+) -> dict[str, Any]:
+    """Internal utility to run the solver of a worker process on the ``j``-th column of
+    the shared arrays of inputs, i.e., ``"p"`` and ``"x0"`` (the bounds ``"lbx"``,
+    ``"ubx"``, ``"lbg"`` and ``"ubg"`` are shared by all columns), and to write the
+    outputs in :data:`SHARED_OUTPUTS` into the ``j``-th column of the shared arrays of
+    outputs. If given the name and shapes of other shared arrays than the ones the
+    worker is attached to, it attaches to these first. Only the stats are returned."""
+    global _WORKER_ARRAYS
+    if shared is not None and (
+        _WORKER_ARRAYS is None or _WORKER_ARRAYS.name != shared[0]
+    ):
+        if _WORKER_ARRAYS is not None:
+            _WORKER_ARRAYS.close()
+        _WORKER_ARRAYS = SharedArrays(shared[1], shared[0])
+    arrays = _WORKER_ARRAYS
+    kwargs = {n: arrays[n][:, 0] for n in ("lbx", "ubx", "lbg", "ubg")}
+    kwargs["p"] = arrays["p"][:, j]
+    if has_x0:
+        kwargs["x0"] = arrays["x0"][:, j]
+    sol = _solve_in_worker(kwargs)
+    for n in SHARED_OUTPUTS:
+        arrays[n][:, j] = sol[n].full()[:, 0]
+    return sol["stats"]
+
+
+def _shared_shapes(nx: int, ng: int, np_: int, n: int) -> dict[str, tuple[int, int]]:
+    """Internal utility to get the shapes of the shared arrays of the inputs and outputs
+    of ``n`` instances of a solver with the given numbers of primal variables,
+    constraints and parameters."""
+    return {
+        "p": (np_, n),
+        "x0": (nx, n),
+        "lbx": (nx, 1),
+        "ubx": (nx, 1),
+        "lbg": (ng, 1),
+        "ubg": (ng, 1),
+        "x": (nx, n),
+        "lam_g": (ng, n),
+        "lam_x": (nx, n),
+        "f": (1, n),
+    }
+
+
+def _write_shared_inputs(
+    arrays: SharedArrays, j: int, kwargs: dict[str, npt.ArrayLike]
+) -> bool:
+    """Internal utility to write the parameters and, if present, the initial guess of
+    the ``j``-th instance into the shared arrays. Returns whether the latter is
+    present."""
+    arrays["p"][:, j] = np.asarray(kwargs["p"], dtype=float).reshape(-1)
+    has_x0 = "x0" in kwargs
+    if has_x0:
+        arrays["x0"][:, j] = np.asarray(kwargs["x0"], dtype=float).reshape(-1)
+    return has_x0
+
+
+def _read_shared_solution(
+    arrays: SharedArrays, j: int, stats: dict[str, Any]
+) -> dict[str, Any]:
+    """Internal utility to build the solution dictionary of the ``j``-th instance from
+    the shared arrays of outputs. The values are copied out, since the arrays are
+    overwritten by the next call."""
+    sol: dict[str, Any] = {n: cs.DM(arrays[n][:, j]) for n in SHARED_OUTPUTS}
+    sol["stats"] = stats
+    return sol
+
+
+class SolverPool:
+    """Thread-safe pool of independent instances of a solver. Each call to the solver
+    checks out an instance from the pool for its exclusive use (see :meth:`checkout`),
+    so that concurrent calls neither share the solver's memory nor read each other's
+    stats, and returns it once done. If all instances are checked out, the call waits
+    for one to be returned.
+
+    Parameters
+    ----------
+    solvers : iterable of joblib.memory.MemorizedFunc
+        The instances of the solver. These must be built independently (e.g., not
+        copies of the same :class:`casadi.Function`), since copies share their
+        internal state.
+
+    Raises
+    ------
+    ValueError
+        Raises if no solver is given.
+    """
+
+    def __init__(self, solvers: Iterable[MemorizedFunc]) -> None:
+        self._solvers = list(solvers)
+        if not self._solvers:
+            raise ValueError("Solver pool must contain at least one solver.")
+        self._init_queue()
+
+    def _init_queue(self) -> None:
+        """Internal utility to fill the queue of available solvers."""
+        self._available: SimpleQueue[MemorizedFunc] = SimpleQueue()
+        for solver in self._solvers:
+            self._available.put(solver)
+
+    @property
+    def size(self) -> int:
+        """Gets the number of solvers in the pool."""
+        return len(self._solvers)
+
+    @property
+    def available(self) -> int:
+        """Gets the number of solvers currently available, i.e., not checked out."""
+        return self._available.qsize()
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None) -> Iterator[MemorizedFunc]:
+        """Context manager that checks out a solver from the pool for the exclusive use
+        of the caller, and returns it to the pool on exit.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximum time, in seconds, to wait for a solver to be available. By default,
+            ``None``, i.e., waits indefinitely.
+
+        Yields
+        ------
+        joblib.memory.MemorizedFunc
+            The checked-out solver.
+
+        Raises
+        ------
+        TimeoutError
+            Raises if no solver becomes available within ``timeout``.
+        """
+        try:
+            solver = self._available.get(timeout=timeout)
+        except Empty:
+            raise TimeoutError("No solver available in the pool.") from None
+        try:
+            yield solver
+        finally:
+            self._available.put(solver)
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"_solvers": self._solvers}  # queues can be neither copied nor pickled
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._init_queue()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(size={self.size},available={self.available})"
+
+
+class _SolverPoolCache:
+    """Internal thread-safe LRU cache of pools of solvers (e.g., of the time-limited
+    variants of a solver, keyed by their time limit), which keeps at most ``maxsize``
+    pools. Pools are built under the lock, so that concurrent requests of the same key
+    build it only once."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._pools: OrderedDict[Any, SolverPool] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Any, build: Callable[[], SolverPool]) -> SolverPool:
+        """Gets the pool with the given key, building it via ``build`` on a miss."""
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is not None:
+                self._pools.move_to_end(key)
+                return pool
+            pool = self._pools[key] = build()
+            if len(self._pools) > self.maxsize:
+                self._pools.popitem(last=False)
+            return pool
+
+    def __len__(self) -> int:
+        return len(self._pools)
+
+    def __getstate__(self) -> dict[str, Any]:
+        # locks can be neither copied nor pickled
+        return {"maxsize": self.maxsize, "_pools": self._pools}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+
+class SolverProcessPool:
+    """Persistent pool of worker processes, each of which loads a copy of the solver of
+    the given NLP once (via CasADi's serialization), and then solves the instances
+    submitted to it, e.g., by :meth:`csnlp.Nlp.solve_batch`. Since only the numerical
+    inputs and outputs of the solver are exchanged with the workers (via shared memory,
+    see :meth:`solve_shared`), the pool can be reused across many calls, and should be
+    shut down once no longer needed (e.g., by using it as a context manager).
+
+    Parameters
+    ----------
+    nlp : Nlp
+        The NLP whose solver is loaded in the workers. The pool is bound to the current
+        solver, and cannot be used once the solver is initialized again.
+    max_workers : int, optional
+        Number of worker processes. By default, the number of processors.
+    mp_context : multiprocessing.context.BaseContext, optional
+        The multiprocessing context used to start the workers. By default, the default
+        context.
+
+    Raises
+    ------
+    RuntimeError
+        Raises if the solver of the NLP is un-initialized.
+    """
+
+    def __init__(
+        self,
+        nlp: "HasObjective",
+        max_workers: Optional[int] = None,
+        mp_context: Optional[BaseContext] = None,
+    ) -> None:
+        nlp = nlp.unwrapped
+        nlp._rebuild_stale_solver()
+        if nlp._solver is None:
+            raise RuntimeError("Solver uninitialized.")
+        self.solver = nlp._solver
+        self.max_workers = max_workers
+        self._executor = ProcessPoolExecutor(
+            max_workers, mp_context, _init_worker, (nlp._solver.func.serialize(),)
+        )
+
+    def submit(self, kwargs: dict[str, npt.ArrayLike]) -> "Future[dict[str, Any]]":
+        """Submits an instance to be solved by a worker.
+
+        Parameters
+        ----------
+        kwargs : dict of (str, array_like)
+            The numerical inputs of the solver, e.g., ``"p"``, ``"x0"``, ``"lbx"``.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            The future of the solver's output dictionary, including its ``"stats"``.
+        """
+        return self._executor.submit(_solve_in_worker, kwargs)
+
+    def solve_shared(
+        self, kwargs: Sequence[dict[str, npt.ArrayLike]]
+    ) -> Iterator[tuple[int, dict[str, Any]]]:
+        """Solves the given instances via the workers, exchanging their inputs and
+        outputs through shared memory (see :class:`csnlp.core.shm.SharedArrays`) rather
+        than by pickling them. The block of shared memory is sized to the instances, and
+        released once the iteration is over.
+
+        Parameters
+        ----------
+        kwargs : sequence of dict of (str, array_like)
+            The numerical inputs of the solver for each instance, i.e., ``"p"`` and,
+            optionally, ``"x0"``, and the bounds ``"lbx"``, ``"ubx"``, ``"lbg"`` and
+            ``"ubg"``, which must be the same for all instances.
+
+        Yields
+        ------
+        tuple of (int, dict)
+            The index of each instance and its solver's output dictionary (with the
+            entries ``"x"``, ``"lam_g"``, ``"lam_x"``, ``"f"`` and ``"stats"``), in the
+            order in which they are completed.
+        """
+        if not kwargs:
+            return
+        solver: cs.Function = self.solver.func
+        shapes = _shared_shapes(
+            solver.size1_in("x0"),
+            solver.size1_in("lbg"),
+            solver.size1_in("p"),
+            len(kwargs),
+        )
+        arrays = SharedArrays(shapes)
+        futures: dict[Future, int] = {}
+        try:
+            for n in ("lbx", "ubx", "lbg", "ubg"):
+                arrays[n][:, 0] = np.asarray(kwargs[0][n], dtype=float).reshape(-1)
+            shared = (arrays.name, shapes)
+            for j, kwargs_ in enumerate(kwargs):
+                has_x0 = _write_shared_inputs(arrays, j, kwargs_)
+                future = self._executor.submit(
+                    _solve_shared_in_worker, j, has_x0, shared
+                )
+                futures[future] = j
+            for future in as_completed(futures):
+                j = futures[future]
+                yield j, _read_shared_solution(arrays, j, future.result())
+        finally:
+            for future in futures:
+                future.cancel()
+            arrays.unlink()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shuts down the worker processes.
+
+        Parameters
+        ----------
+        wait : bool, optional
+            If ``True``, waits for the pending instances to be solved. By default,
+            ``True``.
+        """
+        self._executor.shutdown(wait)
+
+    def __enter__(self) -> "SolverProcessPool":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.shutdown()
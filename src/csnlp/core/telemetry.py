@@ -0,0 +1,245 @@
+"""Contains a bounded ring buffer of timing and solver statistics of the solves of an
+instance of :class:`csnlp.Nlp`, which allows to monitor, e.g., the tail latency of a
+controller in production via percentile summaries and a plain-text metrics export."""
+
+from collections.abc import Iterable, Mapping
+from typing import Any, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+_BASE_METRICS = ("wall_time", "overhead", "solver_time")
+
+
+def _format_value(value: float) -> str:
+    """Internal utility to format a sample value as in the Prometheus exposition format,
+    where special floats are written ``NaN``, ``+Inf`` and ``-Inf``."""
+    if isinstance(value, (int, np.integer)):
+        return str(value)
+    value = float(value)
+    if np.isnan(value):
+        return "NaN"
+    if np.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+
+class SolveTelemetry:
+    """Bounded ring buffer of the telemetry of the last solves of an NLP. For each
+    solve, it records
+
+    - ``"wall_time"``: the total wall time of the call to, e.g., :meth:`csnlp.Nlp.solve`
+    - ``"solver_time"``: the wall time spent in the call to the CasADi solver
+    - ``"overhead"``: the remaining Python overhead, i.e., the time spent packing the
+      solver's inputs and building the solution
+    - ``"iter_count"``: the number of iterations of the solver, if reported
+    - each ``"t_wall_*"`` entry reported in the solver's stats (e.g.,
+      ``"t_wall_nlp_hess_l"`` for IPOPT), i.e., the breakdown of the solver's time
+    - the return status and success flag of the solver.
+
+    Missing numerical entries are stored as NaN. Once full, the oldest solves are
+    overwritten.
+
+    Parameters
+    ----------
+    capacity : int, optional
+        Maximum number of solves kept in the buffer. By default, ``1024``.
+
+    Raises
+    ------
+    ValueError
+        Raises if ``capacity`` is not positive.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        if capacity < 1:
+            raise ValueError("Telemetry capacity must be positive.")
+        self._capacity = capacity
+        self._count = 0
+        self._metrics: dict[str, npt.NDArray[np.floating]] = {
+            n: np.full(capacity, np.nan) for n in (*_BASE_METRICS, "iter_count")
+        }
+        self._statuses = np.empty(capacity, dtype=object)
+        self._success = np.zeros(capacity, dtype=bool)
+
+    @property
+    def capacity(self) -> int:
+        """Gets the maximum number of solves kept in the buffer."""
+        return self._capacity
+
+    @property
+    def count(self) -> int:
+        """Gets the total number of solves recorded so far, including the ones that
+        have already been overwritten."""
+        return self._count
+
+    def __len__(self) -> int:
+        """Gets the number of solves currently in the buffer."""
+        return min(self._count, self._capacity)
+
+    @property
+    def metrics(self) -> tuple[str, ...]:
+        """Gets the names of the numerical metrics recorded so far."""
+        return tuple(self._metrics)
+
+    def record(
+        self, wall_time: float, solver_time: float, stats: Mapping[str, Any]
+    ) -> None:
+        """Records the telemetry of a solve.
+
+        Parameters
+        ----------
+        wall_time : float
+            Total wall time of the solve, in seconds.
+        solver_time : float
+            Wall time spent in the call to the solver, in seconds.
+        stats : dict
+            Stats of the solver's run.
+        """
+        i = self._count % self._capacity
+        metrics = self._metrics
+        metrics["wall_time"][i] = wall_time
+        metrics["solver_time"][i] = solver_time
+        metrics["overhead"][i] = wall_time - solver_time
+        metrics["iter_count"][i] = stats.get("iter_count", np.nan)
+        for name, value in stats.items():
+            if name.startswith("t_wall_"):
+                if name not in metrics:
+                    metrics[name] = np.full(self._capacity, np.nan)
+                metrics[name][i] = value
+        for name in metrics.keys() - stats.keys() - {*_BASE_METRICS, "iter_count"}:
+            metrics[name][i] = np.nan
+        self._statuses[i] = stats.get("return_status", "")
+        self._success[i] = stats.get("success", False)
+        self._count += 1
+
+    def _chronological(self, array: np.ndarray) -> np.ndarray:
+        """Internal utility to get the entries of the buffer from oldest to newest."""
+        n = self._count
+        capacity = self._capacity
+        if n <= capacity:
+            return array[:n].copy()
+        return np.roll(array, -(n % capacity))
+
+    def values(self, metric: str) -> npt.NDArray[np.floating]:
+        """Gets the values of the given metric for the solves in the buffer.
+
+        Parameters
+        ----------
+        metric : str
+            Name of the metric (see :attr:`metrics`).
+
+        Returns
+        -------
+        array of floats
+            The values of the metric, from the oldest to the newest solve.
+        """
+        return self._chronological(self._metrics[metric])
+
+    @property
+    def statuses(self) -> list[str]:
+        """Gets the return statuses of the solves in the buffer, from the oldest to the
+        newest."""
+        return self._chronological(self._statuses).tolist()
+
+    @property
+    def success_rate(self) -> float:
+        """Gets the fraction of successful solves in the buffer (NaN if empty)."""
+        n = len(self)
+        return float(self._success[:n].mean()) if n else float("nan")
+
+    def percentiles(
+        self, q: Iterable[float] = (50, 95, 99)
+    ) -> dict[str, dict[str, float]]:
+        """Computes the percentiles of each metric over the solves in the buffer,
+        ignoring missing values.
+
+        Parameters
+        ----------
+        q : iterable of floats, optional
+            The percentiles to compute, in ``[0, 100]``. By default, the 50th, 95th and
+            99th percentiles.
+
+        Returns
+        -------
+        dict of (str, dict of (str, float))
+            For each metric, a dictionary mapping, e.g., ``"p95"`` to the corresponding
+            percentile. Percentiles of metrics with no values are NaN.
+        """
+        q = np.asarray(tuple(q), dtype=float)
+        keys = [f"p{p:g}" for p in q]
+        n = len(self)
+        summary = {}
+        for name, array in self._metrics.items():
+            values = array[:n]
+            values = values[~np.isnan(values)]
+            if values.size:
+                pcts = np.percentile(values, q)
+            else:
+                pcts = np.full(q.size, np.nan)
+            summary[name] = dict(zip(keys, pcts.tolist()))
+        return summary
+
+    def export_text(
+        self,
+        prefix: str = "csnlp_solve",
+        labels: Optional[Mapping[str, str]] = None,
+        q: Iterable[float] = (50, 95, 99),
+    ) -> str:
+        """Exports a summary of the telemetry in the plain-text exposition format of
+        `Prometheus <https://prometheus.io/docs/instrumenting/exposition_formats/>`_,
+        i.e., one ``summary`` per metric (with the given percentiles as quantiles, and
+        the sum and count over the buffer), plus a counter of the solves and a gauge of
+        the success rate.
+
+        Parameters
+        ----------
+        prefix : str, optional
+            Prefix of the names of the exported metrics. By default, ``"csnlp_solve"``.
+        labels : dict of (str, str), optional
+            Additional labels to attach to each sample, e.g., ``{"nlp": nlp.name}``.
+        q : iterable of floats, optional
+            The percentiles to export. By default, the 50th, 95th and 99th percentiles.
+
+        Returns
+        -------
+        str
+            The exported metrics.
+        """
+        q = tuple(q)
+        labels = dict(labels) if labels is not None else {}
+
+        def fmt(name: str, value: float, **extra: str) -> str:
+            all_labels = {**labels, **extra}
+            lbl = ",".join(f'{k}="{v}"' for k, v in all_labels.items())
+            val = _format_value(value)
+            return f"{name}{{{lbl}}} {val}" if lbl else f"{name} {val}"
+
+        # the counter family is declared without the "_total" suffix of its sample
+        lines = [f"# TYPE {prefix} counter", fmt(f"{prefix}_total", self._count)]
+        lines.append(f"# TYPE {prefix}_success_rate gauge")
+        lines.append(fmt(f"{prefix}_success_rate", self.success_rate))
+        n = len(self)
+        for metric, pcts in self.percentiles(q).items():
+            name = f"{prefix}_{metric}"
+            lines.append(f"# TYPE {name} summary")
+            for p, value in zip(q, pcts.values()):
+                lines.append(fmt(name, value, quantile=f"{p / 100:g}"))
+            values = self._metrics[metric][:n]
+            values = values[~np.isnan(values)]
+            lines.append(fmt(f"{name}_sum", float(values.sum())))
+            lines.append(fmt(f"{name}_count", values.size))
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        """Clears the buffer."""
+        self._count = 0
+        for array in self._metrics.values():
+            array.fill(np.nan)
+        self._statuses.fill(None)
+        self._success.fill(False)
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(capacity={self._capacity},count={self._count})"
+        )
@@ -31,6 +31,9 @@ particular, the module provides the following classes:
   using the :func:`casadi.Function.map` function
 - :class:`ParallelMultistartNlp` runs the optimization problems in parallel using the
   :class:`joblib.Parallel` class
+- :class:`ProcessMultistartNlp` runs the optimization problems in parallel in
+  long-lived worker processes, which load the solver once and exchange the inputs via
+  shared memory
 - :class:`StackedMultistartNlp` runs the optimization problems in parallel by stacking
   them multiple times in a single large-scale optimization problem.
 
@@ -50,6 +53,7 @@ __all__ = [
     "MappedMultistartNlp",
     "MultistartNlp",
     "ParallelMultistartNlp",
+    "ProcessMultistartNlp",
     "RandomStartPoint",
     "RandomStartPoints",
     "StackedMultistartNlp",
@@ -61,6 +65,7 @@ from .multistart_nlp import (
     MappedMultistartNlp,
     MultistartNlp,
     ParallelMultistartNlp,
+    ProcessMultistartNlp,
     StackedMultistartNlp,
 )
 from .startpoints import (
@@ -1,6 +1,11 @@
+import os
+import weakref
 from collections.abc import Iterable, Iterator
-from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache, partial
 from itertools import repeat
+from multiprocessing.context import BaseContext
 from typing import Any, ClassVar, Generic, Literal, Optional, TypeVar, Union
 
 import casadi as cs
@@ -10,6 +15,8 @@ from joblib import Parallel, delayed
 from joblib.memory import MemorizedFunc
 
 from ..core.cache import invalidate_cache
+from ..core.monitor import IterationMonitor
+from ..core.shm import SharedArrays
 from ..core.solutions import (
     EagerSolution,
     LazySolution,
@@ -17,6 +24,13 @@ from ..core.solutions import (
     _is_infeas,
     subsevalf,
 )
+from ..core.solver_pool import (
+    _init_worker,
+    _read_shared_solution,
+    _shared_shapes,
+    _solve_shared_in_worker,
+    _write_shared_inputs,
+)
 from ..nlps.nlp import Nlp
 from ..nlps.objective import _solve_and_get_stats
 
@@ -55,6 +69,12 @@ def _chained_substitute(
     return cs.substitute(expr, cs.vvcat(old), cs.vvcat(new))
 
 
+def _terminate_workers(workers: ProcessPoolExecutor, shared: SharedArrays) -> None:
+    """Internal utility to terminate the workers and release their shared memory."""
+    workers.shutdown()
+    shared.unlink()
+
+
 def _cmp_key(sol: dict[str, Any], plugin_solver: str) -> tuple[bool, bool, float]:
     """Internal utility, similar to :func:`Solution.cmp_key`, but for native CasADi's
     solution dictionaries."""
@@ -158,6 +178,44 @@ class MultistartNlp(Nlp[SymType], Generic[SymType]):
             f"{self.__class__.__name__} does not implement `solve_multi`"
         )
 
+    async def solve_multi_async(
+        self,
+        pars: Union[
+            None, dict[str, npt.ArrayLike], Iterable[dict[str, npt.ArrayLike]]
+        ] = None,
+        vals0: Union[
+            None, dict[str, npt.ArrayLike], Iterable[dict[str, npt.ArrayLike]]
+        ] = None,
+        return_all_sols: bool = False,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Union[Solution[SymType], list[Solution[SymType]]]:
+        """Coroutine that solves the NLP with multiple initial conditions in an
+        executor, without blocking the event loop. See :meth:`solve_multi` for the
+        details on the solve, and :meth:`csnlp.Nlp.solve_async` for the executor,
+        back-pressure, cancellation and ``timeout``.
+
+        Parameters
+        ----------
+        pars, vals0, return_all_sols, kwargs
+            See :meth:`solve_multi`.
+        timeout : float, optional
+            Time, in seconds, after which to stop waiting for the solution(s). By
+            default, ``None``, i.e., no timeout.
+
+        Returns
+        -------
+        Solution or list of Solutions
+            See :meth:`solve_multi`.
+
+        Raises
+        ------
+        asyncio.TimeoutError
+            Raises if the solution is not available within ``timeout``.
+        """
+        func = partial(self.solve_multi, **kwargs)
+        return await self._run_async(func, timeout, pars, vals0, return_all_sols)
+
 
 class StackedMultistartNlp(MultistartNlp[SymType], Generic[SymType]):
     """A class that models and solves an NLP problem from multiple starting initial
@@ -257,11 +315,19 @@ class StackedMultistartNlp(MultistartNlp[SymType], Generic[SymType]):
         opts: Optional[dict[str, Any]] = None,
         solver: str = "ipopt",
         type: Optional[Literal["nlp", "conic"]] = None,
+        cache_dir: Optional[str] = None,
+        codegen: bool = False,
+        monitor: Optional[IterationMonitor] = None,
     ) -> None:
-        out = super().init_solver(opts, solver, type)
-        self._stacked_nlp.init_solver(opts, solver, type)
+        out = super().init_solver(opts, solver, type, cache_dir, codegen, monitor)
+        self._stacked_nlp.init_solver(opts, solver, type, cache_dir, codegen)
         return out
 
+    @contextmanager
+    def batch_edit(self) -> Iterator[None]:
+        with super().batch_edit(), self._stacked_nlp.batch_edit():
+            yield
+
     def solve_multi(
         self,
         pars: Union[
@@ -302,7 +368,7 @@ class StackedMultistartNlp(MultistartNlp[SymType], Generic[SymType]):
         vars_ = self.variables
         pars_ = self.parameters
         duals_ = self.dual_variables
-        fs = [float(multi_sol.value(f)) for f in self._fs]
+        fs = [float(f) for f in multi_sol.values(self._fs)]
 
         all_vars = cs.vertcat(x_, lam_g_and_h_, lam_lbx_and_ubx_, p_)
         splits = np.cumsum(
@@ -343,6 +409,7 @@ class StackedMultistartNlp(MultistartNlp[SymType], Generic[SymType]):
                 dual_vals,
                 multi_sol.stats,
                 solver_plugin,
+                self.unwrapped._structure_version,
             )
 
         if return_all_sols:
@@ -421,16 +488,12 @@ class ParallelMultistartNlp(MultistartNlp[SymType], Generic[SymType]):
         return_all_sols: bool = False,
         **_,
     ) -> Union[Solution[SymType], list[Solution[SymType]]]:
+        self._rebuild_stale_solver()
         if self._solver is None:
             raise RuntimeError("Solver uninitialized.")
         if self._parallel is None:
             self.initialize_parallel()
-        shared_kwargs = {
-            "lbx": self._lbx.data,
-            "ubx": self._ubx.data,
-            "lbg": np.concatenate((np.zeros(self.ng), np.full(self.nh, -np.inf))),
-            "ubg": 0,
-        }
+        shared_kwargs = self._static_solver_args
         pars_iter = (
             repeat(pars, self.starts)
             if pars is None or isinstance(pars, dict)
@@ -465,6 +528,152 @@ class ParallelMultistartNlp(MultistartNlp[SymType], Generic[SymType]):
         self._parallel = None
 
 
+class ProcessMultistartNlp(MultistartNlp[SymType], Generic[SymType]):
+    """A class that solves an NLP problem multiple times, with different initial
+    starting conditions, in parallel via long-lived worker processes. Unlike
+    :class:`ParallelMultistartNlp`, which ships the solver with the tasks, each worker
+    deserializes the solver once (via CasADi's serialization) when the workers are
+    started, and then, at each call to :meth:`solve_multi`, only reads the flat
+    parameters and initial guess of its start from shared memory (see
+    :class:`csnlp.core.shm.SharedArrays`), and writes the primal-dual solution back in
+    place, laid out column-wise as in :class:`MappedMultistartNlp`. Only the stats of
+    each start are pickled, which makes the overhead per call small compared to the
+    solve, even for small NLPs.
+
+    Workers are started at the first call to :meth:`solve_multi` (or via
+    :meth:`initialize_workers`), restarted whenever the solver is initialized again,
+    and should be terminated once no longer needed via :meth:`terminate_workers`. Each
+    call to :meth:`solve_multi` can run at most ``starts`` starts.
+
+    Parameters
+    ----------
+    args, kwargs
+        See inherited :meth:`csnlp.Nlp.__init__`.
+    starts : int
+        A positive integer for the number of multiple starting guesses to optimize.
+    max_workers : int, optional
+        Number of worker processes. If ``None``, it is equal to the number of starts
+        (but at most the number of processors).
+    mp_context : multiprocessing.context.BaseContext, optional
+        The multiprocessing context used to start the workers. By default, the default
+        context.
+
+    Raises
+    ------
+    ValueError
+        Raises if the scenario number is invalid.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        starts: int,
+        max_workers: Optional[int] = None,
+        mp_context: Optional[BaseContext] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, starts=starts, **kwargs)
+        self._max_workers = max_workers or min(starts, os.cpu_count() or 1)
+        self._mp_context = mp_context
+        self._workers: Optional[ProcessPoolExecutor] = None
+        self._shared_arrays: Optional[SharedArrays] = None
+        self._finalizer: Optional[weakref.finalize] = None
+
+    def init_solver(self, *args: Any, **kwargs: Any) -> None:
+        super().init_solver(*args, **kwargs)
+        self.terminate_workers()  # workers hold the previous solver
+
+    def initialize_workers(self) -> None:
+        """Starts the worker processes, each of which loads a copy of the solver."""
+        self._rebuild_stale_solver()
+        if self._solver is None:
+            raise RuntimeError("Solver uninitialized.")
+        self.terminate_workers()
+        nx = self._x.shape[0]
+        ng = self._g.shape[0] + self._h.shape[0]
+        shapes = _shared_shapes(nx, ng, self._p.shape[0], self._starts)
+        self._shared_arrays = SharedArrays(shapes)
+        shared = (self._shared_arrays.name, self._shared_arrays.shapes)
+        self._workers = ProcessPoolExecutor(
+            self._max_workers,
+            self._mp_context,
+            _init_worker,
+            (self._solver.func.serialize(), shared),
+        )
+        # terminate the workers also if this instance is garbage-collected
+        self._finalizer = weakref.finalize(
+            self, _terminate_workers, self._workers, self._shared_arrays
+        )
+
+    def terminate_workers(self) -> None:
+        """Terminates the worker processes, if started, and releases the shared memory
+        of their inputs and outputs."""
+        if self._finalizer is not None:
+            self._finalizer()
+        self._workers = self._shared_arrays = self._finalizer = None
+
+    def solve_multi(
+        self,
+        pars: Union[
+            None, dict[str, npt.ArrayLike], Iterable[dict[str, npt.ArrayLike]]
+        ] = None,
+        vals0: Union[
+            None, dict[str, npt.ArrayLike], Iterable[dict[str, npt.ArrayLike]]
+        ] = None,
+        return_all_sols: bool = False,
+        **_,
+    ) -> Union[Solution[SymType], list[Solution[SymType]]]:
+        self._rebuild_stale_solver()
+        if self._solver is None:
+            raise RuntimeError("Solver uninitialized.")
+        if self._workers is None:
+            self.initialize_workers()
+        pars_iter = (
+            repeat(pars, self.starts)
+            if pars is None or isinstance(pars, dict)
+            else pars
+        )
+        vals0_iter = (
+            repeat(vals0, self.starts)
+            if vals0 is None or isinstance(vals0, dict)
+            else vals0
+        )
+        arrays = self._shared_arrays
+        for n, value in self._static_solver_args.items():
+            arrays[n][:, 0] = value
+        ps = []
+        futures = []
+        for j, (p, v0) in enumerate(zip(pars_iter, vals0_iter)):
+            if j >= self._starts:
+                raise ValueError(f"Expected at most {self._starts} starts.")
+            kwargs = self._process_pars_and_vals0({}, p, v0)
+            ps.append(kwargs["p"])
+            has_x0 = _write_shared_inputs(arrays, j, kwargs)
+            futures.append(self._workers.submit(_solve_shared_in_worker, j, has_x0))
+        sols = [
+            _read_shared_solution(arrays, j, future.result())
+            for j, future in enumerate(futures)
+        ]
+        for sol, p in zip(sols, ps):
+            sol["p"] = p
+        if return_all_sols:
+            return [LazySolution.from_casadi_solution(sol, self) for sol in sols]
+        best_sol = min(sols, key=lambda s: _cmp_key(s, self._solver_plugin))
+        return LazySolution.from_casadi_solution(best_sol, self)
+
+    def __getstate__(self, fullstate: bool = False) -> dict[str, Any]:
+        # workers and shared memory cannot be pickled, nor shared with copies
+        state = super().__getstate__(fullstate)
+        for attr in ("_workers", "_shared_arrays", "_finalizer"):
+            state.pop(attr, None)
+        return state
+
+    def __setstate__(self, state: Optional[dict[str, Any]]) -> None:
+        if state is not None:
+            self.__dict__.update(state)
+        self._workers = self._shared_arrays = self._finalizer = None
+
+
 class MappedMultistartNlp(MultistartNlp[SymType], Generic[SymType]):
     """A class that solves an NLP problem multiple times, with different initial
     conditions, in parallel via :func:`casadi.Function.map` parallelization.
@@ -530,6 +739,7 @@ class MappedMultistartNlp(MultistartNlp[SymType], Generic[SymType]):
         assert not (
             _return_mapped_sol and return_all_sols
         ), "`return_all_sols` and `_return_mapped_sol` can't be both true."
+        self._rebuild_stale_solver()
         if self._mapped_solver is None:
             raise RuntimeError("Solver uninitialized.")
         pars_iter = (
@@ -552,10 +762,7 @@ class MappedMultistartNlp(MultistartNlp[SymType], Generic[SymType]):
         single_kwargs = {
             "x0": cs.hcat(x0s),
             "p": cs.hcat(ps),
-            "lbx": self._lbx.data,
-            "ubx": self._ubx.data,
-            "lbg": np.concatenate((np.zeros(self.ng), np.full(self.nh, -np.inf))),
-            "ubg": 0,
+            **self._static_solver_args,
         }
         single_sol: dict[str, cs.DM] = self._mapped_solver(**single_kwargs)
 
@@ -5,7 +5,9 @@ import casadi as cs
 import numpy as np
 import numpy.typing as npt
 
+from ..core.bounds import BoundsStore
 from ..core.cache import invalidate_cache
+from ..core.layout import NlpLayout, SolutionLayout, VectorLayout
 from .variables import HasVariables
 
 SymType = TypeVar("SymType", cs.SX, cs.MX)
@@ -48,10 +50,7 @@ class HasConstraints(HasVariables[SymType]):
 
         self._g, self._lam_g = self._sym_type(0, 1), self._sym_type(0, 1)
         self._h, self._lam_h = self._sym_type(0, 1), self._sym_type(0, 1)
-        self._lbx: np.ma.MaskedArray = np.ma.empty(0, fill_value=-np.inf)
-        self._ubx: np.ma.MaskedArray = np.ma.empty(0, fill_value=+np.inf)
-        self._lam_lbx = self._sym_type(0, 1)
-        self._lam_ubx = self._sym_type(0, 1)
+        self._bounds = BoundsStore(remove_redundant_x_bounds)
 
         self._remove_redundant_x_bounds = remove_redundant_x_bounds
 
@@ -59,13 +58,13 @@ class HasConstraints(HasVariables[SymType]):
     def lbx(self) -> np.ma.MaskedArray:
         """Gets the lower bound constraints of primary variables of the NLP scheme in
         masked vector form."""
-        return self._lbx
+        return self._bounds.masked("lb")
 
     @property
     def ubx(self) -> np.ma.MaskedArray:
         """Gets the upper bound constraints of primary variables of the NLP scheme in
         masked vector form."""
-        return self._ubx
+        return self._bounds.masked("ub")
 
     @property
     def lam_lbx(self) -> SymType:
@@ -125,32 +124,90 @@ class HasConstraints(HasVariables[SymType]):
     @cached_property
     def nonmasked_lbx_idx(self) -> Union[slice, npt.NDArray[np.int64]]:
         """Gets the indices of non-masked entries in :meth:`lbx` (or the full slice)."""
-        return (
-            slice(None)
-            if np.ma.getmask(self._lbx) is np.ma.nomask
-            else np.where(~np.ma.getmaskarray(self._lbx))[0]
-        )
+        return self._bounds.nonmasked_idx("lb")
 
     @cached_property
     def nonmasked_ubx_idx(self) -> Union[slice, npt.NDArray[np.int64]]:
         """Gets the indices of non-masked entries in :meth:`ubx` (or the full slice)."""
-        return (
-            slice(None)
-            if np.ma.getmask(self._ubx) is np.ma.nomask
-            else np.where(~np.ma.getmaskarray(self._ubx))[0]
-        )
+        return self._bounds.nonmasked_idx("ub")
 
     @cached_property
     def h_lbx(self) -> SymType:
         """Gets the inequalities cor to :meth:`lbx`, i.e., :math:`lbx - x`."""
         idx = self.nonmasked_lbx_idx
-        return self._lbx.data[idx, None] - self._x[idx, :]
+        return self._bounds.lb[idx, None] - self._x[idx, :]
 
     @cached_property
     def h_ubx(self) -> SymType:
         """Gets the inequalities due to :meth:`ubx`, i.e., :math:`x - ubx`."""
         idx = self.nonmasked_ubx_idx
-        return self._x[idx, :] - self._ubx.data[idx, None]
+        return self._x[idx, :] - self._bounds.ub[idx, None]
+
+    @cached_property
+    def _lam_lbx(self) -> SymType:
+        """Internal vector of the multipliers of the lower bounds, assembled only when
+        needed to avoid a concatenation per new variable."""
+        return self._assemble_bound_multipliers("lb")
+
+    @cached_property
+    def _lam_ubx(self) -> SymType:
+        """Internal vector of the multipliers of the upper bounds, assembled only when
+        needed to avoid a concatenation per new variable."""
+        return self._assemble_bound_multipliers("ub")
+
+    @cached_property
+    def _static_solver_args(self) -> dict[str, npt.NDArray[np.floating]]:
+        """Internal dict of the solver arguments that only change with the structure of
+        the NLP, i.e., ``lbx``, ``ubx``, ``lbg`` and ``ubg``, as read-only contiguous
+        arrays."""
+        ng = self.ng
+        ubg = np.zeros(ng + self.nh)
+        lbg = ubg.copy()
+        lbg[ng:] = -np.inf
+        args = {
+            "lbx": self._bounds.lb.copy(),
+            "ubx": self._bounds.ub.copy(),
+            "lbg": lbg,
+            "ubg": ubg,
+        }
+        for arr in args.values():
+            arr.flags.writeable = False
+        return args
+
+    @cached_property
+    def _g_layout(self) -> VectorLayout:
+        """Internal layout of the constraints in the vector passed to the solver, i.e.,
+        the equality constraints followed by the inequality ones."""
+        shapes = {}
+        for group in ("g", "h"):
+            for n, con in self._cons.items():
+                if f"lam_{group}_{n}" in self._dual_vars:
+                    shapes[n] = con.shape
+        return VectorLayout(shapes)
+
+    @cached_property
+    def _solution_layout(self) -> SolutionLayout:
+        """Internal layout of the primal and dual variables in the flat vectors of a
+        solution (see :class:`csnlp.core.solutions.CompactSolution`)."""
+        bounds = self._bounds
+        lbx_idx = {}
+        ubx_idx = {}
+        for name, slc in bounds.slices.items():
+            lbx_idx[name] = slc.start + np.flatnonzero(~bounds.lb_mask[slc])
+            ubx_idx[name] = slc.start + np.flatnonzero(~bounds.ub_mask[slc])
+        g_names = {}
+        for name in self._cons:
+            group = "g" if f"lam_g_{name}" in self._dual_vars else "h"
+            g_names[f"lam_{group}_{name}"] = name
+        return SolutionLayout(
+            self._x_layout, self._p_layout, self._g_layout, lbx_idx, ubx_idx, g_names
+        )
+
+    @property
+    def layout(self) -> NlpLayout:
+        """Gets the layouts of the flat vectors passed to and returned by the solver,
+        mapping the names of variables, parameters and constraints to their slices."""
+        return NlpLayout(self._x_layout, self._p_layout, self._g_layout)
 
     @cached_property
     def lam(self) -> SymType:
@@ -173,8 +230,22 @@ class HasConstraints(HasVariables[SymType]):
         variables (see :meth:`x` and :meth:`lam`, respectively)."""
         return cs.vertcat(self._x, self.lam)
 
+    @invalidate_cache(_solution_layout)
+    def parameter(self, name: str, shape: tuple[int, int] = (1, 1)) -> SymType:
+        return super().parameter(name, shape)
+
     @invalidate_cache(
-        nonmasked_lbx_idx, nonmasked_ubx_idx, h_lbx, h_ubx, lam, primal_dual
+        nonmasked_lbx_idx,
+        nonmasked_ubx_idx,
+        h_lbx,
+        h_ubx,
+        _lam_lbx,
+        _lam_ubx,
+        _static_solver_args,
+        lam,
+        primal_dual,
+        _solution_layout,
+        HasVariables._structure_version,
     )
     def variable(
         self,
@@ -225,28 +296,23 @@ class HasConstraints(HasVariables[SymType]):
 
         var = super().variable(name, shape, discrete)
 
-        mlb: np.ma.MaskedArray = np.ma.masked_array(lb, np.ma.nomask)
-        mub: np.ma.MaskedArray = np.ma.masked_array(ub, np.ma.nomask)
-        if self._remove_redundant_x_bounds:
-            mlb.mask = lb == -np.inf
-            mub.mask = ub == +np.inf
-
-        self._lbx = np.ma.concatenate((self._lbx, mlb))
-        self._ubx = np.ma.concatenate((self._ubx, mub))
-        np.ma.set_fill_value(self._lbx, -np.inf)
-        np.ma.set_fill_value(self._ubx, +np.inf)
-
+        n_lb, n_ub = self._bounds.append(name, lb, ub)
         name_lam_lb = f"lam_lb_{name}"
         name_lam_ub = f"lam_ub_{name}"
-        lam_lb = self._sym_type.sym(name_lam_lb, (~np.ma.getmaskarray(mlb)).sum())
-        lam_ub = self._sym_type.sym(name_lam_ub, (~np.ma.getmaskarray(mub)).sum())
+        lam_lb = self._sym_type.sym(name_lam_lb, n_lb)
+        lam_ub = self._sym_type.sym(name_lam_ub, n_ub)
         self._dual_vars[name_lam_lb] = lam_lb
         self._dual_vars[name_lam_ub] = lam_ub
-        self._lam_lbx = cs.veccat(self._lam_lbx, lam_lb)
-        self._lam_ubx = cs.veccat(self._lam_ubx, lam_ub)
         return var, lam_lb, lam_ub
 
-    @invalidate_cache(lam, primal_dual)
+    @invalidate_cache(
+        _static_solver_args,
+        _g_layout,
+        lam,
+        primal_dual,
+        _solution_layout,
+        HasVariables._structure_version,
+    )
     def constraint(
         self,
         name: str,
@@ -331,12 +397,25 @@ class HasConstraints(HasVariables[SymType]):
         lam_c = self._sym_type.sym(name_lam, shape[0] * shape[1])
         self._dual_vars[name_lam] = lam_c
 
-        setattr(self, group, cs.veccat(getattr(self, group), expr))
-        setattr(self, lam, cs.veccat(getattr(self, lam), lam_c))
+        if self._batch is None:
+            setattr(self, group, cs.veccat(getattr(self, group), expr))
+            setattr(self, lam, cs.veccat(getattr(self, lam), lam_c))
+        else:
+            self._batch.add(group[1:])
         return (expr, lam_c, slack) if soft else (expr, lam_c)
 
     @invalidate_cache(
-        nonmasked_lbx_idx, nonmasked_ubx_idx, h_lbx, h_ubx, lam, primal_dual
+        nonmasked_lbx_idx,
+        nonmasked_ubx_idx,
+        h_lbx,
+        h_ubx,
+        _lam_lbx,
+        _lam_ubx,
+        _static_solver_args,
+        lam,
+        primal_dual,
+        _solution_layout,
+        HasVariables._structure_version,
     )
     def remove_variable_bounds(
         self,
@@ -359,62 +438,36 @@ class HasConstraints(HasVariables[SymType]):
 
         Notes
         -----
-        This is a somewhat costly operation, so it is preferable to avoid creating
-        in the first place constraints that will need to be eliminated. Moreover, this
-        operation may compromise the results already obtained in, e.g., sensitivity
-        analysis, because it changes the underlying NLP problem and there is no way to
-        invalidate any user-arbitrary result obtained previously.
+        This operation may compromise the results already obtained in, e.g.,
+        sensitivity analysis, because it changes the underlying NLP problem and there is
+        no way to invalidate any user-arbitrary result obtained previously.
         """
-        n_rows, n_cols = self._vars[name].shape
-        size = n_rows * n_cols
         if idx is None:
-            idx_ = np.arange(size, dtype=int)
+            idx_ = None
         else:
             # transform 2D indices to 1D (casadi column-wise)
+            n_rows = self._vars[name].shape[0]
             if isinstance(idx, tuple):
                 idx = (idx,)
             idx_ = np.asarray([i[0] + i[1] * n_rows for i in idx], int)
 
-        # add offset to skip variable created prior to the current
-        offset = 0
-        for n, other_var in self._vars.items():
-            if n == name:
-                break
-            offset += other_var.shape[0] * other_var.shape[1]
-        idx_ += offset
-
-        # set lbx and ubx to -/+ inf
-        if direction == "both" or direction == "lb":
-            self._lbx[idx_] = -np.inf
-        if direction == "both" or direction == "ub":
-            self._ubx[idx_] = +np.inf
-
-        if self._remove_redundant_x_bounds:
-            # update masks
-            lbx_mask = np.ma.getmaskarray(self._lbx)
-            ubx_mask = np.ma.getmaskarray(self._ubx)
-            lbx_mask[idx_] = ubx_mask[idx_] = True
-            self._lbx.mask = lbx_mask
-            self._ubx.mask = ubx_mask
-
-            # remove obsolete multipliers
-            directions = ("lb", "ub") if direction == "both" else (direction,)
-            for lb_or_ub in directions:
+        # set lbx and/or ubx to -/+ inf, and mask them if redundant bounds are removed
+        directions = ("lb", "ub") if direction == "both" else (direction,)
+        for lb_or_ub in directions:
+            n_remaining = self._bounds.remove(name, lb_or_ub, idx_)
+            if self._remove_redundant_x_bounds:
+                # replace the obsolete multipliers in the dict
                 name_lam = f"lam_{lb_or_ub}_{name}"
-                bounds = getattr(self, f"_{lb_or_ub}x")[offset : offset + size]
-                mask = np.ma.getmaskarray(bounds)
-                new_lam = self._sym_type.sym(name_lam, (~mask).sum())
-
-                # replace in dict and re-create vector of lbx/ubx multipliers
-                self._dual_vars[name_lam] = new_lam
-                all_lams = [
-                    lam
-                    for n, lam in self._dual_vars.items()
-                    if n.startswith(f"lam_{lb_or_ub}")
-                ]
-                setattr(self, f"_lam_{lb_or_ub}x", cs.vvcat(all_lams))
-
-    @invalidate_cache(lam, primal_dual)
+                self._dual_vars[name_lam] = self._sym_type.sym(name_lam, n_remaining)
+
+    @invalidate_cache(
+        _static_solver_args,
+        _g_layout,
+        lam,
+        primal_dual,
+        _solution_layout,
+        HasVariables._structure_version,
+    )
     def remove_constraints(
         self,
         name: str,
@@ -461,6 +514,16 @@ class HasConstraints(HasVariables[SymType]):
             )
 
         # re-create constraints and multipliers vectors, and refresh the solver
+        if self._batch is None:
+            self._reassemble_constraints(group)
+        else:
+            self._batch.add(group)
+        if hasattr(self, "refresh_solver"):
+            self.refresh_solver()
+
+    def _reassemble_constraints(self, group: Literal["g", "h"]) -> None:
+        """Internal utility to re-create the vectors of constraints and multipliers of
+        the given group from scratch."""
         new_cons = []
         new_lams = []
         for n, con in self._cons.items():
@@ -468,7 +531,21 @@ class HasConstraints(HasVariables[SymType]):
             if name_lam in self._dual_vars:
                 new_cons.append(con)
                 new_lams.append(self._dual_vars[name_lam])
-        setattr(self, f"_{group}", cs.vvcat(new_cons))
-        setattr(self, f"_lam_{group}", cs.vcat(new_lams))
-        if hasattr(self, "refresh_solver"):
-            self.refresh_solver()
+        if new_cons:
+            setattr(self, f"_{group}", cs.vvcat(new_cons))
+            setattr(self, f"_lam_{group}", cs.vcat(new_lams))
+        else:
+            setattr(self, f"_{group}", self._sym_type(0, 1))
+            setattr(self, f"_lam_{group}", self._sym_type(0, 1))
+
+    def _assemble_bound_multipliers(self, lb_or_ub: Literal["lb", "ub"]) -> SymType:
+        """Internal utility to create the vector of multipliers of the lower or upper
+        bounds from scratch."""
+        all_lams = [self._dual_vars[f"lam_{lb_or_ub}_{n}"] for n in self._vars]
+        return cs.vvcat(all_lams) if all_lams else self._sym_type(0, 1)
+
+    def _reassemble(self, groups: set[str]) -> None:
+        super()._reassemble(groups)
+        for group in ("g", "h"):
+            if group in groups:
+                self._reassemble_constraints(group)
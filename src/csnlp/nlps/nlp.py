@@ -9,6 +9,7 @@ import numpy.typing as npt
 from joblib import Memory
 
 from ..core.debug import NlpDebug
+from ..core.solver_pool import _SolverPoolCache
 from ..util.io import SupportsDeepcopyAndPickle
 from .objective import HasObjective
 
@@ -38,6 +39,15 @@ class Nlp(HasObjective[SymType], SupportsDeepcopyAndPickle):
     debug : bool, optional
         If ``True``, the NLP logs in the :meth:`debug` property information regarding
         the creation of parameters, variables and constraints. By default, ``False``.
+    lazy_refresh : bool, optional
+        If ``True``, edits made to the NLP after the solver has been initialized only
+        mark the solver as stale, and the solver is rebuilt once when next needed (e.g.,
+        in :meth:`solve` or :meth:`to_function`). Otherwise, the solver is rebuilt at
+        each edit. By default, ``False``.
+    auto_warm_start : bool, optional
+        If ``True``, each call to :meth:`solve` without an explicit ``warm_start`` is
+        warm-started from the last successful solution (if the NLP structure has not
+        changed since). By default, ``False``.
 
     Raises
     ------
@@ -62,10 +72,20 @@ class Nlp(HasObjective[SymType], SupportsDeepcopyAndPickle):
         cache: Memory = None,
         name: Optional[str] = None,
         debug: bool = False,
+        lazy_refresh: bool = False,
+        auto_warm_start: bool = False,
     ) -> None:
         id = next(self.__ids)
         name = f"{self.__class__.__name__}{id}" if name is None else name
-        HasObjective.__init__(self, sym_type, remove_redundant_x_bounds, cache, name)
+        HasObjective.__init__(
+            self,
+            sym_type,
+            remove_redundant_x_bounds,
+            cache,
+            name,
+            lazy_refresh,
+            auto_warm_start,
+        )
         SupportsDeepcopyAndPickle.__init__(self)
         self.id = id
         self._debug = NlpDebug() if debug else None
@@ -173,6 +193,7 @@ class Nlp(HasObjective[SymType], SupportsDeepcopyAndPickle):
                 " will be wrapped in MX.",
                 RuntimeWarning,
             )
+        self._rebuild_stale_solver()
         S = self._solver
         if S is None:
             raise RuntimeError("Solver not yet initialized.")
@@ -194,16 +215,7 @@ class Nlp(HasObjective[SymType], SupportsDeepcopyAndPickle):
             ins = [Fin.mx_in(i) for i in range(n_ins)]
             outs = [Fout.mx_out(i) for i in range(n_outs)]
         x0, p = Fin(*ins)
-        sol = S(
-            x0=x0,
-            p=p,
-            lbx=self._lbx.data,
-            ubx=self._ubx.data,
-            lbg=np.concatenate((np.zeros(self.ng), np.full(self.nh, -np.inf))),
-            ubg=0,
-            lam_x0=0,
-            lam_g0=0,
-        )
+        sol = S(x0=x0, p=p, lam_x0=0, lam_g0=0, **self._static_solver_args)
         x = sol["x"]
         lam_g = sol["lam_g"][: self.ng, :]
         lam_h = sol["lam_g"][self.ng :, :]
@@ -241,3 +253,22 @@ class Nlp(HasObjective[SymType], SupportsDeepcopyAndPickle):
     def __repr__(self) -> str:
         """Returns the string representation of the NLP instance."""
         return f"{type(self).__name__}: {self.name}"
+
+    def __getstate__(self, fullstate: bool = False) -> Optional[dict[str, Any]]:
+        state = super().__getstate__(fullstate)
+        if state is not None:
+            # worker processes cannot be shared with copies
+            state["_batch_process_pool"] = None
+            state["_batch_process_finalizer"] = None
+        if state is not None and self._solver_monitor is not None:
+            # the solver's callback refers to this instance's monitor, so copies must
+            # rebuild it; moreover, it can be serialized but not deserialized
+            if fullstate:
+                state["_solver_is_stale"] = True
+            else:
+                state["_solver"] = None
+                state.setdefault("_solver_monitor", None)
+            state["_time_limited_solvers"] = _SolverPoolCache(
+                self._time_limited_solvers.maxsize
+            )
+        return state
@@ -1,4 +1,13 @@
-from typing import Any, Literal, Optional, TypeVar
+import math
+import os
+import weakref
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from functools import partial
+from itertools import repeat
+from time import perf_counter
+from typing import Any, Callable, Literal, Optional, TypeVar, Union
 
 import casadi as cs
 import numpy as np
@@ -6,10 +15,60 @@ import numpy.typing as npt
 from joblib import Memory
 from joblib.memory import MemorizedFunc
 
-from ..core.solutions import LazySolution, Solution, subsevalf
+from ..core.aio import SupportsAsyncSolve
+from ..core.cache import invalidate_caches_of
+from ..core.hooks import SupportsSolveHooks
+from ..core.layout import VectorLayout
+from ..core.monitor import IterationMonitor
+from ..core.solutions import LazySolution, RawSolution, Solution
+from ..core.solver_cache import build_solver
+from ..core.solver_pool import SolverPool, SolverProcessPool, _SolverPoolCache
+from ..core.telemetry import SolveTelemetry
 from .constraints import HasConstraints
 
 SymType = TypeVar("SymType", cs.SX, cs.MX)
+# NOTE: osqp is not listed, since CasADi's interface rejects its time_limit setting as
+# not recognised (OSQP's timing is only compiled in with profiling enabled)
+_TIME_LIMIT_OPTIONS: dict[str, tuple[Optional[str], str]] = {
+    "ipopt": ("ipopt", "max_wall_time"),
+    "qpoases": (None, "CPUtime"),
+    "highs": ("highs", "time_limit"),
+    "gurobi": ("gurobi", "TimeLimit"),
+    "bonmin": ("bonmin", "time_limit"),
+}
+"""Solver plugins supporting deadlines, with the (possibly nested) time-limit option."""
+_TIME_LIMIT_STATUSES: dict[str, tuple[str, ...]] = {
+    "ipopt": ("Maximum_WallTime_Exceeded", "Maximum_CpuTime_Exceeded"),
+    "qpoases": ("Maximum number of working set recalculations performed.",),
+    "highs": ("Time limit reached",),
+    "gurobi": ("TIME_LIMIT",),
+    "bonmin": ("LIMIT_EXCEEDED",),
+}
+"""Return statuses with which each plugin in :data:`_TIME_LIMIT_OPTIONS` reports that
+its time limit was hit. Those of qpOASES and Bonmin are shared with their limits on the
+number of iterations (working set recalculations, or nodes)."""
+_DEADLINE_STEPS_PER_DECADE = 6
+"""Deadlines are rounded down to a geometric grid with this many values per decade
+(i.e., in steps of about 47%), so that nearby deadlines share the same time-limited
+variant of the solver."""
+_MAX_TIME_LIMITED_SOLVERS = 3 * _DEADLINE_STEPS_PER_DECADE
+"""Maximum number of time-limited variants of the solver kept at once, i.e., enough to
+cover deadlines varying within three decades without evictions."""
+_MAPPED_FEAS_TOL = 1e-6
+"""Tolerance on the violation of the constraints and bounds below which an instance
+solved by a mapped solver (which does not report stats) is deemed successful."""
+_MAPPED_STATUSES = ("Mapped_Infeasible_Or_Nonfinite", "Mapped_Feasible")
+"""Return statuses of the instances solved by a mapped solver, by success."""
+DeadlineFallback = Union[
+    Literal["iterate", "previous"], Callable[[Solution, Optional[Solution]], Any]
+]
+
+
+def _round_deadline(seconds: float) -> float:
+    """Internal utility to round a deadline down to the grid of
+    :data:`_DEADLINE_STEPS_PER_DECADE`."""
+    n = _DEADLINE_STEPS_PER_DECADE
+    return 10 ** (math.floor(math.log10(seconds) * n + 1e-9) / n)
 
 
 def _solve_and_get_stats(
@@ -28,10 +87,12 @@ def _solve_and_get_stats(
     return sol
 
 
-class HasObjective(HasConstraints[SymType]):
+class HasObjective(HasConstraints[SymType], SupportsSolveHooks, SupportsAsyncSolve):
     r"""Class for creating an NLP problem with parameters, variables, constraints and an
     objective. It builds on top of :class:`HasConstraints`, which handles parameters,
-    variables and constraints.
+    variables and constraints. Hooks can be registered around its solve path (see
+    :class:`csnlp.core.hooks.SupportsSolveHooks`), and it can be solved asynchronously
+    (see :class:`csnlp.core.aio.SupportsAsyncSolve`).
 
     Parameters
     ----------
@@ -46,6 +107,16 @@ class HasObjective(HasConstraints[SymType]):
         no caching occurs.
     name : str, optional
         Name of the NLP scheme. If ``None``, it is automatically assigned.
+    lazy_refresh : bool, optional
+        If ``True``, edits to the NLP (new parameters, variables, constraints, etc.)
+        made after the solver has been initialized do not rebuild the solver right
+        away, but only mark it as stale. The solver is then rebuilt once, the next time
+        it is needed (e.g., in :meth:`solve`). By default, ``False``, i.e., the solver
+        is rebuilt at every edit.
+    auto_warm_start : bool, optional
+        If ``True``, each call to :meth:`solve` without an explicit ``warm_start`` is
+        warm-started (both primal and dual variables) from the last successful solution
+        (if the NLP structure has not changed since). By default, ``False``.
 
     Notes
     -----
@@ -60,14 +131,33 @@ class HasObjective(HasConstraints[SymType]):
         remove_redundant_x_bounds: bool = True,
         cache: Memory = None,
         name: Optional[str] = None,
+        lazy_refresh: bool = False,
+        auto_warm_start: bool = False,
     ) -> None:
         super().__init__(sym_type, remove_redundant_x_bounds)
         self.name = name
         self._f: Optional[SymType] = None
         self._solver: Optional[MemorizedFunc] = None
         self._solver_opts: dict[str, Any] = {}
+        self._solver_cache_dir: Optional[str] = None
+        self._solver_codegen = False
+        self._solver_monitor: Optional[IterationMonitor] = None
+        self._solver_constructor: Optional[Callable[..., cs.Function]] = None
+        self._time_limited_solvers = _SolverPoolCache(_MAX_TIME_LIMITED_SOLVERS)
+        self._solver_pool: Optional[SolverPool] = None
+        self._batch_thread_pool: Optional[SolverPool] = None
+        self._batch_process_pool: Optional[SolverProcessPool] = None
+        self._batch_process_finalizer: Optional[weakref.finalize] = None
         self._cache = cache if cache is not None else Memory(None)
         self._failures = 0
+        self._lazy_refresh = lazy_refresh
+        self._solver_is_stale = False
+        self._refreshes_avoided = 0
+        self._auto_warm_start = auto_warm_start
+        self._last_solution: Optional[Solution[SymType]] = None
+        self._last_success: Optional[Solution[SymType]] = None
+        self._deadline_misses = 0
+        self._telemetry: Optional[SolveTelemetry] = None
 
     @property
     def f(self) -> Optional[SymType]:
@@ -78,7 +168,9 @@ class HasObjective(HasConstraints[SymType]):
     @property
     def solver(self) -> Optional[cs.Function]:
         """Gets the NLP optimization solver. Can be ``None``, if the solver is not set
-        with method :meth:`init_solver`."""
+        with method :meth:`init_solver`. If stale (see ``lazy_refresh``), the solver is
+        first rebuilt."""
+        self._rebuild_stale_solver()
         return self._solver.func if self._solver is not None else None
 
     @property
@@ -92,11 +184,144 @@ class HasObjective(HasConstraints[SymType]):
         """Gets the cumulative number of failures of the NLP solver."""
         return self._failures
 
+    @property
+    def deadline_misses(self) -> int:
+        """Gets the cumulative number of solves that missed their ``deadline`` (see
+        :meth:`solve`)."""
+        return self._deadline_misses
+
+    @property
+    def lazy_refresh(self) -> bool:
+        """Gets whether the solver is lazily rebuilt after edits to the NLP."""
+        return self._lazy_refresh
+
+    @property
+    def solver_is_stale(self) -> bool:
+        """Gets whether the solver is out of date w.r.t. the NLP and will be rebuilt the
+        next time it is needed. Can only be ``True`` if ``lazy_refresh=True``."""
+        return self._solver_is_stale
+
+    @property
+    def refreshes_avoided(self) -> int:
+        """Gets the cumulative number of solver rebuilds that were avoided thanks to
+        ``lazy_refresh=True``, i.e., the number of edits that did not trigger a rebuild
+        of an already stale solver."""
+        return self._refreshes_avoided
+
+    @property
+    def auto_warm_start(self) -> bool:
+        """Gets whether each solve is automatically warm-started from the last
+        successful solution."""
+        return self._auto_warm_start
+
+    @property
+    def telemetry(self) -> Optional[SolveTelemetry]:
+        """Gets the telemetry of the last solves, or ``None`` if not enabled via
+        :meth:`init_telemetry`."""
+        return self._telemetry
+
+    def init_telemetry(
+        self, capacity: Optional[int] = 1024
+    ) -> Optional[SolveTelemetry]:
+        """Enables (or disables) the recording of the timings and solver statistics of
+        each call to :meth:`solve` and :meth:`solve_raw` into a bounded ring buffer. See
+        :class:`csnlp.core.telemetry.SolveTelemetry` for the recorded metrics.
+
+        Parameters
+        ----------
+        capacity : int, optional
+            Maximum number of solves kept in the buffer. If ``None``, telemetry is
+            disabled. By default, ``1024``.
+
+        Returns
+        -------
+        SolveTelemetry or None
+            The new, empty telemetry buffer, or ``None`` if disabled.
+        """
+        self._telemetry = None if capacity is None else SolveTelemetry(capacity)
+        return self._telemetry
+
+    @property
+    def solver_pool(self) -> Optional[SolverPool]:
+        """Gets the pool of solvers (see :meth:`init_solver_pool`), or ``None`` if not
+        enabled."""
+        return self._solver_pool
+
+    def init_solver_pool(self, size: Optional[int]) -> Optional[SolverPool]:
+        """Enables (or disables) a pool of independent instances of the solver, so that
+        :meth:`solve` and :meth:`solve_raw` can be safely called from multiple threads
+        at once. Each call checks out an instance for its exclusive use, so that the
+        solver's stats are captured together with its own result, and calls run in
+        parallel as far as the solver releases the GIL. See
+        :class:`csnlp.core.solver_pool.SolverPool`. The pool is rebuilt (with the same
+        size) whenever the solver is initialized again.
+
+        Parameters
+        ----------
+        size : int
+            Number of instances of the solver in the pool, i.e., of solves that can run
+            at once. The current solver is the first instance, and the others are built
+            with the same options. If ``None``, the pool is disabled.
+
+        Returns
+        -------
+        SolverPool or None
+            The new pool, or ``None`` if disabled.
+
+        Raises
+        ------
+        ValueError
+            Raises if ``size`` is not positive; or if the solver has an iteration
+            monitor, which cannot be shared by concurrent solves.
+        RuntimeError
+            Raises if the solver is un-initialized (see :meth:`init_solver`).
+
+        Notes
+        -----
+        Solves with a ``deadline`` (see :meth:`solve`) check out their time-limited
+        variant of the solver from a pool of the same size. Moreover, the bookkeeping
+        of the NLP (e.g., :attr:`failures`, the telemetry, or the last solution used
+        for ``auto_warm_start``) is shared by all threads and is not synchronized.
+        """
+        if size is not None and size < 1:
+            raise ValueError("Solver pool size must be positive.")
+        # time-limited variants are pooled with the same size
+        self._time_limited_solvers = _SolverPoolCache(_MAX_TIME_LIMITED_SOLVERS)
+        if size is None:
+            self._solver_pool = None
+            return None
+        self._rebuild_stale_solver()
+        if self._solver is None:
+            raise RuntimeError("Solver uninitialized.")
+        self._solver_pool = self._make_solver_pool(size)
+        return self._solver_pool
+
+    def _make_solver_pool(self, size: int, shared: bool = True) -> SolverPool:
+        """Internal utility to build a pool with the current solver and ``size - 1``
+        independent instances of it or, if not ``shared``, with ``size`` independent
+        instances, none of which is used by :meth:`solve`."""
+        if self._solver_monitor is not None:
+            raise ValueError("Solver pools are not supported with iteration monitors.")
+        solvers = [self._solver] if shared else []
+        for _ in range(size - len(solvers)):
+            solver_func = self._build_solver(
+                self._solver_constructor,
+                self._solver_plugin,
+                self._solver_opts,
+                self._solver_cache_dir,
+                self._solver_codegen,
+            )
+            solvers.append(self._cache.cache(solver_func))
+        return SolverPool(solvers)
+
     def init_solver(
         self,
         opts: Optional[dict[str, Any]] = None,
         solver: str = "ipopt",
         type: Optional[Literal["nlp", "conic"]] = None,
+        cache_dir: Optional[str] = None,
+        codegen: bool = False,
+        monitor: Optional[IterationMonitor] = None,
     ) -> None:
         """Initializes the solver for this NLP with the given options.
 
@@ -117,18 +342,45 @@ class HasObjective(HasConstraints[SymType]):
             be instantiated with :func:`casadi.nlpsol`. If ``"conic"``, then
             :func:`casadi.qpsol` is forced instead. If ``None``, then the problem type
             is selected automatically.
+        cache_dir : str, optional
+            Directory of a persistent, on-disk cache of solvers. If given, the solver is
+            serialized to this directory, keyed by a structural fingerprint of the NLP
+            and of the solver's plugin and options, and reloaded from it (instead of
+            being built anew) whenever an identical NLP initializes its solver, e.g.,
+            in another process. Solvers whose options cannot be fingerprinted (e.g.,
+            callbacks) are not cached. See :mod:`csnlp.core.solver_cache`. By default,
+            ``None``, i.e., no on-disk caching.
+        codegen : bool, optional
+            If ``True``, C code is generated for the objective, the constraints and
+            their derivatives (e.g., Jacobian and Hessian of the Lagrangian), compiled
+            with the local C compiler into a shared library and loaded into the solver,
+            which is usually much faster than evaluating them symbolically. Libraries
+            are cached in ``cache_dir`` (or in a temporary directory, if not given),
+            keyed by the same structural fingerprint, so compilation only happens once.
+            Only supported by NLP solvers. By default, ``False``.
+        monitor : IterationMonitor, optional
+            Monitor of the solver's iterations (see
+            :class:`csnlp.core.monitor.IterationMonitor`), which is passed to the solver
+            as ``iteration_callback``, records the convergence trace of each call to
+            :meth:`solve` and :meth:`solve_raw`, and can stop the solver early. Only
+            supported by NLP solvers, and prevents on-disk caching of the solver. By
+            default, ``None``.
 
         Raises
         ------
         ValueError
-            Raises if the given problem type is not recognized, or if the ``opts`` dict
-            contains the
+            Raises if the given problem type is not recognized, if the ``opts`` dict
+            contains the ``"discrete"`` or ``"iteration_callback"`` keys, or if
+            ``codegen=True`` or a ``monitor`` is given for a conic problem (or with a
+            pool of solvers, see :meth:`init_solver_pool`).
         RuntimeError
             Raises if the type of the problem cannot be inferred automatically (when the
             solver supports both conic and NLPs), if the specified solver plugin cannot
-            be found, and if the objective has not yet been specified with
-            :meth:`minimize`.
+            be found, if the objective has not yet been specified with
+            :meth:`minimize`, or if called within :meth:`batch_edit`.
         """
+        if self._batch is not None:
+            raise RuntimeError("Cannot initialize the solver during a batch edit.")
         has_conic = cs.has_conic(solver)
         has_nlpsol = cs.has_nlpsol(solver)
         auto_type = type is None
@@ -154,24 +406,175 @@ class HasObjective(HasConstraints[SymType]):
         opts = {} if opts is None else opts.copy()
         if "discrete" in opts:
             raise ValueError("The 'discrete' key is reserved for the variable domains.")
-        if self.has_discrete:
-            disc = self.discrete
-            opts["discrete"] = [disc.item()] if disc.size == 1 else disc  # bugfix
-        con = cs.vertcat(self._g, self._h)
-        problem = {"x": self._x, "p": self._p, "g": con, "f": self._f}
-        solver_func = func(f"solver_{solver}_{self.name}", solver, problem, opts)
+        if monitor is not None:
+            if func is not cs.nlpsol:
+                raise ValueError("Iteration monitors are only supported for NLPs.")
+            if "iteration_callback" in opts:
+                raise ValueError("Cannot pass both iteration_callback and monitor.")
+            if self._solver_pool is not None:
+                raise ValueError("Iteration monitors are not supported with pools.")
+            opts["iteration_callback"] = monitor._bind(self)
+        solver_func = self._build_solver(func, solver, opts, cache_dir, codegen)
 
         self._solver = self._cache.cache(solver_func)
-        opts.pop("discrete", None)
+        if monitor is not None:
+            opts.pop("iteration_callback")
         self._solver_opts = opts
         self._solver_plugin = solver
         self._solver_type = type
+        self._solver_cache_dir = cache_dir
+        self._solver_codegen = codegen
+        self._solver_monitor = monitor
+        self._solver_constructor = func
+        self._time_limited_solvers = _SolverPoolCache(_MAX_TIME_LIMITED_SOLVERS)
+        self._batch_thread_pool = None
+        self.shutdown_batch_pool()
+        self._solver_is_stale = False
+        # previous solutions may not match the new structure
+        self._last_solution = self._last_success = None
+        if self._solver_pool is not None:
+            self.init_solver_pool(self._solver_pool.size)
+
+    def shutdown_batch_pool(self, wait: bool = True) -> None:
+        """Shuts down the worker processes that :meth:`solve_batch` keeps alive across
+        calls with ``executor="process"``, if any. They are otherwise shut down when the
+        solver is initialized again, or when this NLP is garbage collected.
+
+        Parameters
+        ----------
+        wait : bool, optional
+            If ``True``, waits for the pending instances to be solved. By default,
+            ``True``.
+        """
+        if self._batch_process_finalizer is not None:
+            self._batch_process_finalizer.detach()
+            self._batch_process_pool.shutdown(wait)
+        self._batch_process_pool = self._batch_process_finalizer = None
+
+    def _build_solver(
+        self,
+        func: Callable[..., cs.Function],
+        solver: str,
+        opts: dict[str, Any],
+        cache_dir: Optional[str],
+        codegen: bool,
+    ) -> cs.Function:
+        """Internal utility to build the solver function with the given options."""
+        if self.has_discrete:
+            disc = self.discrete
+            disc = [disc.item()] if disc.size == 1 else disc  # bugfix
+            opts = {**opts, "discrete": disc}
+        con = cs.vertcat(self._g, self._h)
+        problem = {"x": self._x, "p": self._p, "g": con, "f": self._f}
+        name = f"solver_{solver}_{self.name}"
+        return build_solver(func, name, solver, problem, opts, cache_dir, codegen)
+
+    def _time_limited_solver(self, deadline: float) -> SolverPool:
+        """Internal utility to get the pool of variants of the solver with the time
+        limit of the given deadline (rounded down, see :func:`_round_deadline`), which
+        is built on the first request and then reused (until the solver is initialized
+        again, or the variant is evicted by more recent ones)."""
+        plugin = self._solver_plugin
+        if plugin not in _TIME_LIMIT_OPTIONS:
+            raise ValueError(f"Deadlines are not supported for solver '{plugin}'.")
+        seconds = _round_deadline(deadline)
+
+        def build() -> SolverPool:
+            group, option = _TIME_LIMIT_OPTIONS[plugin]
+            opts = self._solver_opts.copy()
+            if group is None:
+                opts[option] = seconds
+            else:
+                opts[group] = {**opts.get(group, {}), option: seconds}
+            if self._solver_monitor is not None:
+                opts["iteration_callback"] = self._solver_monitor._callback
+            size = 1 if self._solver_pool is None else self._solver_pool.size
+            solvers = []
+            for _ in range(size):
+                solver_func = self._build_solver(
+                    self._solver_constructor,
+                    plugin,
+                    opts,
+                    self._solver_cache_dir,
+                    self._solver_codegen,
+                )
+                solvers.append(self._cache.cache(solver_func))
+            return SolverPool(solvers)
+
+        return self._time_limited_solvers.get(seconds, build)
 
     def refresh_solver(self) -> None:
         """Refresh and resets the internal solver function (with the same options, if
-        previously set)."""
-        if self._solver is not None:
-            self.init_solver(self._solver_opts, self._solver_plugin, self._solver_type)
+        previously set). If ``lazy_refresh=True``, the solver is only marked as stale
+        and rebuilt the next time it is needed."""
+        if self._solver is None:
+            return
+        if self._lazy_refresh or self._batch is not None:
+            self._refreshes_avoided += self._solver_is_stale
+            self._solver_is_stale = True
+        else:
+            self.init_solver(
+                self._solver_opts,
+                self._solver_plugin,
+                self._solver_type,
+                self._solver_cache_dir,
+                self._solver_codegen,
+                self._solver_monitor,
+            )
+
+    def _rebuild_stale_solver(self) -> None:
+        """Internal utility to rebuild the solver, if it was marked as stale."""
+        if self._solver_is_stale:
+            self.init_solver(
+                self._solver_opts,
+                self._solver_plugin,
+                self._solver_type,
+                self._solver_cache_dir,
+                self._solver_codegen,
+                self._solver_monitor,
+            )
+
+    @contextmanager
+    def batch_edit(self) -> Iterator[None]:
+        """Context manager to apply a batch of structural edits to the NLP in one pass.
+        Within the context, additions and removals of parameters, variables, bounds and
+        constraints only update the corresponding dictionaries; on exit, the vectors of
+        parameters, variables, constraints and multipliers are reassembled once, cached
+        properties are invalidated once, and the solver is rebuilt once (or marked as
+        stale, if ``lazy_refresh=True``). Nested calls are merged into the outermost
+        one.
+
+        Notes
+        -----
+        Within the context, aggregated quantities such as :meth:`x`, :meth:`g`,
+        :meth:`lam` or :meth:`nx` are not up to date, and the solver cannot be
+        initialized or called.
+
+        Examples
+        --------
+        >>> with nlp.batch_edit():
+        ...     for name in names:
+        ...         nlp.remove_constraints(name)
+        """
+        if self._batch is not None:
+            yield
+            return
+        self._batch = set()
+        try:
+            yield
+        except BaseException:
+            self._end_batch_edit()
+            raise
+        self._end_batch_edit()
+        if not self._lazy_refresh:
+            self._rebuild_stale_solver()
+
+    def _end_batch_edit(self) -> None:
+        """Internal utility to apply the pending reassembly of a batch of edits."""
+        groups = self._batch
+        self._batch = None
+        self._reassemble(groups)
+        invalidate_caches_of(self)
 
     def minimize(self, objective: SymType) -> None:
         """Sets the objective function to be minimized.
@@ -211,6 +614,9 @@ class HasObjective(HasConstraints[SymType]):
         self,
         pars: Optional[dict[str, npt.ArrayLike]] = None,
         vals0: Optional[dict[str, npt.ArrayLike]] = None,
+        warm_start: Union[None, Solution[SymType], dict[str, npt.ArrayLike]] = None,
+        deadline: Optional[float] = None,
+        fallback: DeadlineFallback = "iterate",
     ) -> Solution[SymType]:
         """Solves the NLP optimization problem.
 
@@ -224,42 +630,475 @@ class HasObjective(HasConstraints[SymType]):
             Dictionary or structure containing, for each variable in the NLP scheme, the
             corresponding initial guess. By default, initial guesses are not passed to
             the solver.
+        warm_start : Solution or dict[str, array_like], optional
+            Dual (and, possibly, primal) warm start for the solver. If a previous
+            solution of this NLP is given, its multipliers are passed to the solver as
+            ``lam_g0`` and ``lam_x0``, and its primal variables as ``x0`` (unless
+            ``vals0`` is given). If a dictionary is given, it must contain, for each
+            dual variable in :meth:`dual_variables`, the corresponding initial guess
+            (missing ones default to zero). If ``None`` and ``auto_warm_start=True``,
+            the last successful solution is used. Note that some solvers need to be
+            explicitly told to use dual warm starts, e.g., IPOPT requires the option
+            ``"warm_start_init_point": "yes"``.
+        deadline : float, optional
+            Time limit of the solver's run, in seconds. It is mapped to the time-limit
+            option of the solver plugin (e.g., ``max_wall_time`` for IPOPT, ``CPUtime``
+            for qpOASES, ``time_limit`` for HiGHS) in a variant of the solver. Building
+            a variant costs as much as :meth:`init_solver` (and, with a pool, see
+            :meth:`init_solver_pool`, as many builds as its size), so deadlines are
+            rounded down to a grid of six values per decade (e.g., ``0.0464``,
+            ``0.0681``, ``0.1``), and the variants of the most recent values (enough for
+            deadlines within three decades) are kept and reused. Hence, a controller
+            that passes the time left at each step (e.g., ``0.0498``, ``0.0501``) pays
+            for a build only the first time each grid value is hit. By default,
+            ``None``, i.e., the time limit in the solver's options applies.
+        fallback : "iterate", "previous" or callable, optional
+            What to return when the solver fails because it missed the ``deadline``:
+
+            - ``"iterate"``: the solution at the solver's last iterate
+            - ``"previous"``: the last successful solution of this NLP, if any (the
+              last iterate, otherwise), as is. For an MPC controller, see
+              :meth:`csnlp.wrappers.Mpc.solve`, which shifts it by one time step
+            - a callable ``fallback(sol, previous)``, which receives the last iterate
+              and the last successful solution (or ``None``) and whose output is
+              returned, e.g., a safe action or, for an MPC controller, the plan of the
+              previous solution shifted by one step (see
+              :meth:`csnlp.wrappers.Mpc.shift`).
+
+            By default, ``"iterate"``. Misses are counted in :attr:`deadline_misses`.
 
         Returns
         -------
         sol : Solution
-            A solution object containing all the information.
+            A solution object containing all the information (or the output of the
+            ``fallback``, if the deadline was missed).
 
         Raises
         ------
         RuntimeError
             Raises if the solver is un-initialized (see :meth:`init_solver`); or if not
             all the parameters are not provided with a numerical value.
+        ValueError
+            Raises if the warm-start solution does not match the structure of the NLP;
+            if the deadline is not positive, the fallback is not recognized or the
+            solver plugin does not support deadlines.
         """
+        hooks = self._solve_hooks
+        if hooks:
+            self._run_solve_hooks("before_pack")
+        t0 = perf_counter()
+        self._rebuild_stale_solver()
         if self._solver is None:
             raise RuntimeError("Solver uninitialized.")
+        pool = self._solver_pool
+        if deadline is not None:
+            if deadline <= 0:
+                raise ValueError("Deadline must be positive.")
+            if fallback not in ("iterate", "previous") and not callable(fallback):
+                raise ValueError(f"Unknown deadline fallback '{fallback}'.")
+            pool = self._time_limited_solver(float(deadline))
+        if (
+            warm_start is None
+            and self._last_solution is not None
+            # the structure may have changed without the solver being rebuilt, e.g.,
+            # when bounds are removed
+            and self._last_solution._structure_version == self._structure_version
+        ):
+            warm_start = self._last_solution
         kwargs = self._process_pars_and_vals0(
-            {
-                "lbx": self._lbx.data,
-                "ubx": self._ubx.data,
-                "lbg": np.concatenate((np.zeros(self.ng), np.full(self.nh, -np.inf))),
-                "ubg": 0,
-            },
-            pars,
-            vals0,
+            self._static_solver_args.copy(), pars, vals0, warm_start
         )
-        sol_with_stats = _solve_and_get_stats(self._solver, kwargs)
+        monitor = self._solver_monitor
+        if monitor is not None:
+            monitor._start(kwargs)
+        if hooks:
+            self._run_solve_hooks("before_solver")
+        t1 = perf_counter()
+        if pool is None:
+            sol_with_stats = _solve_and_get_stats(self._solver, kwargs)
+        else:
+            with pool.checkout() as solver:
+                sol_with_stats = _solve_and_get_stats(solver, kwargs)
+        t_solver = perf_counter() - t1
+        if monitor is not None:
+            monitor._finish(sol_with_stats["stats"])
+        if hooks:
+            self._run_solve_hooks("after_solver")
         solution = LazySolution.from_casadi_solution(sol_with_stats, self)
-        self._failures += not solution.success
-        return solution
+        success = solution.success
+        self._failures += not success
+        if self._auto_warm_start:
+            self._last_solution = solution if success else None
+        out = solution
+        if success:
+            self._last_success = solution
+        elif deadline is not None and (
+            t_solver >= deadline
+            or solution.status in _TIME_LIMIT_STATUSES[self._solver_plugin]
+        ):
+            self._deadline_misses += 1
+            if fallback == "previous":
+                out = solution if self._last_success is None else self._last_success
+            elif fallback != "iterate":
+                out = fallback(solution, self._last_success)
+        if hooks:
+            self._run_solve_hooks("after_solution")
+        if self._telemetry is not None:
+            self._telemetry.record(perf_counter() - t0, t_solver, solution.stats)
+        return out
+
+    async def solve_async(
+        self,
+        pars: Optional[dict[str, npt.ArrayLike]] = None,
+        vals0: Optional[dict[str, npt.ArrayLike]] = None,
+        warm_start: Union[None, Solution[SymType], dict[str, npt.ArrayLike]] = None,
+        deadline: Optional[float] = None,
+        fallback: DeadlineFallback = "iterate",
+        timeout: Optional[float] = None,
+    ) -> Solution[SymType]:
+        """Coroutine that solves the NLP optimization problem in an executor, without
+        blocking the event loop. See :meth:`solve` for the details on the solve, and
+        :class:`csnlp.core.aio.SupportsAsyncSolve` for the executor, back-pressure and
+        cancellation (see also :meth:`init_async`).
+
+        Parameters
+        ----------
+        pars, vals0, warm_start, deadline, fallback
+            See :meth:`solve`.
+        timeout : float, optional
+            Time, in seconds, after which to stop waiting for the solution, including
+            the time spent waiting for a free slot. By default, ``None``, i.e., no
+            timeout.
+
+        Returns
+        -------
+        sol : Solution
+            A solution object containing all the information, including the stats of
+            the solver's run.
+
+        Raises
+        ------
+        asyncio.TimeoutError
+            Raises if the solution is not available within ``timeout``.
+        """
+        return await self._run_async(
+            self.solve, timeout, pars, vals0, warm_start, deadline, fallback
+        )
+
+    def solve_raw(
+        self,
+        p: Optional[npt.ArrayLike] = None,
+        x0: Optional[npt.ArrayLike] = None,
+        lam_x0: Optional[npt.ArrayLike] = None,
+        lam_g0: Optional[npt.ArrayLike] = None,
+        return_stats: bool = False,
+    ) -> RawSolution:
+        """Solves the NLP optimization problem with flat numerical vectors, bypassing
+        the processing of dictionaries and the creation of a :class:`csnlp.Solution`.
+        This is meant for high-rate applications, where such overhead is significant
+        compared to the solver's run.
+
+        Parameters
+        ----------
+        p : array_like, optional
+            Vector of the values of the parameters, laid out as :meth:`p` (see also
+            :attr:`layout`). Can be ``None`` if no parameters are present.
+        x0 : array_like, optional
+            Vector of the initial guess of the primal variables, laid out as :meth:`x`.
+        lam_x0, lam_g0 : array_like, optional
+            Vectors of the initial guesses of the multipliers of the primal variables'
+            bounds and of the constraints, as returned by the solver.
+        return_stats : bool, optional
+            If ``True``, the solver's stats are included in the returned record. By
+            default, ``False``.
+
+        Returns
+        -------
+        RawSolution
+            A record containing the optimal primal and dual vectors, the optimal
+            objective value and the success flag and return status of the solver.
+
+        Raises
+        ------
+        RuntimeError
+            Raises if the solver is un-initialized (see :meth:`init_solver`); or if the
+            parameters are not provided.
+        """
+        hooks = self._solve_hooks
+        if hooks:
+            self._run_solve_hooks("before_pack")
+        t0 = perf_counter()
+        self._rebuild_stale_solver()
+        if self._solver is None:
+            raise RuntimeError("Solver uninitialized.")
+        kwargs = self._static_solver_args.copy()
+        if p is not None:
+            kwargs["p"] = p
+        elif self._pars:
+            raise RuntimeError("Trying to solve the NLP with unspecified parameters.")
+        if x0 is not None:
+            kwargs["x0"] = x0
+        if lam_x0 is not None:
+            kwargs["lam_x0"] = lam_x0
+        if lam_g0 is not None:
+            kwargs["lam_g0"] = lam_g0
+        monitor = self._solver_monitor
+        if monitor is not None:
+            monitor._start(kwargs)
+        if hooks:
+            self._run_solve_hooks("before_solver")
+        pool = self._solver_pool
+        t1 = perf_counter()
+        if pool is None:
+            solver: cs.Function = self._solver.func
+            sol = solver.call(kwargs)
+            stats = solver.stats()
+        else:
+            with pool.checkout() as memorized_solver:
+                solver = memorized_solver.func
+                sol = solver.call(kwargs)
+                stats = solver.stats()
+        t_solver = perf_counter() - t1
+        if hooks:
+            self._run_solve_hooks("after_solver")
+        if monitor is not None:
+            monitor._finish(stats)
+        success = stats["success"]
+        self._failures += not success
+        raw = RawSolution(
+            sol["x"].full().reshape(-1),
+            sol["lam_g"].full().reshape(-1),
+            sol["lam_x"].full().reshape(-1),
+            float(sol["f"]),
+            success,
+            stats["return_status"],
+            stats if return_stats else None,
+        )
+        if hooks:
+            self._run_solve_hooks("after_solution")
+        if self._telemetry is not None:
+            self._telemetry.record(perf_counter() - t0, t_solver, stats)
+        return raw
+
+    def solve_batch(
+        self,
+        pars: Iterable[Optional[dict[str, npt.ArrayLike]]],
+        vals0: Union[
+            None, dict[str, npt.ArrayLike], Iterable[Optional[dict[str, npt.ArrayLike]]]
+        ] = None,
+        executor: Union[
+            Literal["serial", "thread", "process", "map"], Executor, SolverProcessPool
+        ] = "serial",
+        max_workers: Optional[int] = None,
+        parallelization: Literal["serial", "thread", "openmp"] = "thread",
+    ) -> Iterator[tuple[int, Solution[SymType]]]:
+        """Solves a batch of independent instances of the NLP, each with its own
+        parameters (and, optionally, initial guess), e.g., to evaluate a policy on a
+        grid of parameters. Unlike :meth:`csnlp.multistart.MultistartNlp.solve_multi`,
+        the solutions are not compared, but returned one per instance.
+
+        Parameters
+        ----------
+        pars : iterable of dict of (str, array_like)
+            For each instance, a dictionary with, for each parameter in the NLP scheme,
+            the corresponding numerical value. Entries can be ``None`` if no parameters
+            are present.
+        vals0 : dict of (str, array_like) or iterable of, optional
+            For each instance, a dictionary with, for each variable in the NLP scheme,
+            the corresponding initial guess. In case a single dict is passed, the same
+            is used across all instances. By default, ``None``, i.e., no initial guess.
+        executor : "serial", "thread", "process", "map", Executor or SolverProcessPool
+            How to run the instances:
+
+            - ``"serial"``: one after the other, in the calling thread
+            - ``"thread"``: in a temporary thread pool, where each thread checks out an
+              independent instance of the solver (see :meth:`init_solver_pool`; if a
+              pool is enabled, it is used, otherwise the instances are kept across
+              calls until the solver is initialized again)
+            - ``"process"``: in a :class:`csnlp.core.solver_pool.SolverProcessPool`,
+              which exchanges the inputs and outputs with its workers via shared
+              memory. The pool is created at the first call and kept alive across calls
+              with the same ``max_workers`` until the solver is initialized again (see
+              also :meth:`shutdown_batch_pool`)
+            - ``"map"``: via :meth:`casadi.Function.map`, i.e., the same mechanism of
+              :class:`csnlp.multistart.MappedMultistartNlp`, in chunks of
+              ``max_workers`` instances
+            - an instance of :class:`concurrent.futures.Executor`, which is used as in
+              ``"thread"`` (so it must not be a process-based executor)
+            - an instance of :class:`csnlp.core.solver_pool.SolverProcessPool`, whose
+              worker processes persist across calls.
+
+            By default, ``"serial"``.
+        max_workers : int, optional
+            Number of threads or processes (or size of the mapped chunks) to use. By
+            default, the number of processors.
+        parallelization : "serial", "thread" or "openmp", optional
+            Parallelization of the mapped solver (see :meth:`casadi.Function.map`), only
+            used if ``executor="map"``. By default, ``"thread"``.
+
+        Returns
+        -------
+        iterator of (int, Solution)
+            An iterator over the index of each instance and its solution, in the order
+            in which they are completed (i.e., not necessarily the order of ``pars``).
+            Each solution carries the stats of its own solver's run, except with
+            ``executor="map"``, since mapped solvers do not report them. Instead, the
+            stats of each instance only contain a ``"success"`` flag, i.e., whether its
+            solution is finite and primal feasible up to ``1e-6``, and the
+            corresponding ``"return_status"``, i.e., ``"Mapped_Feasible"`` or
+            ``"Mapped_Infeasible_Or_Nonfinite"``. Note that an instance that stopped at
+            the maximum number of iterations at a feasible iterate is then deemed
+            successful.
+
+        Raises
+        ------
+        RuntimeError
+            Raises if the solver is un-initialized (see :meth:`init_solver`); or if not
+            all the parameters are provided with a numerical value.
+        ValueError
+            Raises if the executor is not recognized, or if the given process pool was
+            built for a different solver.
+
+        Notes
+        -----
+        The instances are run without the hooks, telemetry and warm-start bookkeeping of
+        :meth:`solve`.
+        """
+        self._rebuild_stale_solver()
+        if self._solver is None:
+            raise RuntimeError("Solver uninitialized.")
+        if isinstance(executor, SolverProcessPool):
+            if executor.solver is not self._solver:
+                raise ValueError("Process pool was built for a different solver.")
+        elif not isinstance(executor, Executor) and executor not in (
+            "serial",
+            "thread",
+            "process",
+            "map",
+        ):
+            raise ValueError(f"Unknown batch executor '{executor}'.")
+        vals0_iter = (
+            repeat(vals0) if vals0 is None or isinstance(vals0, dict) else vals0
+        )
+        static = self._static_solver_args
+        kwargs = [
+            self._process_pars_and_vals0(static.copy(), p, v0)
+            for p, v0 in zip(pars, vals0_iter)
+        ]
+        n_workers = max_workers or os.cpu_count() or 1
+        if executor == "serial":
+            solve = partial(_solve_and_get_stats, self._solver)
+            return (
+                (i, LazySolution.from_casadi_solution(solve(kwargs_), self))
+                for i, kwargs_ in enumerate(kwargs)
+            )
+        if executor == "map":
+            return self._solve_batch_mapped(kwargs, n_workers, parallelization)
+        return self._solve_batch_in_executor(kwargs, executor, n_workers)
+
+    def _solve_batch_in_executor(
+        self,
+        kwargs: list[dict[str, npt.ArrayLike]],
+        executor: Union[Literal["thread", "process"], Executor, SolverProcessPool],
+        n_workers: int,
+    ) -> Iterator[tuple[int, Solution[SymType]]]:
+        """Internal utility to solve a batch in an executor (see :meth:`solve_batch`),
+        yielding the solutions as they are completed."""
+        if executor == "process":
+            pool = self._batch_process_pool
+            if pool is None or pool.max_workers != n_workers:
+                self.shutdown_batch_pool()
+                pool = self._batch_process_pool = SolverProcessPool(self, n_workers)
+                # shut down the workers also if this instance is garbage-collected
+                self._batch_process_finalizer = weakref.finalize(
+                    self, pool.shutdown, False
+                )
+            yield from self._solve_batch_in_executor(kwargs, pool, n_workers)
+            return
+        if isinstance(executor, SolverProcessPool):
+            for i, sol_with_stats in executor.solve_shared(kwargs):
+                sol_with_stats["p"] = kwargs[i]["p"]
+                yield i, LazySolution.from_casadi_solution(sol_with_stats, self)
+            return
+        owned = None
+        if executor == "thread":
+            executor = owned = ThreadPoolExecutor(n_workers)
+        pool = self._solver_pool
+        if pool is None:
+            pool = self._batch_thread_pool
+            if pool is None or pool.size < n_workers:
+                # not shared, since solve may be called concurrently with the batch
+                pool = self._make_solver_pool(n_workers, shared=False)
+                self._batch_thread_pool = pool
+
+        def solve(kwargs_: dict[str, npt.ArrayLike]) -> dict[str, Any]:
+            with pool.checkout() as solver:
+                return _solve_and_get_stats(solver, kwargs_)
+
+        futures = {
+            executor.submit(solve, kwargs_): i for i, kwargs_ in enumerate(kwargs)
+        }
+        try:
+            for future in as_completed(futures):
+                i = futures[future]
+                sol_with_stats = future.result()
+                sol_with_stats["p"] = kwargs[i]["p"]
+                yield i, LazySolution.from_casadi_solution(sol_with_stats, self)
+        finally:
+            for future in futures:
+                future.cancel()
+            if owned is not None:
+                owned.shutdown()
+
+    def _solve_batch_mapped(
+        self,
+        kwargs: list[dict[str, npt.ArrayLike]],
+        chunk_size: int,
+        parallelization: Literal["serial", "thread", "openmp"],
+    ) -> Iterator[tuple[int, Solution[SymType]]]:
+        """Internal utility to solve a batch via mapped solvers (see
+        :meth:`solve_batch`), yielding the solutions chunk by chunk."""
+        solver: cs.Function = self._solver.func
+        static = self._static_solver_args
+        lbx, ubx, lbg, ubg = (static[n][:, None] for n in ("lbx", "ubx", "lbg", "ubg"))
+        x0_default = cs.DM.zeros(self._x.shape[0], 1)
+        for start in range(0, len(kwargs), chunk_size):
+            chunk = kwargs[start : start + chunk_size]
+            n = len(chunk)
+            ps = cs.hcat([kwargs_["p"] for kwargs_ in chunk])
+            x0s = cs.hcat([kwargs_.get("x0", x0_default) for kwargs_ in chunk])
+            mapped_solver = solver.map(n, parallelization, n)
+            mapped_sol: dict[str, cs.DM] = mapped_solver(x0=x0s, p=ps, **static)
+            # NOTE: the mapped solver does not return the stats (see the same note in
+            # MappedMultistartNlp.solve_multi), so success is judged from the outputs
+            x = mapped_sol["x"].full()
+            g = mapped_sol["g"].full()
+            violation = np.maximum(
+                np.max(np.maximum(lbg - g, g - ubg), 0, initial=0.0),
+                np.max(np.maximum(lbx - x, x - ubx), 0, initial=0.0),
+            )
+            f = mapped_sol["f"].full().reshape(-1)
+            finite = np.isfinite(f) & np.isfinite(x).all(0)
+            ok = finite & (violation <= _MAPPED_FEAS_TOL)
+            for j in range(n):
+                sol_with_stats = {k: v[:, j] for k, v in mapped_sol.items()}
+                sol_with_stats["p"] = chunk[j]["p"]
+                success = bool(ok[j])
+                sol_with_stats["stats"] = {
+                    "success": success,
+                    "return_status": _MAPPED_STATUSES[success],
+                }
+                yield start + j, LazySolution.from_casadi_solution(sol_with_stats, self)
 
     def _process_pars_and_vals0(
         self,
         kwargs: dict[str, npt.ArrayLike],
         pars: Optional[dict[str, npt.ArrayLike]],
         vals0: Optional[dict[str, npt.ArrayLike]],
+        warm_start: Union[None, Solution[SymType], dict[str, npt.ArrayLike]] = None,
     ) -> dict[str, npt.ArrayLike]:
-        """Internal utility to convert pars and initial-val dicts to solver kwargs."""
+        """Internal utility to convert pars, initial-val and warm-start dicts to solver
+        kwargs."""
         if self._pars:
             if pars is None:
                 pars = {}
@@ -269,11 +1108,64 @@ class HasObjective(HasConstraints[SymType]):
                     + ", ".join(parsdiff)
                     + "."
                 )
-            kwargs["p"] = subsevalf(self._p, self._pars, pars)
+            kwargs["p"] = cs.DM(self._p_layout.pack(pars))
         else:
             kwargs["p"] = cs.DM()
         if vals0 is not None:
-            if vals0diff := self._vars.keys() - vals0.keys():
-                vals0.update({v: 0 for v in vals0diff})
-            kwargs["x0"] = subsevalf(self._x, self._vars, vals0)
+            kwargs["x0"] = cs.DM(self._x_layout.pack(vals0, default=0.0))
+        if warm_start is not None:
+            self._process_warm_start(kwargs, warm_start)
         return kwargs
+
+    def _process_warm_start(
+        self,
+        kwargs: dict[str, npt.ArrayLike],
+        warm_start: Union[Solution[SymType], dict[str, npt.ArrayLike]],
+    ) -> None:
+        """Internal utility to convert a warm-start solution or dict of dual values to
+        the ``lam_g0`` and ``lam_x0`` (and, possibly, ``x0``) solver kwargs."""
+        idx_lb = self.nonmasked_lbx_idx
+        idx_ub = self.nonmasked_ubx_idx
+        nx = self.nx
+        n_lb = nx if isinstance(idx_lb, slice) else idx_lb.size
+        n_ub = nx if isinstance(idx_ub, slice) else idx_ub.size
+        if isinstance(warm_start, dict):
+            dual_vars = self._dual_vars
+            names_g = [
+                name_lam
+                for group in ("g", "h")
+                for n in self._cons
+                if (name_lam := f"lam_{group}_{n}") in dual_vars
+            ]
+            lam_g0, lam_lbx, lam_ubx = (
+                VectorLayout({n: dual_vars[n].shape for n in names}).pack(
+                    warm_start, default=0.0
+                )
+                for names in (
+                    names_g,
+                    [f"lam_lb_{n}" for n in self._vars],
+                    [f"lam_ub_{n}" for n in self._vars],
+                )
+            )
+        else:
+            lam_g0 = warm_start.lam_g_and_h
+            lam_lbx_and_ubx = warm_start.lam_lbx_and_ubx
+            if (
+                lam_g0.shape != (self.ng + self.nh, 1)
+                or lam_lbx_and_ubx.shape != (n_lb + n_ub, 1)
+                or warm_start.x.shape != (nx, 1)
+            ):
+                raise ValueError(
+                    "Warm-start solution does not match the structure of the NLP."
+                )
+            lam_g0 = lam_g0.full().reshape(-1)
+            lam_lbx_and_ubx = lam_lbx_and_ubx.full().reshape(-1)
+            lam_lbx = lam_lbx_and_ubx[:n_lb]
+            lam_ubx = lam_lbx_and_ubx[n_lb:]
+            if "x0" not in kwargs:
+                kwargs["x0"] = warm_start.x
+        lam_x0 = np.zeros(nx)
+        lam_x0[idx_lb] -= lam_lbx
+        lam_x0[idx_ub] += lam_ubx
+        kwargs["lam_x0"] = lam_x0
+        kwargs["lam_g0"] = lam_g0
@@ -1,8 +1,14 @@
-from typing import Generic, Literal, TypeVar
+from functools import cached_property
+from itertools import count
+from typing import Generic, Literal, Optional, TypeVar
 
 import casadi as cs
 
+from ..core.cache import invalidate_cache
+from ..core.layout import VectorLayout
+
 SymType = TypeVar("SymType", cs.SX, cs.MX)
+_STRUCTURE_VERSIONS = count()
 
 
 class HasParameters(Generic[SymType]):
@@ -19,6 +25,7 @@ class HasParameters(Generic[SymType]):
         self._sym_type: type[SymType] = getattr(cs, sym_type)
         self._pars: dict[str, SymType] = {}
         self._p = self._sym_type()
+        self._batch: Optional[set[str]] = None  # groups to reassemble after batch edit
 
     @property
     def p(self) -> SymType:
@@ -35,6 +42,19 @@ class HasParameters(Generic[SymType]):
         """Gets the parameters of the NLP scheme."""
         return self._pars
 
+    @cached_property
+    def _p_layout(self) -> VectorLayout:
+        """Internal layout of the parameters in the vector :meth:`p`."""
+        return VectorLayout.from_symbols(self._pars)
+
+    @cached_property
+    def _structure_version(self) -> int:
+        """Internal identifier of the current symbolic structure of the NLP (i.e., its
+        parameters, variables, constraints and multipliers). It is unique across
+        instances and changes every time the structure is modified."""
+        return next(_STRUCTURE_VERSIONS)
+
+    @invalidate_cache(_p_layout, _structure_version)
     def parameter(self, name: str, shape: tuple[int, int] = (1, 1)) -> SymType:
         """Adds a parameter to the NLP scheme.
 
@@ -59,5 +79,14 @@ class HasParameters(Generic[SymType]):
             raise ValueError(f"Parameter name '{name}' already exists.")
         par = self._sym_type.sym(name, *shape)
         self._pars[name] = par
-        self._p = cs.veccat(self._p, par)
+        if self._batch is None:
+            self._p = cs.veccat(self._p, par)
+        else:
+            self._batch.add("p")
         return par
+
+    def _reassemble(self, groups: set[str]) -> None:
+        """Internal utility to reassemble from scratch the vectors of the given groups,
+        e.g., after a batch of edits."""
+        if "p" in groups:
+            self._p = cs.vvcat(self._pars.values()) if self._pars else self._sym_type()
@@ -6,6 +6,7 @@ import numpy as np
 from numpy.typing import NDArray
 
 from ..core.cache import invalidate_cache
+from ..core.layout import VectorLayout
 from .parameters import HasParameters
 
 SymType = TypeVar("SymType", cs.SX, cs.MX)
@@ -63,7 +64,12 @@ class HasVariables(HasParameters[SymType]):
             ]
         )
 
-    @invalidate_cache(discrete)
+    @cached_property
+    def _x_layout(self) -> VectorLayout:
+        """Internal layout of the primal variables in the vector :meth:`x`."""
+        return VectorLayout.from_symbols(self._vars)
+
+    @invalidate_cache(discrete, _x_layout, HasParameters._structure_version)
     def variable(
         self,
         name: str,
@@ -95,7 +101,15 @@ class HasVariables(HasParameters[SymType]):
             raise ValueError(f"Variable name '{name}' already exists.")
         var = self._sym_type.sym(name, *shape)
         self._vars[name] = var
-        self._x = cs.veccat(self._x, var)
+        if self._batch is None:
+            self._x = cs.veccat(self._x, var)
+        else:
+            self._batch.add("x")
         self._has_discrete |= discrete
         self._discrete[name] = discrete
         return var
+
+    def _reassemble(self, groups: set[str]) -> None:
+        super()._reassemble(groups)
+        if "x" in groups:
+            self._x = cs.vvcat(self._vars.values()) if self._vars else self._sym_type()
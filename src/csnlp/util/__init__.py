@@ -16,7 +16,8 @@ It contains the following submodules:
 
    * compatibility of pickling/deepcopying with CasADi objects and classes that hold
      such objects (since these are often not picklable)
-   * saving and loading data to/from files, possibly compressed.
+   * saving and loading data to/from files, possibly compressed
+   * archiving long streams of solutions in a columnar, memory-mappable format.
 
 - :mod:`csnlp.util.math`: a collection of stand-alone functions that implement some of
   the basic mathematical operations that are not available in CasADi. The
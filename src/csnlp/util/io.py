@@ -3,9 +3,14 @@
 - compatibility of pickling/deepcopying with CasADi objects and classes that hold such
   objects (since these are often not picklable).
 - saving and loading data to/from files, possibly compressed.
+- archiving long streams of solutions in a columnar format that can be read back
+  without loading it fully in memory (see :class:`SolutionArchive`).
 """
 
+import json
+import os
 import pickle
+import struct as _struct
 from copy import _reconstruct
 from copy import deepcopy as _deepcopy
 from functools import partial
@@ -13,14 +18,19 @@ from os.path import splitext as _splitext
 from pickletools import optimize as _optimize
 from typing import TYPE_CHECKING
 from typing import Any as _Any
+from typing import BinaryIO as _BinaryIO
 from typing import Callable, Literal, Optional
 from typing import TypeVar as _TypeVar
 
 from ..core.cache import invalidate_caches_of as _invalidate_caches_of
 
 if TYPE_CHECKING:
+    import numpy as np
     from scipy.io.matlab import mat_struct
 
+    from ..core.layout import SolutionLayout
+    from ..core.solutions import CompactSolution
+
 
 def is_casadi_object(obj: _Any) -> bool:
     """Checks if the object belongs to the CasADi module.
@@ -251,13 +261,17 @@ def save(
 
 
 def load(filename: str) -> dict[str, _Any]:
-    """Loads data from a (possibly compressed) file.
+    """Loads data from a (possibly compressed) file, or from the directory of a
+    :class:`SolutionArchive`.
 
     Parameters
     ----------
     filename : str, optional
-        The name of the file to load. If the filename does not end in a known extension,
-        then it fails. The known extensions are
+        The name of the file to load. If it is a directory, it is loaded as a
+        :class:`SolutionArchive`, i.e., a dictionary with the ``"layout"`` of the NLP,
+        the ``"status_names"`` and each column as a read-only memory-mapped array. If
+        the filename does not end in a known extension, then it fails. The known
+        extensions are
 
         - ``"pickle"``: .pkl
         - ``"lzma"``: .xz
@@ -273,6 +287,9 @@ def load(filename: str) -> dict[str, _Any]:
     data : dict
         The saved data in the shape of a dictionary.
     """
+    if os.path.isdir(filename):
+        return _load_archive(filename)
+
     ext = _splitext(filename)[1]
     compression = _COMPRESSION_EXTS[ext]
 
@@ -334,6 +351,198 @@ def load(filename: str) -> dict[str, _Any]:
     return data
 
 
+_ARCHIVE_META = "meta.json"
+_ARCHIVE_LAYOUT = "layout.pkl"
+_NPY_HEADER_SIZE = 128  # fixed, so that headers can be rewritten in place on append
+
+
+def _write_npy_header(
+    file: _BinaryIO, dtype: "np.dtype", shape: tuple[int, ...]
+) -> None:
+    """Internal utility to write, at the start of the file, a ``.npy`` header of fixed
+    size, padded with spaces so that it can be overwritten when the array grows."""
+    import numpy as np
+
+    header = repr(
+        {
+            "descr": np.lib.format.dtype_to_descr(dtype),
+            "fortran_order": False,
+            "shape": shape,
+        }
+    )
+    header = header.ljust(_NPY_HEADER_SIZE - 11) + "\n"
+    file.seek(0)
+    file.write(np.lib.format.magic(1, 0))
+    file.write(_struct.pack("<H", len(header)))
+    file.write(header.encode("latin1"))
+
+
+class SolutionArchive:
+    """Columnar, append-only archive of a stream of solutions of the same NLP, e.g., the
+    ones produced by long closed-loop simulations. Each field of the solutions (see
+    :class:`csnlp.core.solutions.CompactSolution`) is stored as a column in its own
+    ``.npy`` file under the given directory, and records are buffered in memory and
+    appended to the files one chunk at a time. The layout of the NLP is stored only
+    once. Archives can be read back as memory-mapped arrays via :func:`load`.
+
+    Parameters
+    ----------
+    directory : str
+        The directory of the archive. If it already contains an archive, new records
+        are appended to it.
+    chunk_size : int, optional
+        Number of records buffered in memory before being written to disk. By default,
+        ``1024``.
+
+    Notes
+    -----
+    The following columns are stored, where ``N`` is the number of records:
+
+    - ``"x"``, ``"lam_g"``, ``"lam_x"``, ``"p"``: arrays of shape ``(N, n)``, with ``n``
+      the size of the corresponding vector
+    - ``"f"``, ``"t_wall"``: arrays of shape ``(N,)``, where missing wall times are NaN
+    - ``"status"``: array of shape ``(N,)`` of integer codes, which index the list of
+      return statuses ``"status_names"``
+    - ``"success"``: boolean array of shape ``(N,)``
+    - ``"iter_count"``: integer array of shape ``(N,)``, where ``-1`` means missing.
+
+    Make sure to call :meth:`close` (or to use the archive as a context manager) so that
+    the records still in the buffer are written to disk.
+    """
+
+    def __init__(self, directory: str, chunk_size: int = 1024) -> None:
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be positive.")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self._layout: Optional["SolutionLayout"] = None
+        self._statuses: dict[str, int] = {}
+        self._lengths: dict[str, int] = {}
+        self._buffers: dict[str, "np.ndarray"] = {}
+        self._n_buffered = 0
+        meta_path = os.path.join(directory, _ARCHIVE_META)
+        if os.path.isfile(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            self._statuses = {s: i for i, s in enumerate(meta["status_names"])}
+            self._lengths = meta["lengths"]
+            with open(os.path.join(directory, _ARCHIVE_LAYOUT), "rb") as f:
+                self._init_buffers(pickle.load(f))
+
+    def __len__(self) -> int:
+        return next(iter(self._lengths.values()), 0) + self._n_buffered
+
+    def _init_buffers(self, layout: "SolutionLayout") -> None:
+        """Internal utility to allocate the buffers of the columns for the layout."""
+        import numpy as np
+
+        n = self.chunk_size
+        nx = layout.x.size
+        self._layout = layout
+        self._buffers = {
+            "x": np.empty((n, nx)),
+            "lam_g": np.empty((n, layout.g.size)),
+            "lam_x": np.empty((n, nx)),
+            "p": np.empty((n, layout.p.size)),
+            "f": np.empty(n),
+            "status": np.empty(n, dtype=np.int32),
+            "success": np.empty(n, dtype=bool),
+            "iter_count": np.empty(n, dtype=np.int64),
+            "t_wall": np.empty(n),
+        }
+
+    def append(self, sol: "CompactSolution") -> None:
+        """Appends a solution to the archive.
+
+        Parameters
+        ----------
+        sol : CompactSolution
+            The solution to be appended. See
+            :meth:`csnlp.core.solutions.CompactSolution.from_solution` to convert
+            other types of solutions.
+
+        Raises
+        ------
+        ValueError
+            Raises if the solution's layout is incompatible with the archive's one.
+        """
+        layout = self._layout
+        if layout is None:
+            with open(os.path.join(self.directory, _ARCHIVE_LAYOUT), "wb") as f:
+                pickle.dump(sol.layout, f)
+            self._init_buffers(sol.layout)
+        elif sol.layout is not layout and any(
+            a.size != b.size or a.shapes != b.shapes
+            for a, b in zip(sol.layout[:3], layout[:3])
+        ):
+            raise ValueError("Solution's layout is incompatible with the archive's.")
+
+        code = self._statuses.setdefault(sol.status, len(self._statuses))
+        i = self._n_buffered
+        buffers = self._buffers
+        buffers["x"][i] = sol.x
+        buffers["lam_g"][i] = sol.lam_g
+        buffers["lam_x"][i] = sol.lam_x
+        buffers["p"][i] = sol.p
+        buffers["f"][i] = sol.f
+        buffers["status"][i] = code
+        buffers["success"][i] = sol.success
+        buffers["iter_count"][i] = -1 if sol.iter_count is None else sol.iter_count
+        buffers["t_wall"][i] = float("nan") if sol.t_wall is None else sol.t_wall
+        self._n_buffered += 1
+        if self._n_buffered == self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes the records still in the buffer to disk."""
+        n = self._n_buffered
+        if n == 0:
+            return
+        for name, buffer in self._buffers.items():
+            path = os.path.join(self.directory, f"{name}.npy")
+            length = self._lengths.get(name, 0)
+            with open(path, "r+b" if length else "wb") as f:
+                # overwrite any trailing record not accounted for in the metadata
+                f.seek(_NPY_HEADER_SIZE + length * buffer[:1].nbytes)
+                f.write(buffer[:n].tobytes())
+                f.truncate()
+                _write_npy_header(f, buffer.dtype, (length + n, *buffer.shape[1:]))
+            self._lengths[name] = length + n
+        self._n_buffered = 0
+        meta = {"status_names": list(self._statuses), "lengths": self._lengths}
+        tmp_path = os.path.join(self.directory, f"{_ARCHIVE_META}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, os.path.join(self.directory, _ARCHIVE_META))
+
+    def close(self) -> None:
+        """Flushes the buffer and releases it."""
+        self.flush()
+        self._buffers.clear()
+
+    def __enter__(self) -> "SolutionArchive":
+        return self
+
+    def __exit__(self, *_: _Any) -> None:
+        self.close()
+
+
+def _load_archive(directory: str) -> dict[str, _Any]:
+    """Internal utility to load the columns of a :class:`SolutionArchive` as read-only
+    memory-mapped arrays."""
+    import numpy as np
+
+    with open(os.path.join(directory, _ARCHIVE_META)) as f:
+        meta = json.load(f)
+    with open(os.path.join(directory, _ARCHIVE_LAYOUT), "rb") as f:
+        data = {"layout": pickle.load(f), "status_names": meta["status_names"]}
+    for name, length in meta["lengths"].items():
+        column = np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+        data[name] = column[:length]  # ignores records written after the metadata
+    return data
+
+
 def _check_mat_keys(dictionary: dict, mat_struct_type: type) -> dict:
     """Internal utility to check if entries in dictionary are mat-objects. If yes,
     todict is called to change them to nested dictionaries."""
@@ -39,9 +39,17 @@ The following wrappers are provided in this module:
   MPC controllers based on the Scenario Approach :cite:`schildbach_scenario_2014`
 - :class:`csnlp.wrappers.PwaMpc`: a wrapper that facilities the creation of MPC
   controllers for piecewise affine (PWA) systems :cite:`borrelli_predictive_2017`.
+
+MPC controllers can then be simulated in closed loop against a plant model via
+:func:`csnlp.wrappers.simulate_closed_loop`, which stores the resulting trajectories in
+a :class:`csnlp.wrappers.ClosedLoopResult`. Ensembles of closed loops (e.g., for Monte
+Carlo analyses) can be simulated in lock-step or in parallel via
+:func:`csnlp.wrappers.simulate_closed_loop_ensemble`.
 """
 
 __all__ = [
+    "ClosedLoopResult",
+    "EnsembleResult",
     "Mpc",
     "NlpScaling",
     "NlpSensitivity",
@@ -50,8 +58,16 @@ __all__ = [
     "PwaRegion",
     "ScenarioBasedMpc",
     "Wrapper",
+    "simulate_closed_loop",
+    "simulate_closed_loop_ensemble",
 ]
 
+from .mpc.closed_loop import (
+    ClosedLoopResult,
+    EnsembleResult,
+    simulate_closed_loop,
+    simulate_closed_loop_ensemble,
+)
 from .mpc.mpc import Mpc
 from .mpc.pwa_mpc import PwaMpc, PwaRegion
 from .mpc.scenario_based_mpc import ScenarioBasedMpc
@@ -0,0 +1,539 @@
+"""Contains utilities to simulate in closed loop a system controlled by an instance of
+:class:`csnlp.wrappers.Mpc`, storing the resulting trajectories in preallocated arrays
+rather than in lists of solutions. Ensembles of independent closed loops (e.g., for
+Monte Carlo verification of a controller) can be simulated either in lock-step, by
+batching the solves of each time step via :func:`casadi.Function.map`, or in parallel
+processes via :mod:`joblib`."""
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Callable, Literal, Optional, TypeVar, Union
+
+import casadi as cs
+import numpy as np
+import numpy.typing as npt
+from joblib import Parallel, delayed
+
+from ...core.layout import VectorLayout
+from .mpc import Mpc
+
+SymType = TypeVar("SymType", cs.SX, cs.MX)
+
+
+@dataclass
+class ClosedLoopResult:
+    """Stores the trajectories of a closed-loop simulation (see
+    :func:`simulate_closed_loop`). Entries of time steps that were not simulated (due
+    to an early abort) are filled with ``nan`` (or ``False``/``None``)."""
+
+    states: npt.NDArray[np.floating]
+    """States of the system, with shape ``(T + 1, ns)``."""
+
+    actions: npt.NDArray[np.floating]
+    """Actions applied to the system, with shape ``(T, na)``."""
+
+    costs: npt.NDArray[np.floating]
+    """Optimal values of the MPC objective at each step, with shape ``(T,)``."""
+
+    solve_times: npt.NDArray[np.floating]
+    """Wall times (in seconds) of each MPC solve, with shape ``(T,)``."""
+
+    success: npt.NDArray[np.bool_]
+    """Success flags of each MPC solve, with shape ``(T,)``."""
+
+    status: npt.NDArray[np.object_]
+    """Return statuses of the solver at each MPC solve, with shape ``(T,)``."""
+
+    failed_action_applied: npt.NDArray[np.bool_]
+    """Flags of the time steps at which the action applied to the plant is the one of a
+    failed MPC solve (see ``on_failure`` in :func:`simulate_closed_loop`), with shape
+    ``(T,)``."""
+
+    n_steps: int
+    """Number of time steps that were actually simulated."""
+
+    aborted: bool
+    """Whether the simulation was aborted due to repeated solver failures."""
+
+
+def _call_plant(
+    plant: Union[cs.Function, Callable[..., npt.ArrayLike]],
+    *args: npt.NDArray[np.floating],
+) -> npt.NDArray[np.floating]:
+    """Internal utility to step the plant and return the next state as a flat array."""
+    x_next = plant(*args)
+    if isinstance(plant, cs.Function) and plant.n_out() > 1:
+        x_next = x_next[0]
+    return np.asarray(x_next, dtype=float).reshape(-1)
+
+
+def simulate_closed_loop(
+    mpc: Mpc[SymType],
+    plant: Union[cs.Function, Callable[..., npt.ArrayLike]],
+    x0: npt.ArrayLike,
+    steps: int,
+    pars: Optional[Mapping[str, npt.ArrayLike]] = None,
+    forecasts: Optional[Callable[[int], Mapping[str, npt.ArrayLike]]] = None,
+    shift_warm_start: bool = True,
+    max_consecutive_failures: Optional[int] = None,
+    on_failure: Literal["apply", "hold"] = "apply",
+) -> ClosedLoopResult:
+    """Simulates in closed loop the given plant controlled by the MPC, i.e., at each
+    time step, the current state is received, the MPC is solved, and its first action
+    is applied to the plant.
+
+    Parameters
+    ----------
+    mpc : Mpc
+        The MPC controller, whose solver must be already initialized.
+    plant : casadi.Function or callable
+        The plant's step function, i.e., :math:`x_+ = f(x,u)`, where :math:`x` and
+        :math:`u` are the (flat) vectors of all the states and actions of the MPC,
+        concatenated in order of definition. If a function with multiple outputs, the
+        next state is assumed to be the first one.
+    x0 : array_like
+        The initial state of the plant.
+    steps : int
+        Number of time steps to simulate.
+    pars : dict of (str, array_like), optional
+        Values of the parameters of the MPC that are constant along the simulation.
+    forecasts : callable, optional
+        A callable that, given the current time step, returns a dictionary with the
+        values of the parameters of the MPC for that time step (e.g., forecasts of
+        disturbances or references). These values override the ones in ``pars`` for
+        that time step only.
+    shift_warm_start : bool, optional
+        If ``True``, each solve is warm-started with the previous solution shifted by
+        one time step (see :meth:`csnlp.wrappers.Mpc.shift`), unless the previous solve
+        failed. By default, ``True``.
+    max_consecutive_failures : int, optional
+        If given, the simulation is aborted as soon as the MPC fails this many times in
+        a row. By default, the simulation is never aborted.
+    on_failure : "apply" or "hold", optional
+        Action to apply to the plant when the MPC fails. If ``"apply"``, the first
+        action of the failed solve is applied anyway. If ``"hold"``, the last action
+        applied after a successful solve is applied again (if no solve has succeeded
+        yet, the one of the failed solve is applied). The steps at which the action of
+        a failed solve is applied are flagged in
+        :attr:`ClosedLoopResult.failed_action_applied`. By default, ``"apply"``.
+
+    Returns
+    -------
+    ClosedLoopResult
+        The trajectories of the closed-loop simulation.
+
+    Raises
+    ------
+    ValueError
+        Raises if the size of the initial state is not compatible with the states of
+        the MPC, or if ``on_failure`` is invalid.
+    """
+    if on_failure not in ("apply", "hold"):
+        raise ValueError(
+            f"Invalid on_failure '{on_failure}'; expected 'apply' or 'hold'."
+        )
+    state_names = list(mpc.initial_states.keys())
+    state_splits = np.cumsum([0] + [s.shape[0] for s in mpc.initial_states.values()])
+    action_names = list(mpc.actions.keys())
+    ns = state_splits[-1]
+    na = mpc.na
+
+    x = np.asarray(x0, dtype=float).reshape(-1)
+    if x.size != ns:
+        raise ValueError(f"Expected initial state of size {ns}; got {x.size} instead.")
+
+    states = np.full((steps + 1, ns), np.nan)
+    actions = np.full((steps, na), np.nan)
+    costs = np.full(steps, np.nan)
+    solve_times = np.full(steps, np.nan)
+    success = np.zeros(steps, dtype=bool)
+    status = np.full(steps, None, dtype=object)
+    failed_action_applied = np.zeros(steps, dtype=bool)
+    states[0] = x
+
+    base_pars = {} if pars is None else dict(pars)
+    last_good_u = None
+    vals0 = duals0 = None
+    max_failures = max_consecutive_failures
+    failures = 0
+    aborted = False
+    k = 0
+    while k < steps:
+        step_pars = base_pars.copy()  # forecasts must not leak into later steps
+        if forecasts is not None:
+            step_pars.update(forecasts(k))
+        for name, start, stop in zip(state_names, state_splits[:-1], state_splits[1:]):
+            step_pars[name] = x[start:stop]
+
+        t0 = perf_counter()
+        sol = mpc.solve(step_pars, vals0, warm_start=duals0)
+        solve_times[k] = perf_counter() - t0
+
+        u = np.concatenate([sol.vals[n][:, 0].full().reshape(-1) for n in action_names])
+        costs[k] = sol.f
+        success[k] = sol.success
+        status[k] = sol.status
+        if sol.success:
+            failures = 0
+            last_good_u = u
+            if shift_warm_start:
+                vals0, duals0 = mpc.shift(sol)
+        else:
+            failures += 1
+            vals0 = duals0 = None
+            if on_failure == "hold" and last_good_u is not None:
+                u = last_good_u
+            else:
+                failed_action_applied[k] = True
+        actions[k] = u
+        del sol  # do not keep the solution alive
+
+        x = _call_plant(plant, x, u)
+        k += 1
+        states[k] = x
+        if max_failures is not None and failures >= max_failures:
+            aborted = k < steps
+            break
+
+    return ClosedLoopResult(
+        states,
+        actions,
+        costs,
+        solve_times,
+        success,
+        status,
+        failed_action_applied,
+        k,
+        aborted,
+    )
+
+
+@dataclass
+class EnsembleResult:
+    """Stores the trajectories of an ensemble of ``M`` independent closed-loop
+    simulations (see :func:`simulate_closed_loop_ensemble`), each made of ``T`` steps.
+    """
+
+    states: npt.NDArray[np.floating]
+    """States of the systems, with shape ``(M, T + 1, ns)``."""
+
+    actions: npt.NDArray[np.floating]
+    """Actions applied to the systems, with shape ``(M, T, na)``."""
+
+    costs: npt.NDArray[np.floating]
+    """Optimal values of the MPC objective at each step, with shape ``(M, T)``."""
+
+    solve_times: npt.NDArray[np.floating]
+    """Wall times (in seconds) of each MPC solve, with shape ``(M, T)``. In ``"map"``
+    mode, it is the time taken by the whole batch of solves of each time step."""
+
+    success: npt.NDArray[np.bool_]
+    """Success flags of each MPC solve, with shape ``(M, T)``. In ``"map"`` mode, the
+    mapped solver does not report its statistics, so a solve is deemed successful if
+    its solution is finite and primal feasible up to ``feas_tol`` (see
+    :func:`simulate_closed_loop_ensemble`). This rejects infeasible solves, but not,
+    e.g., solves that stopped at the maximum number of iterations at a feasible
+    iterate."""
+
+
+def simulate_closed_loop_ensemble(
+    mpc: Mpc[SymType],
+    plant: Union[cs.Function, Callable[..., npt.ArrayLike]],
+    x0: npt.ArrayLike,
+    steps: int,
+    pars: Optional[Mapping[str, npt.ArrayLike]] = None,
+    forecasts: Optional[Callable[[int, int], Mapping[str, npt.ArrayLike]]] = None,
+    disturbances: Optional[npt.ArrayLike] = None,
+    shift_warm_start: bool = True,
+    mode: Literal["map", "parallel"] = "map",
+    parallelization: Literal[
+        "serial", "unroll", "inline", "thread", "openmp"
+    ] = "serial",
+    max_num_threads: Optional[int] = None,
+    parallel_kwargs: Optional[dict[str, Any]] = None,
+    feas_tol: float = 1e-6,
+) -> EnsembleResult:
+    """Simulates in closed loop an ensemble of independent copies of the given plant,
+    each controlled by the MPC and starting from its own initial state and subject to
+    its own parameters and disturbances. Simulations work directly with the flat
+    vectors of the solver (see :meth:`csnlp.Nlp.solve_raw`), so no
+    :class:`csnlp.core.solutions.Solution` is ever built.
+
+    Parameters
+    ----------
+    mpc : Mpc
+        The MPC controller, whose solver must be already initialized.
+    plant : casadi.Function or callable
+        The plant's step function, i.e., :math:`x_+ = f(x,u)`, or :math:`x_+ = f(x,u,d)`
+        if ``disturbances`` are given (see :func:`simulate_closed_loop`). In ``"map"``
+        mode, if a :class:`casadi.Function`, the plant is also mapped over the ensemble.
+    x0 : array_like
+        The initial states of the plants, with shape ``(M, ns)``.
+    steps : int
+        Number of time steps to simulate.
+    pars : dict of (str, array_like), optional
+        Values of the parameters of the MPC that are shared by the whole ensemble and
+        constant along the simulation.
+    forecasts : callable, optional
+        A callable that, given the index of the closed loop in the ensemble and the
+        current time step, returns a dictionary with the values of the parameters of the
+        MPC for that loop and time step. These values override the ones in ``pars``.
+    disturbances : array_like, optional
+        Realisations of the disturbances acting on the plants, with shape
+        ``(M, T, nd)``. If given, they are passed as third argument to ``plant``.
+    shift_warm_start : bool, optional
+        If ``True``, each solve is warm-started with the previous primal-dual solution
+        of the same loop shifted by one time step (see
+        :meth:`csnlp.wrappers.Mpc.shift`), unless the previous solve failed (see
+        :attr:`EnsembleResult.success` for how failures are detected in ``"map"``
+        mode). By default, ``True``.
+    mode : "map" or "parallel", optional
+        If ``"map"``, the loops are run in lock-step, and the ``M`` solves of each time
+        step are batched in a single call to the solver mapped via
+        :func:`casadi.Function.map`, as in
+        :class:`csnlp.multistart.MappedMultistartNlp`. If ``"parallel"``, each loop is
+        run independently in a :class:`joblib.Parallel` job, as in
+        :class:`csnlp.multistart.ParallelMultistartNlp`. By default, ``"map"``.
+    parallelization : "serial", "unroll", "inline", "thread", "openmp"
+        The type of parallelization of the mapped solver (see
+        :func:`casadi.Function.map`). Only used in ``"map"`` mode. By default,
+        ``"serial"`` is selected.
+    max_num_threads : int, optional
+        Maximum number of threads of the mapped solver; if ``None``, the number of
+        threads is equal to the size of the ensemble. Only used in ``"map"`` mode.
+    parallel_kwargs : dict, optional
+        Keyword arguments used to instantiate the :class:`joblib.Parallel` backend. Only
+        used in ``"parallel"`` mode.
+    feas_tol : float, optional
+        Tolerance on the violation of the constraints and bounds below which a solve is
+        deemed successful, since mapped solvers do not report whether they succeeded.
+        Only used in ``"map"`` mode. By default, ``1e-6``.
+
+    Returns
+    -------
+    EnsembleResult
+        The trajectories of the closed-loop simulations.
+
+    Raises
+    ------
+    RuntimeError
+        Raises if the solver is uninitialized, or if the values of some parameters of
+        the MPC are not specified.
+    ValueError
+        Raises if the initial states are not compatible with the states of the MPC, or
+        if ``mode`` is invalid.
+    """
+    nlp = mpc.nlp.unwrapped
+    nlp._rebuild_stale_solver()
+    if nlp._solver is None:
+        raise RuntimeError("Solver uninitialized.")
+    if mode not in ("map", "parallel"):
+        raise ValueError(f"Invalid mode '{mode}'; expected 'map' or 'parallel'.")
+
+    p_layout = nlp._p_layout
+    x_layout = nlp._x_layout
+    state_idx = np.concatenate(
+        [np.arange(p_layout[n].start, p_layout[n].stop) for n in mpc.initial_states]
+    )
+    action_idx = np.concatenate(
+        [
+            np.arange(x_layout[n].start, x_layout[n].start + nlp._vars[n].shape[0])
+            for n in mpc.actions
+        ]
+    )
+    x0 = np.asarray(x0, dtype=float)
+    if x0.ndim != 2 or x0.shape[1] != state_idx.size:
+        raise ValueError(
+            f"Expected initial states of shape (M, {state_idx.size}); got "
+            f"{x0.shape} instead."
+        )
+    M = x0.shape[0]
+    P = _pack_ensemble_pars(p_layout, state_idx, M, steps, pars, forecasts)
+    D = None if disturbances is None else np.asarray(disturbances, dtype=float)
+    if shift_warm_start:
+        x_idx, g_idx = mpc._flat_shifted_indices()
+        shift = (x_idx, g_idx, nlp._bounds.lb_mask & nlp._bounds.ub_mask)
+    else:
+        shift = None
+    solver: cs.Function = nlp._solver.func
+    static_args = nlp._static_solver_args
+
+    if mode == "map":
+        mapped_solver = solver.map(M, parallelization, max_num_threads or M)
+        return _simulate_mapped(
+            mapped_solver,
+            static_args,
+            plant,
+            x0,
+            P,
+            D,
+            state_idx,
+            action_idx,
+            shift,
+            feas_tol,
+        )
+    with Parallel(**(parallel_kwargs or {})) as parallel:
+        results = parallel(
+            delayed(_simulate_single)(
+                solver,
+                static_args,
+                plant,
+                x0[i],
+                P[i],
+                None if D is None else D[i],
+                state_idx,
+                action_idx,
+                shift,
+            )
+            for i in range(M)
+        )
+    return EnsembleResult(*(np.stack(arrays) for arrays in zip(*results)))
+
+
+def _pack_ensemble_pars(
+    p_layout: VectorLayout,
+    state_idx: npt.NDArray[np.int64],
+    M: int,
+    steps: int,
+    pars: Optional[Mapping[str, npt.ArrayLike]],
+    forecasts: Optional[Callable[[int, int], Mapping[str, npt.ArrayLike]]],
+) -> npt.NDArray[np.floating]:
+    """Internal utility to pack the parameters of each loop and time step into an array
+    of shape ``(M, T, np)``, where the entries of the initial states are left to be
+    filled during the simulation."""
+    pars = {} if pars is None else pars
+    others = np.ones(p_layout.size, dtype=bool)
+    others[state_idx] = False
+    if forecasts is None:
+        p = p_layout.pack(pars, default=np.nan)
+        P = np.broadcast_to(p, (M, steps, p_layout.size))
+    else:
+        P = np.empty((M, steps, p_layout.size))
+        for i in range(M):
+            for k in range(steps):
+                p_layout.pack({**pars, **forecasts(i, k)}, np.nan, P[i, k])
+    if np.isnan(P[..., others]).any():
+        raise RuntimeError("Trying to solve the NLP with unspecified parameters.")
+    return P
+
+
+def _shift_warm_start(
+    shift: tuple[npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.bool_]],
+    x: npt.NDArray[np.floating],
+    lam_x: npt.NDArray[np.floating],
+    lam_g: npt.NDArray[np.floating],
+) -> tuple[npt.NDArray[np.floating], ...]:
+    """Internal utility to shift the flat primal-dual solution (by rows, which allows
+    shifting a batch of solutions stacked as columns)."""
+    x_idx, g_idx, unbounded = shift
+    lam_x0 = lam_x[x_idx]
+    lam_x0[unbounded] = 0.0
+    return x[x_idx], lam_x0, lam_g[g_idx]
+
+
+def _simulate_single(
+    solver: cs.Function,
+    static_args: dict[str, npt.NDArray[np.floating]],
+    plant: Union[cs.Function, Callable[..., npt.ArrayLike]],
+    x0: npt.NDArray[np.floating],
+    P: npt.NDArray[np.floating],
+    D: Optional[npt.NDArray[np.floating]],
+    state_idx: npt.NDArray[np.int64],
+    action_idx: npt.NDArray[np.int64],
+    shift: Optional[tuple[npt.NDArray[np.int64], ...]],
+) -> tuple[npt.NDArray, ...]:
+    """Internal utility to simulate a single closed loop of the ensemble."""
+    steps = P.shape[0]
+    states = np.empty((steps + 1, x0.size))
+    actions = np.empty((steps, action_idx.size))
+    costs = np.empty(steps)
+    solve_times = np.empty(steps)
+    success = np.empty(steps, dtype=bool)
+    states[0] = x = x0
+    kwargs = {"x0": 0.0, "lam_x0": 0.0, "lam_g0": 0.0, **static_args}
+    for k in range(steps):
+        p = P[k].copy()
+        p[state_idx] = x
+        kwargs["p"] = p
+        t0 = perf_counter()
+        sol = solver.call(kwargs)
+        solve_times[k] = perf_counter() - t0
+        success[k] = solver.stats()["success"]
+        xopt = sol["x"].full().reshape(-1)
+        u = xopt[action_idx]
+        actions[k] = u
+        costs[k] = float(sol["f"])
+        if shift is not None and success[k]:
+            lam_x = sol["lam_x"].full().reshape(-1)
+            lam_g = sol["lam_g"].full().reshape(-1)
+            x0_, lam_x0, lam_g0 = _shift_warm_start(shift, xopt, lam_x, lam_g)
+            kwargs.update(x0=x0_, lam_x0=lam_x0, lam_g0=lam_g0)
+        else:
+            kwargs.update(x0=0.0, lam_x0=0.0, lam_g0=0.0)
+        x = _call_plant(plant, x, u) if D is None else _call_plant(plant, x, u, D[k])
+        states[k + 1] = x
+    return states, actions, costs, solve_times, success
+
+
+def _simulate_mapped(
+    mapped_solver: cs.Function,
+    static_args: dict[str, npt.NDArray[np.floating]],
+    plant: Union[cs.Function, Callable[..., npt.ArrayLike]],
+    x0: npt.NDArray[np.floating],
+    P: npt.NDArray[np.floating],
+    D: Optional[npt.NDArray[np.floating]],
+    state_idx: npt.NDArray[np.int64],
+    action_idx: npt.NDArray[np.int64],
+    shift: Optional[tuple[npt.NDArray[np.int64], ...]],
+    feas_tol: float,
+) -> EnsembleResult:
+    """Internal utility to simulate the ensemble in lock-step with a mapped solver."""
+    M, steps, _ = P.shape
+    states = np.empty((M, steps + 1, x0.shape[1]))
+    actions = np.empty((M, steps, action_idx.size))
+    costs = np.empty((M, steps))
+    solve_times = np.empty((M, steps))
+    success = np.empty((M, steps), dtype=bool)
+    states[:, 0] = X = x0
+    mapped_plant = plant.map(M) if isinstance(plant, cs.Function) else None
+    lbx, ubx, lbg, ubg = (
+        static_args[n][:, None] for n in ("lbx", "ubx", "lbg", "ubg")
+    )
+    kwargs = {"x0": 0.0, "lam_x0": 0.0, "lam_g0": 0.0, **static_args}
+    for k in range(steps):
+        p = P[:, k].copy()
+        p[:, state_idx] = X
+        kwargs["p"] = p.T
+        t0 = perf_counter()
+        sol = mapped_solver.call(kwargs)
+        solve_times[:, k] = perf_counter() - t0
+        xopt = sol["x"].full()
+        f = sol["f"].full().reshape(-1)
+        g = sol["g"].full()
+        violation = np.maximum(
+            np.max(np.maximum(lbg - g, g - ubg), 0, initial=0.0),
+            np.max(np.maximum(lbx - xopt, xopt - ubx), 0, initial=0.0),
+        )
+        ok = np.isfinite(f) & np.isfinite(xopt).all(0) & (violation <= feas_tol)
+        success[:, k] = ok
+        costs[:, k] = f
+        U = xopt[action_idx].T
+        actions[:, k] = U
+        if shift is not None:
+            x0_, lam_x0, lam_g0 = _shift_warm_start(
+                shift, xopt, sol["lam_x"].full(), sol["lam_g"].full()
+            )
+            failed = ~ok
+            x0_[:, failed] = lam_x0[:, failed] = lam_g0[:, failed] = 0.0
+            kwargs.update(x0=x0_, lam_x0=lam_x0, lam_g0=lam_g0)
+        args = (X, U) if D is None else (X, U, D[:, k])
+        if mapped_plant is not None:
+            X = mapped_plant(*(a.T for a in args))
+            if plant.n_out() > 1:
+                X = X[0]
+            X = X.full().T
+        else:
+            X = np.stack([_call_plant(plant, *a) for a in zip(*args)])
+        states[:, k + 1] = X
+    return EnsembleResult(states, actions, costs, solve_times, success)
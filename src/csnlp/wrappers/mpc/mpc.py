@@ -1,4 +1,5 @@
 from collections.abc import Sequence
+from functools import lru_cache
 from inspect import signature
 from math import ceil
 from typing import Callable, Literal, Optional, TypeVar, Union
@@ -7,6 +8,8 @@ import casadi as cs
 import numpy as np
 import numpy.typing as npt
 
+from ...core.solutions import CompactSolution, LazySolution, Solution
+from ...nlps.objective import DeadlineFallback
 from ...util.math import repeat
 from ..wrapper import Nlp, NonRetroactiveWrapper
 
@@ -52,6 +55,20 @@ def _create_ati_mats(
     return F, G, H, L
 
 
+@lru_cache
+def _shifted_indices(
+    n_rows: int, n_cols: int, spacing: int, horizon: int
+) -> npt.NDArray[np.int64]:
+    """Internal utility to compute (and cache) the indices that shift by one time step
+    a matrix with shape ``(n_rows, n_cols)`` flattened in column-major order, where each
+    column holds for ``spacing`` time steps, and the last column until ``horizon``. The
+    tail is extrapolated by holding the last column."""
+    cols = np.minimum(np.arange(n_cols) * spacing + 1, horizon - 1) // spacing
+    idx = (np.arange(n_rows)[:, None] + n_rows * cols).reshape(-1, order="F")
+    idx.flags.writeable = False
+    return idx
+
+
 class Mpc(NonRetroactiveWrapper[SymType]):
     """A wrapper to easily turn an NLP scheme into an MPC controller. Most of the theory
     for MPC is taken from :cite:`rawlings_model_2017`.
@@ -528,6 +545,174 @@ class Mpc(NonRetroactiveWrapper[SymType]):
             )
         self._dynamics_already_set = True
 
+    def shift(
+        self, solution: Solution[SymType]
+    ) -> tuple[
+        dict[str, npt.NDArray[np.floating]], dict[str, npt.NDArray[np.floating]]
+    ]:
+        """Shifts the given solution by one time step along the prediction horizon, in
+        order to build the primal-dual initial guess for the next solve in a receding
+        horizon fashion.
+
+        States, actions (in accordance with ``input_spacing`` and ``control_horizon``)
+        and slacks are shifted one step forward, and their tails are extrapolated by
+        holding the last value. The same is done for the multipliers of their bounds,
+        and for the multipliers of constraints whose expressions span the prediction
+        horizon (i.e., with ``N`` or ``N + 1`` columns). Any other variable or
+        multiplier is left untouched.
+
+        Parameters
+        ----------
+        solution : Solution
+            A solution of this MPC controller.
+
+        Returns
+        -------
+        vals0 : dict of (str, array)
+            The shifted primal variables, to be passed as ``vals0`` to
+            :meth:`csnlp.Nlp.solve`.
+        duals0 : dict of (str, array)
+            The shifted dual variables, to be passed as ``warm_start`` to
+            :meth:`csnlp.Nlp.solve`.
+        """
+        nlp = self.nlp.unwrapped
+        bounds = nlp._bounds
+        vals = solution.vals
+        dual_vals = solution.dual_vals
+        vals0: dict[str, npt.NDArray[np.floating]] = {}
+        duals0: dict[str, npt.NDArray[np.floating]] = {}
+
+        for name, var in nlp._vars.items():
+            n_rows, n_cols = var.shape
+            val = np.asarray(vals[name], dtype=float).reshape(-1, order="F")
+            idx = self._var_shifted_indices(name, n_rows, n_cols)
+            vals0[name] = (val if idx is None else val[idx]).reshape(
+                var.shape, order="F"
+            )
+
+            # shift the bound multipliers via the full-size, unmasked variable
+            slc = bounds.slices[name]
+            for lb_or_ub, mask in (("lb", bounds.lb_mask), ("ub", bounds.ub_mask)):
+                name_lam = f"lam_{lb_or_ub}_{name}"
+                lam = np.asarray(dual_vals[name_lam], dtype=float).reshape(-1)
+                if idx is not None:
+                    nonmasked = ~mask[slc]
+                    lam_full = np.zeros(n_rows * n_cols)
+                    lam_full[nonmasked] = lam
+                    lam = lam_full[idx][nonmasked]
+                duals0[name_lam] = lam
+
+        for name, con in nlp._cons.items():
+            group = "g" if f"lam_g_{name}" in nlp._dual_vars else "h"
+            name_lam = f"lam_{group}_{name}"
+            lam = np.asarray(dual_vals[name_lam], dtype=float).reshape(-1)
+            idx = self._con_shifted_indices(*con.shape)
+            if idx is not None:
+                lam = lam[idx]
+            duals0[name_lam] = lam
+        return vals0, duals0
+
+    def solve(
+        self,
+        pars: Optional[dict[str, npt.ArrayLike]] = None,
+        vals0: Optional[dict[str, npt.ArrayLike]] = None,
+        warm_start: Union[None, Solution[SymType], dict[str, npt.ArrayLike]] = None,
+        deadline: Optional[float] = None,
+        fallback: DeadlineFallback = "iterate",
+    ) -> Solution[SymType]:
+        """See :meth:`csnlp.Nlp.solve`. For this controller, the ``"previous"``
+        deadline fallback returns the last successful solution shifted by one time step
+        (as in :meth:`shift`), i.e., its plan for the current time step. The shifted
+        solution keeps the objective value and stats of the previous one, while its
+        parameters are the current ones."""
+        fallback = self._deadline_fallback(fallback)
+        return super().solve(pars, vals0, warm_start, deadline, fallback)
+
+    def _deadline_fallback(self, fallback: DeadlineFallback) -> DeadlineFallback:
+        """Internal utility to replace the ``"previous"`` deadline fallback with its
+        shifted version (see :meth:`solve`)."""
+        return self._shifted_previous if fallback == "previous" else fallback
+
+    def _shifted_previous(
+        self,
+        solution: Solution[SymType],
+        previous: Union[None, Solution[SymType], CompactSolution],
+    ) -> Solution[SymType]:
+        """Internal deadline fallback that shifts the previous successful solution by
+        one time step (or returns the current iterate, if there is none)."""
+        if previous is None:
+            return solution
+        nlp = self.nlp.unwrapped
+        if isinstance(previous, CompactSolution):
+            x, lam_g, lam_x = previous.x, previous.lam_g, previous.lam_x
+            stats = {"success": previous.success, "return_status": previous.status}
+        else:
+            # rebuild the flat multipliers of the bounds, as returned by the solver
+            idx_lb = nlp.nonmasked_lbx_idx
+            n_lb = nlp.nx if isinstance(idx_lb, slice) else idx_lb.size
+            lam_lbx_and_ubx = previous.lam_lbx_and_ubx.full().reshape(-1)
+            lam_x = np.zeros(nlp.nx)
+            lam_x[idx_lb] -= lam_lbx_and_ubx[:n_lb]
+            lam_x[nlp.nonmasked_ubx_idx] += lam_lbx_and_ubx[n_lb:]
+            x = previous.x.full().reshape(-1)
+            lam_g = previous.lam_g_and_h.full().reshape(-1)
+            stats = previous.stats
+        x_idx, g_idx = self._flat_shifted_indices()
+        lam_x = lam_x[x_idx]
+        lam_x[nlp._bounds.lb_mask & nlp._bounds.ub_mask] = 0.0  # unbounded entries
+        shifted = {
+            "x": cs.DM(x[x_idx]),
+            "lam_x": cs.DM(lam_x),
+            "lam_g": cs.DM(lam_g[g_idx]),
+            "f": previous.f,
+            "p": solution.p,
+            "stats": stats,
+        }
+        return LazySolution.from_casadi_solution(shifted, nlp)
+
+    def _flat_shifted_indices(
+        self,
+    ) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        """Internal utility to compute the indices that shift (as in :meth:`shift`) the
+        flat primal vector ``x`` (and its multipliers ``lam_x``) and the flat vector of
+        constraint multipliers ``lam_g`` returned by the solver."""
+        nlp = self.nlp.unwrapped
+        x_idx = np.arange(nlp.nx)
+        for name, slc in nlp._x_layout.items():
+            idx = self._var_shifted_indices(name, *nlp._vars[name].shape)
+            if idx is not None:
+                x_idx[slc] = slc.start + idx
+        g_idx = np.arange(nlp.ng + nlp.nh)
+        for name, slc in nlp._g_layout.items():
+            idx = self._con_shifted_indices(*nlp._cons[name].shape)
+            if idx is not None:
+                g_idx[slc] = slc.start + idx
+        return x_idx, g_idx
+
+    def _var_shifted_indices(
+        self, name: str, n_rows: int, n_cols: int
+    ) -> Optional[npt.NDArray[np.int64]]:
+        """Internal utility to get the shifting indices of the given variable, or
+        ``None`` if the variable is not to be shifted."""
+        N = self._prediction_horizon
+        if name in self._actions:
+            return _shifted_indices(
+                n_rows, n_cols, self._input_spacing, self._control_horizon
+            )
+        if name in self._states or (name in self._slacks and n_cols in (N, N + 1)):
+            return _shifted_indices(n_rows, n_cols, 1, n_cols)
+        return None
+
+    def _con_shifted_indices(
+        self, n_rows: int, n_cols: int
+    ) -> Optional[npt.NDArray[np.int64]]:
+        """Internal utility to get the shifting indices of the multipliers of a
+        constraint with the given shape, or ``None`` if they are not to be shifted."""
+        N = self._prediction_horizon
+        if n_cols > 1 and n_cols in (N, N + 1):
+            return _shifted_indices(n_rows, n_cols, 1, n_cols)
+        return None
+
     def _set_singleshooting_affine_dynamics(
         self, A: MatType, B: MatType, D: Optional[MatType], c: Optional[MatType]
     ) -> tuple[MatType, MatType, Optional[MatType], Optional[MatType]]:
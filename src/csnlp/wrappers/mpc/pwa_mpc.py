@@ -10,6 +10,7 @@ import numpy.typing as npt
 from csnlp.core.solutions import Solution
 
 from ...core.data import find_index_in_vector
+from ...nlps.objective import DeadlineFallback
 from .mpc import Mpc
 
 SymType = TypeVar("SymType", cs.SX, cs.MX)
@@ -389,7 +390,14 @@ class PwaMpc(Mpc[SymType]):
         self,
         pars: Optional[dict[str, npt.ArrayLike]] = None,
         vals0: Optional[dict[str, npt.ArrayLike]] = None,
+        warm_start: Union[None, Solution[SymType], dict[str, npt.ArrayLike]] = None,
+        deadline: Optional[float] = None,
+        fallback: DeadlineFallback = "iterate",
     ) -> Solution[SymType]:
+        hooks = self._solve_hooks
+        if hooks:
+            self._run_solve_hooks("before_pack")
+        fallback = self._deadline_fallback(fallback)
         if self._fixed_sequence_dynamics:
             regions = self._pwa_system
             assert regions is not None, "PWA system should have been set!"
@@ -420,7 +428,12 @@ class PwaMpc(Mpc[SymType]):
             pars[_n("c", prefix)] = np.concatenate(Cs, 0)
             pars[_n("S", prefix)] = np.concatenate(Ss, 0)
             pars[_n("T", prefix)] = np.concatenate(Ts, 0)
-        return self.nlp.solve(pars, vals0)
+        if not hooks:
+            return self.nlp.solve(pars, vals0, warm_start, deadline, fallback)
+        self._run_solve_hooks("before_solver")
+        sol = self.nlp.solve(pars, vals0, warm_start, deadline, fallback)
+        self._run_solve_hooks("after_solver")
+        return sol
 
     @staticmethod
     def get_optimal_switching_sequence(
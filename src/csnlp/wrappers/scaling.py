@@ -8,6 +8,7 @@ import numpy.typing as npt
 
 from ..core.scaling import Scaler
 from ..core.solutions import Solution, subsevalf
+from ..nlps.objective import DeadlineFallback
 from .wrapper import Nlp, NonRetroactiveWrapper
 
 SymType = TypeVar("SymType", cs.SX, cs.MX)
@@ -164,14 +165,27 @@ class NlpScaling(NonRetroactiveWrapper[SymType]):
         self,
         pars: Optional[dict[str, npt.ArrayLike]] = None,
         vals0: Optional[dict[str, npt.ArrayLike]] = None,
+        warm_start: Union[None, Solution[SymType], dict[str, npt.ArrayLike]] = None,
+        deadline: Optional[float] = None,
+        fallback: DeadlineFallback = "iterate",
     ) -> Solution[SymType]:
-        """See :meth:`csnlp.Nlp.solve`."""
+        """See :meth:`csnlp.Nlp.solve`. Note that a ``warm_start`` is passed as is,
+        i.e., it must refer to the scaled NLP (as the solutions returned by this
+        method)."""
+        hooks = self._solve_hooks
+        if hooks:
+            self._run_solve_hooks("before_pack")
         scaler = self.scaler
         if pars is not None:
             pars = _scale_dict(pars, scaler)
         if vals0 is not None:
             vals0 = _scale_dict(vals0, scaler)
-        return self.nlp.solve(pars, vals0)
+        if not hooks:
+            return self.nlp.solve(pars, vals0, warm_start, deadline, fallback)
+        self._run_solve_hooks("before_solver")
+        sol = self.nlp.solve(pars, vals0, warm_start, deadline, fallback)
+        self._run_solve_hooks("after_solver")
+        return sol
 
     def solve_multi(
         self,
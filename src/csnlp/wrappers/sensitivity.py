@@ -1,3 +1,5 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
 from functools import cache, cached_property
 from typing import Callable, Literal, Optional, TypeVar, Union
 
@@ -5,7 +7,7 @@ import casadi as cs
 import numpy as np
 import numpy.typing as npt
 
-from ..core.cache import invalidate_cache
+from ..core.cache import invalidate_cache, invalidate_caches_of
 from ..core.data import array2cs, cs2array, find_index_in_vector
 from ..core.derivatives import hohessian, hojacobian
 from ..core.solutions import Solution
@@ -394,6 +396,15 @@ class NlpSensitivity(Wrapper[SymType]):
         """See :meth:`csnlp.Nlp.minimize`."""
         return self.nlp.minimize(objective)
 
+    @contextmanager
+    def batch_edit(self) -> Iterator[None]:
+        """See :meth:`csnlp.Nlp.batch_edit`."""
+        try:
+            with self.nlp.batch_edit():
+                yield
+        finally:
+            invalidate_caches_of(self)
+
     @invalidate_cache(jacobian, hessian, hojacobian)
     def set_target_parameters(self, parameters: Optional[SymType]) -> None:
         """Sets the target parameters of the sensitivity wrapper.
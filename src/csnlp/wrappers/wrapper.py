@@ -1,17 +1,23 @@
 from collections.abc import Iterable
-from typing import Any, Generic, TypeVar, Union
+from functools import partial
+from typing import Any, Generic, Optional, TypeVar, Union
 
 import casadi as cs
 from numpy import typing as npt
 
+from ..core.aio import SupportsAsyncSolve
+from ..core.hooks import SupportsSolveHooks
 from ..core.solutions import Solution
 from ..nlps.nlp import Nlp
+from ..nlps.objective import DeadlineFallback
 from ..util.io import SupportsDeepcopyAndPickle
 
 SymType = TypeVar("SymType", cs.SX, cs.MX)
 
 
-class Wrapper(SupportsDeepcopyAndPickle, Generic[SymType]):
+class Wrapper(
+    SupportsDeepcopyAndPickle, SupportsSolveHooks, SupportsAsyncSolve, Generic[SymType]
+):
     """Wraps an instance of :class:`csnlp.Nlp` to allow a modular transformation of its
     methods. This class is the base class for all wrappers. The subclass can then
     override some methods to change the behavior of the original environment without
@@ -22,6 +28,10 @@ class Wrapper(SupportsDeepcopyAndPickle, Generic[SymType]):
     :class:`NonRetroactiveWrapper` for wrappers that need to wrap an NLP before it is
     defined.
 
+    Each wrapper has its own solve hooks (see
+    :class:`csnlp.core.hooks.SupportsSolveHooks`), separate from the ones of the wrapped
+    NLP, which are called with the name ``"<WrapperClass>:<nlp name>"``.
+
     Parameters
     ----------
     nlp : Nlp or subclass
@@ -55,6 +65,61 @@ class Wrapper(SupportsDeepcopyAndPickle, Generic[SymType]):
             return True
         return self.nlp.is_wrapped(wrapper_type)
 
+    @property
+    def _solve_hook_name(self) -> str:
+        return f"{self.__class__.__name__}:{self.nlp.name}"
+
+    def solve(
+        self,
+        pars: Optional[dict[str, npt.ArrayLike]] = None,
+        vals0: Optional[dict[str, npt.ArrayLike]] = None,
+        warm_start: Union[None, Solution[SymType], dict[str, npt.ArrayLike]] = None,
+        deadline: Optional[float] = None,
+        fallback: DeadlineFallback = "iterate",
+    ) -> Solution[SymType]:
+        """See :meth:`csnlp.Nlp.solve`."""
+        hooks = self._solve_hooks
+        if not hooks:
+            return self.nlp.solve(pars, vals0, warm_start, deadline, fallback)
+        # inputs and solution are passed through, so there is nothing to pack or unpack
+        self._run_solve_hooks("before_solver")
+        sol = self.nlp.solve(pars, vals0, warm_start, deadline, fallback)
+        self._run_solve_hooks("after_solver")
+        return sol
+
+    async def solve_async(
+        self,
+        pars: Optional[dict[str, npt.ArrayLike]] = None,
+        vals0: Optional[dict[str, npt.ArrayLike]] = None,
+        warm_start: Union[None, Solution[SymType], dict[str, npt.ArrayLike]] = None,
+        deadline: Optional[float] = None,
+        fallback: DeadlineFallback = "iterate",
+        timeout: Optional[float] = None,
+    ) -> Solution[SymType]:
+        """See :meth:`csnlp.Nlp.solve_async`. The solve goes through this wrapper's
+        :meth:`solve`, and is subject to this wrapper's asynchronous configuration
+        (see :meth:`init_async`), not to the one of the wrapped NLP."""
+        return await self._run_async(
+            self.solve, timeout, pars, vals0, warm_start, deadline, fallback
+        )
+
+    async def solve_multi_async(
+        self,
+        pars: Union[
+            None, dict[str, npt.ArrayLike], Iterable[dict[str, npt.ArrayLike]]
+        ] = None,
+        vals0: Union[
+            None, dict[str, npt.ArrayLike], Iterable[dict[str, npt.ArrayLike]]
+        ] = None,
+        return_all_sols: bool = False,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Union[Solution[SymType], list[Solution[SymType]]]:
+        """See :meth:`csnlp.MultistartNlp.solve_multi_async`. The solve goes through
+        this wrapper's ``solve_multi``, as in :meth:`solve_async`."""
+        func = partial(self.solve_multi, **kwargs)
+        return await self._run_async(func, timeout, pars, vals0, return_all_sols)
+
     def __getattr__(self, name: str) -> Any:
         """Reroutes attributes to the wrapped NLP instance."""
         if name.startswith("_"):
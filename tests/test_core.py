@@ -1,5 +1,8 @@
+import pickle
 import random
+import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from functools import cached_property, lru_cache
 from itertools import product, repeat
 from typing import Union
@@ -8,13 +11,25 @@ import casadi as cs
 import numpy as np
 from parameterized import parameterized
 
-from csnlp import Nlp
+from csnlp import Nlp, multistart
+from csnlp.core.bounds import BoundsStore
 from csnlp.core.cache import invalidate_cache
 from csnlp.core.data import array2cs, cs2array, find_index_in_vector
 from csnlp.core.debug import NlpDebug, NlpDebugEntry
 from csnlp.core.derivatives import hohessian, hojacobian
+from csnlp.core.layout import VectorLayout
 from csnlp.core.scaling import MinMaxScaler, Scaler
-from csnlp.core.solutions import EagerSolution, Solution, subsevalf
+from csnlp.core.solutions import (
+    CompactSolution,
+    EagerSolution,
+    Solution,
+    _ValueFunctionCache,
+    evaluate_many,
+    subsevalf,
+)
+from csnlp.core.solver_cache import SolverDiskCache, fingerprint
+from csnlp.core.solver_pool import SolverPool
+from csnlp.core.telemetry import SolveTelemetry
 
 GROUPS = set(NlpDebug._types.keys())
 
@@ -422,6 +437,186 @@ class TestSolutions(unittest.TestCase):
         self.assertEqual(not sol.infeasible, is_feas)
 
 
+    @parameterized.expand([("SX",), ("MX",)])
+    def test_value__reuses_compiled_functions_across_solutions(self, sym_type: str):
+        nlp = Nlp(sym_type=sym_type)
+        x = nlp.variable("x", (2, 1), lb=-1)[0]
+        p = nlp.parameter("p", (2, 1))
+        _, lam = nlp.constraint("c", x[0] + x[1], ">=", 0.5)
+        nlp.minimize(cs.sumsqr(x - p))
+        nlp.init_solver({"print_time": False, "ipopt": {"print_level": 0}})
+        stage_cost = cs.sumsqr(x) + p[0] * lam
+        sol1 = nlp.solve({"p": [1.0, 2.0]})
+        sol2 = nlp.solve({"p": [-2.0, 0.0]})
+
+        for sol in (sol1, sol2):
+            expected = subsevalf(
+                stage_cost, sol.x_and_lam_and_p_sym, sol.x_and_lam_and_p
+            )
+            np.testing.assert_allclose(sol.value(stage_cost), expected)
+        func = sol1._value_function((stage_cost,))
+        self.assertIsNotNone(func)
+        self.assertIs(func, sol2._value_function((stage_cost,)))
+        nlp.constraint("c2", x[0], "<=", 0.9)  # changes the structure
+        sol3 = nlp.solve({"p": [1.0, 2.0]})
+        self.assertIsNot(func, sol3._value_function((stage_cost,)))
+        np.testing.assert_allclose(
+            sol3.value(stage_cost),
+            subsevalf(stage_cost, sol3.x_and_lam_and_p_sym, sol3.x_and_lam_and_p),
+        )
+
+    def test_value_function_cache__is_thread_safe(self):
+        cache = _ValueFunctionCache(maxsize=2)  # so that entries are evicted often
+        x = cs.SX.sym("x")
+        exprs = [(x * i,) for i in range(8)]
+
+        def evaluate_all(_: int) -> list[float]:
+            return [float(cache.get(0, e, x)(1.0)) for e in exprs * 20]
+
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(evaluate_all, range(8)))
+        for values in results:
+            np.testing.assert_array_equal(values, list(range(8)) * 20)
+        self.assertLessEqual(len(cache._entries), 2)
+
+    @parameterized.expand([("SX",), ("MX",)])
+    def test_values__evaluates_many_expressions_at_once(self, sym_type: str):
+        nlp = Nlp(sym_type=sym_type)
+        x = nlp.variable("x", (2, 1), lb=-1)[0]
+        p = nlp.parameter("p")
+        nlp.minimize(cs.sumsqr(x - p))
+        nlp.init_solver({"print_time": False, "ipopt": {"print_level": 0}})
+        sol = nlp.solve({"p": 3.0})
+        exprs = {"a": x * p, "b": cs.sum1(x), "c": nlp.dual_variables["lam_lb_x"]}
+
+        values = sol.values(exprs)
+        self.assertEqual(values.keys(), exprs.keys())
+        for n, expr in exprs.items():
+            np.testing.assert_allclose(values[n], sol.value(expr))
+        values_list = sol.values(exprs.values())
+        for v1, v2 in zip(values_list, values.values()):
+            np.testing.assert_array_equal(v1, v2)
+        free = nlp.sym_type.sym("free")
+        with self.assertRaises(RuntimeError):
+            sol.values([x, free])
+        with self.assertRaises(RuntimeError):
+            sol.value(free * x)
+
+    @parameterized.expand(product(("SX", "MX"), (False, True)))
+    def test_evaluate_many__matches_value(self, sym_type: str, use_multistart: bool):
+        opts = {"print_time": False, "ipopt": {"print_level": 0}}
+        if use_multistart:
+            nlp = multistart.StackedMultistartNlp(sym_type=sym_type, starts=4)
+        else:
+            nlp = Nlp(sym_type=sym_type)
+        x = nlp.variable("x", (2, 1), lb=-1)[0]
+        p = nlp.parameter("p")
+        _, lam = nlp.constraint("c", x[0] + x[1], ">=", 0.5)
+        nlp.minimize(cs.sumsqr(x - p) + x[0] * x[1])
+        nlp.init_solver(opts)
+        pars = np.linspace(-2, 2, 4)
+        if use_multistart:
+            sols = nlp.solve_multi(
+                [{"p": p_} for p_ in pars], {"x": [0, 0]}, return_all_sols=True
+            )
+        else:
+            sols = [nlp.solve({"p": p_}) for p_ in pars]
+        expr = cs.horzcat(x * p, cs.vertcat(lam, cs.sum1(x)), x**2)
+
+        values = evaluate_many(expr, sols)
+
+        self.assertEqual(values.shape, (4, 2, 3))
+        for sol, value in zip(sols, values):
+            np.testing.assert_allclose(value, sol.value(expr))
+        nlp.constraint("c2", x[0], "<=", 1)  # changes the structure
+        solve = nlp.solve_multi if use_multistart else nlp.solve
+        sols.append(solve({"p": 0.0}))
+        with self.assertRaisesRegex(ValueError, "different structures"):
+            evaluate_many(expr, sols)
+        with self.assertRaisesRegex(RuntimeError, "depends on symbols other than"):
+            evaluate_many(expr * nlp.sym_type.sym("free"), sols[:1])
+
+    @parameterized.expand([("SX",), ("MX",)])
+    def test_compact_solution__matches_solution_and_pickles(self, sym_type: str):
+        nlp = Nlp(sym_type=sym_type)
+        x = nlp.variable("x", (2, 2), lb=[[0, -np.inf], [-1, 0]], ub=1)[0]
+        y = nlp.variable("y", lb=-np.inf)[0]
+        p = nlp.parameter("p", (2, 1))
+        nlp.constraint("c1", x[:, 0] + y, "==", p)
+        nlp.constraint("c2", cs.sum2(x), "<=", p + 1)
+        nlp.minimize(cs.sumsqr(x - 2) + (y + 3) ** 2)
+        nlp.init_solver({"print_time": False, "ipopt": {"print_level": 0}})
+        sol = nlp.solve({"p": [0.5, 1.2]})
+        self.assertTrue(sol.success)
+
+        compacts = (
+            CompactSolution.from_casadi_solution(dict(sol._sol, stats=sol.stats), nlp),
+            CompactSolution.from_solution(sol, nlp),
+        )
+
+        for compact in compacts:
+            self.assertFalse(hasattr(compact, "__dict__"))
+            self.assertEqual(compact.status, sol.status)
+            self.assertEqual(compact.success, sol.success)
+            self.assertEqual(compact.f, sol.f)
+            self.assertIsInstance(compact.status_code, int)
+            compact = pickle.loads(pickle.dumps(compact))
+            self.assertEqual(compact.status_code, compacts[0].status_code)
+            self.assertIs(compact.status, compacts[0].status)
+            self.assertEqual(compact.vals.keys(), sol.vals.keys())
+            for n, val in compact.vals.items():
+                np.testing.assert_allclose(val, sol.vals[n])
+            self.assertEqual(compact.dual_vals.keys(), sol.dual_vals.keys())
+            for n, val in compact.dual_vals.items():
+                np.testing.assert_allclose(val, sol.dual_vals[n], atol=1e-12)
+            np.testing.assert_allclose(compact.pars["p"], [[0.5], [1.2]])
+
+
+class TestBoundsStore(unittest.TestCase):
+    @parameterized.expand([(False,), (True,)])
+    def test_append__grows_and_matches_concatenated_masked_arrays(
+        self, remove_redundant: bool
+    ):
+        store = BoundsStore(remove_redundant, capacity=1)
+        lbs, ubs = [], []
+        for i in range(20):
+            size = np.random.randint(1, 5)
+            lb = np.where(np.random.rand(size) > 0.5, -np.inf, np.random.rand(size))
+            ub = np.where(np.random.rand(size) > 0.5, np.inf, np.random.rand(size) + 1)
+            n_lb, n_ub = store.append(f"v{i}", lb, ub)
+            mask_lb, mask_ub = np.isneginf(lb), np.isposinf(ub)
+            if not remove_redundant:
+                mask_lb[:] = mask_ub[:] = False
+            self.assertEqual(n_lb, size - mask_lb.sum())
+            self.assertEqual(n_ub, size - mask_ub.sum())
+            lbs.append(np.ma.masked_array(lb, mask_lb))
+            ubs.append(np.ma.masked_array(ub, mask_ub))
+        for which, expected in (("lb", lbs), ("ub", ubs)):
+            actual = store.masked(which)
+            expected = np.ma.concatenate(expected)
+            np.testing.assert_array_equal(actual.data, expected.data)
+            np.testing.assert_array_equal(
+                np.ma.getmaskarray(actual), np.ma.getmaskarray(expected)
+            )
+        self.assertEqual(len(store), sum(map(len, lbs)))
+        offset = 0
+        for i, lb in enumerate(lbs):
+            self.assertEqual(store.slices[f"v{i}"], slice(offset, offset + lb.size))
+            offset += lb.size
+
+    def test_remove__removes_only_requested_bounds(self):
+        store = BoundsStore(capacity=1)
+        store.append("x", np.zeros(3), np.ones(3))
+        store.append("y", np.zeros(4), np.ones(4))
+        n_remaining = store.remove("y", "lb", np.asarray([1, 3]))
+        self.assertEqual(n_remaining, 2)
+        np.testing.assert_array_equal(store.lb, [0, 0, 0, 0, -np.inf, 0, -np.inf])
+        np.testing.assert_array_equal(store.ub, np.ones(7))
+        np.testing.assert_array_equal(store.nonmasked_idx("lb"), [0, 1, 2, 3, 5])
+        self.assertEqual(store.nonmasked_idx("ub"), slice(None))
+        self.assertIs(store.masked("ub").mask, np.ma.nomask)
+
+
 class TestData(unittest.TestCase):
     @parameterized.expand(product([cs.MX, cs.SX], [(1, 1), (3, 1), (1, 3), (3, 3)]))
     def test_cs2array_array2cs__convert_properly(
@@ -450,6 +645,133 @@ class TestData(unittest.TestCase):
         np.testing.assert_array_equal([3, 2], find_index_in_vector(X, x))
 
 
+class TestLayout(unittest.TestCase):
+    @parameterized.expand([("SX",), ("MX",)])
+    def test_pack__matches_subsevalf(self, sym_type: str):
+        nlp = Nlp(sym_type)
+        shapes = {"a": (1, 1), "b": (3, 1), "c": (1, 4), "d": (2, 3), "e": (3, 2)}
+        for n, shape in shapes.items():
+            nlp.parameter(n, shape)
+        vals = {
+            "a": 5,
+            "b": np.random.randn(3),  # 1D value for a column vector
+            "c": cs.DM(np.random.randn(4, 1)),  # column value for a row vector
+            "d": np.random.randn(2, 3),
+            "e": np.random.randn(2),  # broadcast to (3, 2)
+        }
+        layout = VectorLayout.from_symbols(nlp.parameters)
+        expected = subsevalf(nlp.p, nlp.parameters, vals).full().flatten()
+        np.testing.assert_array_equal(layout.pack(vals), expected)
+        self.assertEqual(layout.size, nlp.np)
+        unpacked = layout.unpack(expected)
+        np.testing.assert_array_equal(unpacked["d"], vals["d"])
+        self.assertEqual(unpacked["e"].shape, (3, 2))
+
+    def test_pack__handles_defaults_and_errors(self):
+        layout = VectorLayout({"x": (2, 2), "y": (3, 1)})
+        out = np.empty(7)
+        packed = layout.pack({"x": [[1, 3], [2, 4]]}, default=0.0, out=out)
+        self.assertIs(packed, out)
+        np.testing.assert_array_equal(packed, [1, 2, 3, 4, 0, 0, 0])
+        with self.assertRaises(KeyError):
+            layout.pack({"x": 1})
+        with self.assertRaises(ValueError):
+            layout.pack({"x": np.ones(3), "y": 0})
+        with self.assertRaises(ValueError):
+            layout.pack({"x": 1, "y": 0}, out=np.empty(6))
+
+
+class TestSolverCache(unittest.TestCase):
+    def _problem(self, sym_type: str, coeff: float = 1.0) -> dict:
+        nlp = Nlp(sym_type, name="fp")
+        x = nlp.variable("x", (2, 1))[0]
+        p = nlp.parameter("p")
+        nlp.constraint("c", x[0], "<=", p)
+        nlp.minimize(cs.sumsqr(x) * coeff)
+        return {"x": nlp.x, "p": nlp.p, "g": cs.vertcat(nlp.g, nlp.h), "f": nlp.f}
+
+    @parameterized.expand([("SX",), ("MX",)])
+    def test_fingerprint__is_structural(self, sym_type: str):
+        opts = {"ipopt": {"max_iter": 10}, "discrete": np.zeros(2, bool)}
+        key = fingerprint(cs.nlpsol, "ipopt", self._problem(sym_type), opts)
+        self.assertEqual(
+            key, fingerprint(cs.nlpsol, "ipopt", self._problem(sym_type), opts)
+        )
+        others = [
+            fingerprint(cs.nlpsol, "ipopt", self._problem(sym_type, 2.0), opts),
+            fingerprint(cs.nlpsol, "sqpmethod", self._problem(sym_type), opts),
+            fingerprint(cs.nlpsol, "ipopt", self._problem(sym_type), {"ipopt": {}}),
+        ]
+        self.assertNotIn(key, others)
+        callback_opts = {"iteration_callback": object()}
+        self.assertIsNone(
+            fingerprint(cs.nlpsol, "ipopt", self._problem(sym_type), callback_opts)
+        )
+
+    def test_disk_cache__saves_and_loads_solvers(self):
+        x = cs.SX.sym("x")
+        func = cs.Function("F", [x], [x**2])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = SolverDiskCache(tmpdir)
+            self.assertIsNone(cache.load("key"))
+            cache.save("key", func)
+            loaded = cache.load("key")
+            self.assertEqual(float(loaded(3)), 9.0)
+            cache.path("corrupted").write_text("not a function")
+            self.assertIsNone(cache.load("corrupted"))
+
+
+class TestSolverPool(unittest.TestCase):
+    def test_checkout__returns_solvers_and_times_out(self):
+        with self.assertRaisesRegex(ValueError, "at least one solver"):
+            SolverPool([])
+        pool = SolverPool(["solver1", "solver2"])
+        with pool.checkout() as solver1, pool.checkout() as solver2:
+            self.assertListEqual([solver1, solver2], ["solver1", "solver2"])
+            self.assertEqual(pool.available, 0)
+            with self.assertRaises(TimeoutError):
+                with pool.checkout(timeout=0.01):
+                    pass
+        self.assertEqual(pool.available, 2)
+        copy = pickle.loads(pickle.dumps(pool))
+        self.assertEqual((copy.size, copy.available), (2, 2))
+
+
+class TestTelemetry(unittest.TestCase):
+    def test_record__wraps_around_and_summarizes(self):
+        telemetry = SolveTelemetry(capacity=4)
+        for i in range(6):
+            stats = {"iter_count": i, "return_status": f"s{i}", "success": i % 2 == 0}
+            if i >= 3:
+                stats["t_wall_nlp_f"] = 0.1 * i
+            telemetry.record(float(i + 1), float(i), stats)
+
+        self.assertEqual(len(telemetry), 4)
+        self.assertEqual(telemetry.count, 6)
+        np.testing.assert_array_equal(telemetry.values("wall_time"), [3, 4, 5, 6])
+        np.testing.assert_array_equal(telemetry.values("overhead"), np.ones(4))
+        np.testing.assert_allclose(
+            telemetry.values("t_wall_nlp_f"), [np.nan, 0.3, 0.4, 0.5]
+        )
+        self.assertListEqual(telemetry.statuses, ["s2", "s3", "s4", "s5"])
+        self.assertEqual(telemetry.success_rate, 0.5)
+        summary = telemetry.percentiles((50, 100))
+        self.assertDictEqual(summary["iter_count"], {"p50": 3.5, "p100": 5.0})
+        self.assertAlmostEqual(summary["t_wall_nlp_f"]["p100"], 0.5)
+
+        text = telemetry.export_text(labels={"nlp": "mpc"})
+        self.assertIn('csnlp_solve_total{nlp="mpc"} 6', text)
+        self.assertIn('csnlp_solve_wall_time{nlp="mpc",quantile="0.5"} 4.5', text)
+        self.assertIn('csnlp_solve_wall_time_count{nlp="mpc"} 4', text)
+        self.assertIn("# TYPE csnlp_solve counter\n", text)
+        telemetry.clear()
+        self.assertEqual(len(telemetry), 0)
+        self.assertTrue(np.isnan(telemetry.percentiles()["wall_time"]["p99"]))
+        text = telemetry.export_text()
+        self.assertIn('csnlp_solve_wall_time{quantile="0.99"} NaN', text)
+        self.assertNotIn("nan", text)
+
+
 class TestDerivatives(unittest.TestCase):
     @parameterized.expand([((2, 2),), ((3, 1),), ((1, 3),)])
     def test_hojacobian__computes_right_derivatives(self, shape: tuple[int, int]):
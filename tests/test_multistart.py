@@ -1,3 +1,4 @@
+import asyncio
 import pickle
 import unittest
 from itertools import product
@@ -12,6 +13,7 @@ from csnlp.core.solutions import subsevalf
 from csnlp.multistart import (
     MappedMultistartNlp,
     ParallelMultistartNlp,
+    ProcessMultistartNlp,
     RandomStartPoint,
     RandomStartPoints,
     StackedMultistartNlp,
@@ -32,7 +34,12 @@ OPTS = {
         "print_options_documentation": "no",
     },
 }
-MULTI_NLP_CLASSES = [ParallelMultistartNlp, StackedMultistartNlp, MappedMultistartNlp]
+MULTI_NLP_CLASSES = [
+    ParallelMultistartNlp,
+    StackedMultistartNlp,
+    MappedMultistartNlp,
+    ProcessMultistartNlp,
+]
 TMultiNlp = TypeVar("TMultiNlp", *MULTI_NLP_CLASSES)
 
 
@@ -140,6 +147,20 @@ class TestMultistartNlp(unittest.TestCase):
         ):
             nlp((None,), (None,), return_all_sols=True, return_stacked_sol=True)
 
+    def test_solve_multi_async__matches_solve_multi(self):
+        nlp = StackedMultistartNlp(starts=3, sym_type=self.sym_type)
+        x = nlp.variable("x", lb=-0.5, ub=1.4)[0]
+        p = nlp.parameter("p")
+        nlp.minimize(-0.3 * p * x**2 + cs.exp(-100 * p * (x - 1) ** 2))
+        nlp.init_solver(OPTS)
+        args = ({"p": 1.0}, [{"x": x0} for x0 in (0.9, 0.5, 1.1)])
+        sols = asyncio.run(nlp.solve_multi_async(*args, return_all_sols=True))
+        expected = nlp.solve_multi(*args, return_all_sols=True)
+        for sol, sol_ in zip(sols, expected):
+            np.testing.assert_allclose(sol.vals["x"], sol_.vals["x"])
+        stacked = asyncio.run(nlp.solve_multi_async(*args, return_stacked_sol=True))
+        self.assertEqual(stacked.x.shape, nlp._stacked_nlp.x.shape)
+
     @parameterized.expand(product([False, True], MULTI_NLP_CLASSES))
     def test_solve__computes_right_solution(
         self, copy: bool, multinlp_cls: type[TMultiNlp]
@@ -179,6 +200,38 @@ class TestMultistartNlp(unittest.TestCase):
         np.testing.assert_allclose(best_sol.f, min(fs))
         np.testing.assert_allclose(best_sol.value(nlp.f), min(fs))
 
+    def test_process_multistart__reuses_workers_until_solver_changes(self):
+        nlp = ProcessMultistartNlp(starts=2, sym_type=self.sym_type)
+        x = nlp.variable("x", lb=-2, ub=2)[0]
+        p = nlp.parameter("p")
+        nlp.minimize((x**2 - p) ** 2)
+        nlp.init_solver(OPTS)
+        sols = nlp.solve_multi({"p": 1}, [{"x": -1}, {"x": 1}], return_all_sols=True)
+        np.testing.assert_allclose(
+            [sol.vals["x"] for sol in sols], [[[-1]], [[1]]], atol=1e-4
+        )
+        workers = nlp._workers
+        sols2 = nlp.solve_multi([{"p": 4}, {"p": 1}], {"x": 1}, return_all_sols=True)
+        self.assertIs(nlp._workers, workers)
+        np.testing.assert_allclose(
+            [sol.vals["x"] for sol in sols2], [[[2]], [[1]]], atol=1e-4
+        )
+        np.testing.assert_allclose(  # outputs are copied out of the shared memory
+            [sol.vals["x"] for sol in sols], [[[-1]], [[1]]], atol=1e-4
+        )
+        np.testing.assert_allclose([sol.f for sol in sols2], 0, atol=1e-6)
+        self.assertTrue(all(sol.success for sol in sols2))
+        with self.assertRaisesRegex(ValueError, "Expected at most 2 starts"):
+            nlp.solve_multi([{"p": 1}] * 3, [{"x": 0}] * 3)
+
+        nlp.constraint("c", x, ">=", 0.5 * p)  # rebuilds the solver, and the workers
+        self.assertIsNone(nlp._workers)
+        best = nlp.solve_multi({"p": 1}, [{"x": -1}, {"x": 1}])
+        self.assertIsNot(nlp._workers, workers)
+        np.testing.assert_allclose(best.vals["x"], 1, atol=1e-4)
+        nlp.terminate_workers()
+        self.assertIsNone(nlp._shared_arrays)
+
     @parameterized.expand([(cls,) for cls in MULTI_NLP_CLASSES])
     def test_is_pickleable(self, multinlp_cls: type[TMultiNlp]):
         N = 3
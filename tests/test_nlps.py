@@ -1,15 +1,25 @@
+import asyncio
+import os
 import pickle
+import shutil
+import tempfile
+import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from itertools import product
 from typing import Union
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import casadi as cs
 import numpy as np
 from parameterized import parameterized, parameterized_class
 
 from csnlp import Nlp
+from csnlp.core.monitor import COLUMNS, IterationMonitor, time_budget
 from csnlp.core.solutions import subsevalf
+from csnlp.core.solver_pool import SolverProcessPool
+from csnlp.nlps.objective import _round_deadline
 from csnlp.util.math import log
 
 OPTS = {
@@ -440,6 +450,79 @@ class TestNlp(unittest.TestCase):
             mock_qpsol.assert_called_once()
             mock_nlpsol.assert_not_called()
 
+    def test_init_solver__lazy_refresh__rebuilds_solver_only_once(self):
+        nlp = Nlp(sym_type=self.sym_type, lazy_refresh=True)
+        x = nlp.variable("x")[0]
+        nlp.minimize((x - 1) ** 2)
+        nlp.init_solver(OPTS)
+        self.assertFalse(nlp.solver_is_stale)
+
+        init_solver = nlp.init_solver
+        nlp.init_solver = mock_init_solver = Mock(side_effect=init_solver)
+        p = nlp.parameter("p")
+        y = nlp.variable("y")[0]
+        nlp.constraint("c", x + y, ">=", p)
+        nlp.minimize((x - 1) ** 2 + y**2)
+        mock_init_solver.assert_not_called()
+        self.assertTrue(nlp.solver_is_stale)
+        self.assertEqual(nlp.refreshes_avoided, 3)
+
+        sol = nlp.solve({"p": 4})
+        mock_init_solver.assert_called_once()
+        self.assertFalse(nlp.solver_is_stale)
+        self.assertTrue(sol.success)
+        np.testing.assert_allclose(sol.vals["x"], 2.5, atol=1e-6)
+        np.testing.assert_allclose(sol.vals["y"], 1.5, atol=1e-6)
+
+    def test_batch_edit__builds_same_nlp_with_single_solver_build(self):
+        def build(nlp: Nlp, batch: bool) -> None:
+            x = nlp.variable("x", (3, 1), lb=-1, ub=[[1], [np.inf], [2]])[0]
+            nlp.minimize(cs.sumsqr(x))
+            nlp.init_solver(OPTS)
+            init_solver = nlp.init_solver
+            nlp.init_solver = mock_init_solver = Mock(side_effect=init_solver)
+            with nlp.batch_edit() if batch else nullcontext():
+                p = nlp.parameter("p", (2, 1))
+                y = nlp.variable("y", (2, 1), ub=3)[0]
+                for i in range(5):
+                    nlp.constraint(f"g{i}", x[0] + y[0], "==", p[0] + i)
+                    nlp.constraint(f"h{i}", x[1] - y[1], "<=", p[1] * i)
+                for i in range(1, 4):
+                    nlp.remove_constraints(f"g{i}")
+                    nlp.remove_constraints(f"h{i}")
+                nlp.remove_variable_bounds("x", "lb", [(0, 0), (2, 0)])
+                nlp.minimize(cs.sumsqr(x) + cs.sumsqr(y))
+            return mock_init_solver
+
+        nlp1 = Nlp(sym_type=self.sym_type)
+        nlp2 = Nlp(sym_type=self.sym_type)
+        build(nlp1, False)
+        mock_init_solver = build(nlp2, True)
+
+        mock_init_solver.assert_called_once()
+        for attr in ("x", "p", "g", "h", "lam_g", "lam_h", "lam_lbx", "lam_ubx"):
+            self.assertEqual(
+                str(getattr(nlp1, attr)), str(getattr(nlp2, attr)), msg=attr
+            )
+        self.assertEqual(str(nlp1.lam), str(nlp2.lam))
+        self.assertEqual(str(nlp1.h_lbx), str(nlp2.h_lbx))
+        np.testing.assert_array_equal(nlp1.lbx, nlp2.lbx)
+        np.testing.assert_array_equal(nlp1.ubx, nlp2.ubx)
+        pars = {"p": [1, 2]}
+        sol1 = nlp1.solve(pars)
+        sol2 = nlp2.solve(pars)
+        np.testing.assert_allclose(sol1.x, sol2.x)
+        np.testing.assert_allclose(sol1.lam_g_and_h, sol2.lam_g_and_h)
+
+    def test_batch_edit__raises__when_initializing_solver_inside(self):
+        nlp = Nlp(sym_type=self.sym_type)
+        x = nlp.variable("x")[0]
+        nlp.minimize(x**2)
+        with self.assertRaisesRegex(RuntimeError, "during a batch edit"):
+            with nlp.batch_edit():
+                nlp.init_solver(OPTS)
+        self.assertIsNone(nlp._batch)
+
     def test_solve__raises__with_uninit_solver(self):
         nlp = Nlp(sym_type=self.sym_type)
         with self.assertRaisesRegex(RuntimeError, "Solver uninitialized."):
@@ -456,6 +539,498 @@ class TestNlp(unittest.TestCase):
         ):
             nlp.solve({})
 
+    def test_solve_raw__matches_solve(self):
+        nlp = Nlp(sym_type=self.sym_type)
+        x = nlp.variable("x", (2, 1), lb=-1, ub=1)[0]
+        y = nlp.variable("y", lb=0)[0]
+        p = nlp.parameter("p", (2, 1))
+        nlp.constraint("c1", x[0] + x[1], ">=", 0.5)
+        nlp.constraint("c2", x[0] - y, "==", 0.2)
+        nlp.minimize(cs.sumsqr(x - p) + y**2)
+        nlp.init_solver(OPTS)
+        pars = np.asarray([3.0, -3.0])
+
+        sol = nlp.solve({"p": pars})
+        raw = nlp.solve_raw(pars)
+        self.assertTrue(raw.success)
+        self.assertEqual(raw.status, sol.status)
+        self.assertIsNone(raw.stats)
+        np.testing.assert_allclose(raw.f, sol.f)
+        np.testing.assert_allclose(raw.x, sol.x.full().flatten())
+        layout = nlp.layout
+        np.testing.assert_allclose(raw.x[layout.x["y"]], sol.vals["y"].full()[0])
+        np.testing.assert_allclose(
+            raw.lam_g[layout.g["c2"]], sol.dual_vals["lam_g_c2"].full()[0]
+        )
+        np.testing.assert_allclose(
+            raw.lam_g[layout.g["c1"]], sol.dual_vals["lam_h_c1"].full()[0]
+        )
+        raw2 = nlp.solve_raw(pars, raw.x, raw.lam_x, raw.lam_g, return_stats=True)
+        np.testing.assert_allclose(raw2.x, raw.x, atol=1e-7)
+        self.assertIn("iter_count", raw2.stats)
+
+    def test_init_telemetry__records_solves(self):
+        nlp = Nlp(sym_type=self.sym_type)
+        x = nlp.variable("x", (2, 1), lb=-1, ub=1)[0]
+        p = nlp.parameter("p")
+        nlp.minimize(cs.sumsqr(x - p))
+        nlp.init_solver(OPTS)
+        nlp.solve({"p": 0})
+        self.assertIsNone(nlp.telemetry)
+
+        telemetry = nlp.init_telemetry(capacity=8)
+        sol = nlp.solve({"p": 0.5})
+        nlp.solve_raw([2.0])
+
+        self.assertIs(nlp.telemetry, telemetry)
+        self.assertEqual(len(telemetry), 2)
+        self.assertListEqual(telemetry.statuses, [sol.status] * 2)
+        self.assertIn("t_wall_nlp_f", telemetry.metrics)
+        np.testing.assert_array_equal(
+            telemetry.values("iter_count")[0], sol.stats["iter_count"]
+        )
+        wall_time = telemetry.values("wall_time")
+        self.assertTrue((wall_time >= telemetry.values("solver_time")).all())
+        self.assertTrue((telemetry.values("overhead") >= 0).all())
+        self.assertIsNone(nlp.init_telemetry(None))
+
+    def test_init_solver__with_monitor__records_trace_and_stops_early(self):
+        nlp = Nlp(sym_type=self.sym_type)
+        x = nlp.variable("x", (2, 1), lb=-2)[0]
+        p = nlp.parameter("p")
+        nlp.constraint("c", cs.sumsqr(x), "<=", p)
+        nlp.minimize((1 - x[0]) ** 2 + 100 * (x[1] - x[0] ** 2) ** 2)
+        monitor = IterationMonitor(max_iter=5)
+        nlp.init_solver(OPTS, monitor=monitor)
+        self.assertNotIn("iteration_callback", nlp.solver_opts)
+
+        sol = nlp.solve({"p": 1.5})
+        self.assertTrue(sol.success)
+        self.assertEqual(monitor.n_iter, sol.stats["iter_count"] + 1)
+        self.assertFalse(monitor.stopped)
+        trace = monitor.trace
+        self.assertEqual(trace.shape, (5, len(COLUMNS)))
+        iterations = sol.stats["iterations"]
+        np.testing.assert_array_equal(trace[:, COLUMNS.index("iter")], range(5))
+        for column, name in (("f", "obj"), ("inf_du", "inf_du"), ("mu", "mu")):
+            np.testing.assert_allclose(
+                trace[:, COLUMNS.index(column)], iterations[name][:5]
+            )
+        self.assertTrue((np.diff(trace[:, COLUMNS.index("time")]) >= 0).all())
+
+        monitor.stop = lambda info: info.iter >= 3
+        raw = nlp.solve_raw([1.5])
+        self.assertFalse(raw.success)
+        self.assertTrue(monitor.stopped)
+        self.assertEqual(monitor.n_iter, 4)
+        monitor.stop = time_budget(0.0)
+        nlp.variable("y")  # rebuilds the solver, and rebinds the monitor
+        sol = nlp.solve({"p": 1.5})
+        self.assertEqual(sol.status, "User_Requested_Stop")
+        self.assertEqual(monitor.n_iter, 1)
+        copy = nlp.copy()
+        copy.solve({"p": 1.5})
+        self.assertIsNot(copy.unwrapped._solver_monitor, monitor)
+        self.assertEqual(copy.unwrapped._solver_monitor.n_iter, 1)
+        self.assertIsNone(pickle.loads(pickle.dumps(nlp)).unwrapped._solver)
+        with self.assertRaisesRegex(ValueError, "both iteration_callback and monitor"):
+            nlp.init_solver({"iteration_callback": None}, monitor=monitor)
+
+    def test_solve__with_deadline__applies_fallback_on_miss(self):
+        nlp = Nlp(sym_type=self.sym_type)
+        x = nlp.variable("x", (2, 1), lb=-2)[0]
+        p = nlp.parameter("p")
+        nlp.constraint("c", cs.sumsqr(x), "<=", p)
+        nlp.minimize((1 - x[0]) ** 2 + 100 * (x[1] - x[0] ** 2) ** 2)
+        nlp.init_solver(OPTS)
+        with self.assertRaisesRegex(ValueError, "Unknown deadline fallback"):
+            nlp.solve({"p": 1.5}, deadline=1.0, fallback="safe")
+
+        sol = nlp.solve({"p": 1.5}, deadline=10.0)
+        self.assertTrue(sol.success)
+        self.assertEqual(nlp.deadline_misses, 0)
+        late = nlp.solve({"p": 1.5}, deadline=1e-9)
+        self.assertEqual(late.status, "Maximum_WallTime_Exceeded")
+        self.assertIs(nlp.solve({"p": 1.5}, deadline=1e-9, fallback="previous"), sol)
+        fallback = Mock(return_value="safe")
+        out = nlp.solve({"p": 1.5}, deadline=1e-9, fallback=fallback)
+        self.assertEqual(out, "safe")
+        fallback.assert_called_once()
+        self.assertIs(fallback.call_args.args[1], sol)
+        self.assertEqual(nlp.deadline_misses, 3)
+        self.assertEqual(len(nlp.unwrapped._time_limited_solvers), 2)
+        self.assertIsNone(nlp.solver_opts["ipopt"].get("max_wall_time"))
+
+        nlp.init_solver({"print_time": False}, solver="sqpmethod")
+        with self.assertRaisesRegex(ValueError, "not supported for solver 'sqpmethod'"):
+            nlp.solve({"p": 1.5}, deadline=1.0)
+
+    def test_solve__with_deadline__reuses_bounded_pooled_variants(self):
+        nlp = Nlp(sym_type=self.sym_type)
+        x = nlp.variable("x", (2, 1), lb=-1, ub=1)[0]
+        p = nlp.parameter("p")
+        nlp.minimize(cs.sumsqr(x - p))
+        nlp.init_solver(OPTS)
+        variants = nlp.unwrapped._time_limited_solvers
+
+        for deadline in (0.0498, 0.0501, 0.05, 0.0502, 0.0499):
+            self.assertTrue(nlp.solve({"p": 0.5}, deadline=deadline).success)
+        self.assertLessEqual(len(variants), 2)
+        for deadline in np.geomspace(1.0, 1e4, 30):
+            nlp.solve({"p": 0.5}, deadline=deadline)
+        self.assertEqual(len(variants), variants.maxsize)
+
+        pool = nlp.init_solver_pool(3)
+        variants = nlp.unwrapped._time_limited_solvers
+        self.assertEqual(len(variants), 0)
+        with ThreadPoolExecutor(3) as executor:
+            sols = list(
+                executor.map(
+                    lambda p_: nlp.solve({"p": p_}, deadline=10.0), (-0.5, 0.0, 0.5)
+                )
+            )
+        for sol, p_ in zip(sols, (-0.5, 0.0, 0.5)):
+            np.testing.assert_allclose(sol.vals["x"], p_, atol=1e-6)
+        self.assertEqual(len(variants), 1)
+        variant = variants.get(_round_deadline(10.0), None)
+        self.assertEqual(variant.size, pool.size)
+        self.assertEqual(variant.available, pool.size)
+
+    def test_solve__with_deadline__sweep_builds_bounded_number_of_solvers(self):
+        nlp = Nlp(sym_type=self.sym_type)
+        x = nlp.variable("x", (2, 1), lb=-1, ub=1)[0]
+        p = nlp.parameter("p")
+        nlp.minimize(cs.sumsqr(x - p))
+        nlp.init_solver(OPTS)
+        deadlines = np.geomspace(0.1, 99.0, 50)
+        with patch.object(nlp, "_build_solver", wraps=nlp._build_solver) as build:
+            for _ in range(3):
+                for deadline in deadlines:
+                    nlp.solve({"p": 0.5}, deadline=deadline)
+        n_grid_values = len({_round_deadline(d) for d in deadlines})
+        self.assertLessEqual(n_grid_values, nlp._time_limited_solvers.maxsize)
+        self.assertEqual(build.call_count, n_grid_values)
+
+    def test_solve_async__applies_back_pressure_and_timeout(self):
+        nlp = Nlp(sym_type=self.sym_type)
+        x = nlp.variable("x", (2, 1), lb=-1, ub=1)[0]
+        p = nlp.parameter("p")
+        nlp.minimize(cs.sumsqr(x - p))
+        nlp.init_solver(OPTS)
+        peaks = []
+        nlp.add_solve_hook(lambda *_: peaks.append(nlp.solves_in_flight))
+        with self.assertRaisesRegex(ValueError, "must be positive"):
+            nlp.init_async(max_in_flight=0)
+
+        async def serve():
+            pars = ({"p": p_} for p_ in (0.1, 0.2, 0.3))
+            return await asyncio.gather(*(nlp.solve_async(p_) for p_ in pars))
+
+        async def timeout():
+            slow = lambda stage, *_: stage == "before_solver" and time.sleep(0.2)
+            nlp.add_solve_hook(slow)
+            with self.assertRaises(asyncio.TimeoutError):
+                await nlp.solve_async({"p": 0}, timeout=0.01)
+            self.assertEqual(nlp.solves_in_flight, 1)  # still running in the executor
+            await asyncio.sleep(0.3)
+            nlp.remove_solve_hook(slow)
+
+        with ThreadPoolExecutor(2) as executor:
+            nlp.init_async(executor, max_in_flight=1)
+            sols = asyncio.run(serve())
+            for copy in (nlp.copy(), pickle.loads(pickle.dumps(nlp))):
+                self.assertEqual(copy.solves_in_flight, 0)
+            asyncio.run(timeout())
+        for p_, sol in zip((0.1, 0.2, 0.3), sols):
+            np.testing.assert_allclose(sol.vals["x"], p_)
+        self.assertSetEqual(set(peaks), {1})
+        self.assertEqual(nlp.solves_in_flight, 0)
+
+    def test_init_solver_pool__serves_concurrent_solves(self):
+        nlp = Nlp(sym_type=self.sym_type)
+        x = nlp.variable("x", (2, 1), lb=-1, ub=1)[0]
+        p = nlp.parameter("p")
+        nlp.constraint("c", x[0] + x[1], ">=", p)
+        nlp.minimize(cs.sumsqr(x - p) + cs.exp(x[0] * x[1]))
+        with self.assertRaisesRegex(RuntimeError, "Solver uninitialized"):
+            nlp.init_solver_pool(2)
+        nlp.init_solver(OPTS)
+        expected = [nlp.solve({"p": p_}) for p_ in np.linspace(-1, 1, 8)]
+
+        pool = nlp.init_solver_pool(3)
+        self.assertIs(nlp.solver_pool, pool)
+        funcs = {id(solver.func) for solver in pool._solvers}
+        self.assertEqual(len(funcs), 3)
+        with ThreadPoolExecutor(4) as executor:
+            sols = list(executor.map(nlp.solve, ({"p": s.p} for s in expected)))
+            raws = list(executor.map(nlp.solve_raw, (s.p for s in expected)))
+        for sol, raw, sol_ in zip(sols, raws, expected):
+            np.testing.assert_allclose(sol.x, sol_.x, atol=1e-7)
+            np.testing.assert_allclose(raw.x, sol_.x.full().flatten(), atol=1e-7)
+            self.assertEqual(sol.stats["iter_count"], sol_.stats["iter_count"])
+        self.assertEqual(pool.available, 3)
+
+        nlp.init_solver(OPTS)  # the pool is rebuilt with the new solver
+        self.assertIsNot(nlp.solver_pool, pool)
+        self.assertIs(nlp.solver_pool._solvers[0], nlp.unwrapped._solver)
+        self.assertEqual(pickle.loads(pickle.dumps(nlp)).solver_pool.available, 3)
+        with self.assertRaisesRegex(ValueError, "not supported with pools"):
+            nlp.init_solver(OPTS, monitor=IterationMonitor())
+        self.assertIsNone(nlp.init_solver_pool(None))
+
+    @parameterized.expand([("serial",), ("thread",), ("process",), ("map",)])
+    def test_solve_batch__solves_independent_instances(self, executor: str):
+        nlp = Nlp(sym_type=self.sym_type)
+        x = nlp.variable("x", (2, 1), lb=-1, ub=1)[0]
+        p = nlp.parameter("p")
+        nlp.constraint("c", x[0] + x[1], ">=", p)
+        nlp.minimize(cs.sumsqr(x - p) + cs.exp(x[0] * x[1]))
+        nlp.init_solver(OPTS)
+        pars = [{"p": p_} for p_ in np.linspace(-1, 1, 5)]
+        expected = [nlp.solve(pars_, {"x": 0.5}) for pars_ in pars]
+
+        sols = dict(nlp.solve_batch(pars, {"x": 0.5}, executor, max_workers=2))
+        self.assertListEqual(sorted(sols), list(range(5)))
+        for i, sol_ in enumerate(expected):
+            np.testing.assert_allclose(sols[i].x, sol_.x, atol=1e-7)
+            np.testing.assert_allclose(sols[i].p, sol_.p)
+            np.testing.assert_allclose(sols[i].f, sol_.f, atol=1e-7)
+            np.testing.assert_allclose(sols[i].lam_g_and_h, sol_.lam_g_and_h, atol=1e-7)
+            np.testing.assert_allclose(
+                sols[i].lam_lbx_and_ubx, sol_.lam_lbx_and_ubx, atol=1e-7
+            )
+            self.assertTrue(sols[i].success)
+            if executor != "map":  # mapped solvers do not report per-instance stats
+                self.assertEqual(sols[i].stats["iter_count"], sol_.stats["iter_count"])
+            else:
+                self.assertEqual(sols[i].status, "Mapped_Feasible")
+
+    def test_solve_batch__in_map_mode__flags_infeasible_instances(self):
+        nlp = Nlp(sym_type=self.sym_type)
+        x = nlp.variable("x", (2, 1), lb=-1, ub=1)[0]
+        p = nlp.parameter("p")
+        nlp.constraint("c", x[0] + x[1], ">=", p)
+        nlp.minimize(cs.sumsqr(x))
+        nlp.init_solver(OPTS)
+        pars = [{"p": 1.0}, {"p": 3.0}]
+        sols = dict(nlp.solve_batch(pars, executor="map", max_workers=2))
+        self.assertTrue(sols[0].success)
+        self.assertFalse(sols[1].success)
+        self.assertEqual(sols[1].status, "Mapped_Infeasible_Or_Nonfinite")
+
+    def test_solve_batch__reuses_pools_until_solver_changes(self):
+        nlp = Nlp(sym_type=self.sym_type)
+        x = nlp.variable("x")[0]
+        p = nlp.parameter("p")
+        nlp.minimize((x - p) ** 2)
+        nlp.init_solver(OPTS)
+        pars = [{"p": p_} for p_ in range(4)]
+
+        dict(nlp.solve_batch(pars, executor="thread", max_workers=2))
+        thread_pool = nlp._batch_thread_pool
+        with thread_pool.checkout() as solver1, thread_pool.checkout() as solver2:
+            self.assertIsNot(solver1, nlp._solver)
+            self.assertIsNot(solver2, nlp._solver)
+        dict(nlp.solve_batch(pars, executor="thread", max_workers=2))
+        self.assertIs(nlp._batch_thread_pool, thread_pool)
+
+        try:
+            process_pools = []
+            for _ in range(2):
+                sols = dict(nlp.solve_batch(pars, executor="process", max_workers=2))
+                process_pools.append(nlp._batch_process_pool)
+                for i, sol in sols.items():
+                    self.assertAlmostEqual(sol.vals["x"], i, places=6)
+            self.assertIs(process_pools[0], process_pools[1])
+            self.assertIsNone(nlp.copy()._batch_process_pool)
+            nlp.init_solver(OPTS)
+            self.assertIsNone(nlp._batch_thread_pool)
+            self.assertIsNone(nlp._batch_process_pool)
+        finally:
+            nlp.shutdown_batch_pool()
+
+    def test_solve_batch__with_persistent_process_pool(self):
+        nlp = Nlp(sym_type=self.sym_type)
+        x = nlp.variable("x")[0]
+        p = nlp.parameter("p")
+        nlp.minimize((x - p) ** 2)
+        nlp.init_solver(OPTS)
+        with self.assertRaisesRegex(ValueError, "Unknown batch executor"):
+            nlp.solve_batch([], executor="gpu")
+
+        with SolverProcessPool(nlp, max_workers=2) as pool:
+            for _ in range(2):
+                sols = nlp.solve_batch(({"p": p_} for p_ in range(4)), executor=pool)
+                for i, sol in sols:
+                    self.assertAlmostEqual(sol.vals["x"], i, places=6)
+            nlp.init_solver(OPTS)
+            with self.assertRaisesRegex(ValueError, "for a different solver"):
+                nlp.solve_batch([{"p": 0}], executor=pool)
+
+    def test_init_solver__reloads_solver_from_disk_cache(self):
+        def build():
+            nlp = Nlp(sym_type=self.sym_type, name="cached")
+            x = nlp.variable("x", (2, 1), lb=-1, ub=1)[0]
+            p = nlp.parameter("p", (2, 1))
+            nlp.constraint("c", x[0] + x[1], ">=", 0.5)
+            nlp.minimize(cs.sumsqr(x - p))
+            return nlp
+
+        pars = {"p": [3.0, -3.0]}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            nlp1 = build()
+            nlp1.init_solver(OPTS, cache_dir=tmpdir)
+            self.assertEqual(len(os.listdir(tmpdir)), 1)
+            nlp2 = build()
+            with patch("casadi.nlpsol", wraps=cs.nlpsol, __name__="nlpsol") as nlpsol:
+                nlp2.init_solver(OPTS, cache_dir=tmpdir)
+                nlpsol.assert_not_called()
+                nlp2.minimize(cs.sumsqr(nlp2.x))  # changes the structure
+                nlpsol.assert_called_once()
+            self.assertEqual(len(os.listdir(tmpdir)), 2)
+            nlp3 = build()
+            nlp3.init_solver(OPTS, cache_dir=tmpdir)
+            sol1 = nlp1.solve(pars)
+            sol3 = nlp3.solve(pars)
+        self.assertTrue(sol3.success)
+        np.testing.assert_allclose(sol1.x, sol3.x)
+        np.testing.assert_allclose(sol1.f, sol3.f)
+
+    def test_init_solver__unnamed_nlps__share_disk_cache_entry(self):
+        def build():
+            nlp = Nlp(sym_type=self.sym_type)
+            x = nlp.variable("x", (2, 1), lb=-1, ub=1)[0]
+            nlp.minimize(cs.sumsqr(x - 0.5))
+            return nlp
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            nlp1 = build()
+            nlp1.init_solver(OPTS, cache_dir=tmpdir)
+            nlp2 = build()
+            self.assertNotEqual(nlp1.name, nlp2.name)
+            with patch("casadi.nlpsol", wraps=cs.nlpsol, __name__="nlpsol") as nlpsol:
+                nlp2.init_solver(OPTS, cache_dir=tmpdir)
+                nlpsol.assert_not_called()
+            self.assertEqual(len(os.listdir(tmpdir)), 1)
+            np.testing.assert_allclose(nlp2.solve().vals["x"], 0.5, atol=1e-6)
+
+    @unittest.skipIf(shutil.which(os.environ.get("CC", "cc")) is None, "no compiler")
+    def test_init_solver__with_codegen__matches_symbolic_solver(self):
+        def build():
+            nlp = Nlp(sym_type=self.sym_type, name="compiled")
+            x = nlp.variable("x", (2, 1), lb=-1, ub=1)[0]
+            p = nlp.parameter("p", (2, 1))
+            nlp.constraint("c", x[0] * x[1], ">=", 0.1)
+            nlp.minimize(cs.sumsqr(x - p) + cs.sin(x[0]))
+            return nlp
+
+        pars = {"p": [0.5, -0.5]}
+        nlp = build()
+        nlp.init_solver(OPTS)
+        expected = nlp.solve(pars)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            nlp = build()
+            nlp.init_solver(OPTS, cache_dir=tmpdir, codegen=True)
+            libraries = [f for f in os.listdir(tmpdir) if not f.endswith(".casadi")]
+            self.assertEqual(len(libraries), 1)
+            sol = nlp.solve(pars)
+            nlp2 = build()
+            with patch("casadi.nlpsol", wraps=cs.nlpsol, __name__="nlpsol") as nlpsol:
+                nlp2.init_solver(OPTS, cache_dir=tmpdir, codegen=True)
+                # only the loading from the compiled library takes place
+                nlpsol.assert_called_once()
+                self.assertIsInstance(nlpsol.call_args.args[2], str)
+            sol2 = nlp2.solve(pars)
+        for s in (sol, sol2):
+            self.assertTrue(s.success)
+            np.testing.assert_allclose(s.x, expected.x, atol=1e-7)
+            np.testing.assert_allclose(s.f, expected.f, atol=1e-7)
+
+        nlp = build()
+        with self.assertRaisesRegex(ValueError, "only supported for NLP solvers"):
+            nlp.init_solver(solver="qrqp", codegen=True)
+        with patch("csnlp.core.solver_cache.fingerprint", return_value=None), patch(
+            "casadi.nlpsol", wraps=cs.nlpsol, __name__="nlpsol"
+        ) as nlpsol:
+            with self.assertWarnsRegex(RuntimeWarning, "code generation is skipped"):
+                nlp.init_solver(OPTS, codegen=True)
+            nlpsol.assert_called_once()
+            self.assertIsInstance(nlpsol.call_args.args[2], dict)
+
+    def test_solve_raw__raises__with_free_parameters(self):
+        nlp = Nlp(sym_type=self.sym_type)
+        x = nlp.variable("x")[0]
+        p = nlp.parameter("p")
+        nlp.minimize(p * (x**2))
+        nlp.init_solver(OPTS)
+        with self.assertRaisesRegex(RuntimeError, "unspecified parameters"):
+            nlp.solve_raw()
+
+    def test_solve__warm_starts__from_solution_and_dual_values(self):
+        nlp = Nlp(sym_type=self.sym_type)
+        x = nlp.variable("x", (4, 1), lb=[[-1], [-np.inf], [-1], [-1]], ub=1)[0]
+        p = nlp.parameter("p", (4, 1))
+        nlp.constraint("c1", cs.sum1(x**2), "<=", 2)
+        nlp.constraint("c2", x[0] + x[1], "==", 0.3)
+        nlp.constraint("c3", cs.reshape(x, 2, 2), "<=", 0.9)
+        nlp.minimize(cs.sumsqr(x - p) + cs.sum1(cs.exp(x)))
+        opts = {
+            "expand": True,
+            "print_time": False,
+            "ipopt": {
+                "sb": "yes",
+                "print_level": 0,
+                "warm_start_init_point": "yes",
+                "mu_init": 1e-6,
+                "warm_start_bound_push": 1e-9,
+                "warm_start_mult_bound_push": 1e-9,
+            },
+        }
+        nlp.init_solver(opts)
+        pars = {"p": [-3, -1, 1, 3]}
+        sol = nlp.solve(pars)
+        sol_ws = nlp.solve(pars, warm_start=sol)
+        self.assertLess(sol_ws.stats["iter_count"], sol.stats["iter_count"])
+        np.testing.assert_allclose(sol_ws.f, sol.f)
+
+        kwargs_sol = nlp._process_pars_and_vals0({}, pars, None, sol)
+        kwargs_dict = nlp._process_pars_and_vals0({}, pars, None, sol.dual_vals)
+        np.testing.assert_allclose(kwargs_sol["lam_x0"], kwargs_dict["lam_x0"])
+        np.testing.assert_allclose(kwargs_sol["lam_g0"], kwargs_dict["lam_g0"])
+        raw = nlp.solve_raw(np.asarray(pars["p"], float))
+        np.testing.assert_allclose(kwargs_sol["lam_x0"], raw.lam_x, atol=1e-6)
+        np.testing.assert_allclose(kwargs_sol["lam_g0"], raw.lam_g)
+
+        nlp.variable("y")
+        with self.assertRaisesRegex(ValueError, "does not match the structure"):
+            nlp.solve(pars, warm_start=sol)
+
+    def test_solve__auto_warm_starts__from_last_successful_solution(self):
+        nlp = Nlp(sym_type=self.sym_type, auto_warm_start=True)
+        x = nlp.variable("x", (3, 1), lb=-1, ub=1)[0]
+        nlp.constraint("c", cs.sum1(x), "==", 0.5)
+        nlp.minimize(cs.sumsqr(x - 2) + cs.sum1(cs.exp(x)))
+        nlp.init_solver(OPTS)
+        self.assertTrue(nlp.auto_warm_start)
+        sol1 = nlp.solve()
+        self.assertIs(nlp._last_solution, sol1)
+        kwargs = nlp._process_pars_and_vals0({}, None, None, nlp._last_solution)
+        self.assertIn("lam_g0", kwargs)
+        nlp.init_solver(OPTS)
+        self.assertIsNone(nlp._last_solution)
+
+    def test_solve__auto_warm_start__skips_solution_of_a_different_structure(self):
+        nlp = Nlp(sym_type=self.sym_type, auto_warm_start=True)
+        x = nlp.variable("x", (2, 1), lb=-1, ub=1)[0]
+        nlp.minimize(cs.sumsqr(x - 2))
+        nlp.init_solver(OPTS)
+        sol1 = nlp.solve()
+        self.assertIs(nlp._last_solution, sol1)
+        nlp.remove_variable_bounds("x", "ub", [(1, 0)])
+        sol2 = nlp.solve()
+        self.assertTrue(sol2.success)
+        np.testing.assert_allclose(sol2.vals["x"], [[1], [2]], atol=1e-6)
+
     def test_solve__computes_correctly__example_0(self):
         nlp = Nlp(sym_type=self.sym_type)
         x = nlp.variable("x", (2, 1))[0]
@@ -646,6 +1221,40 @@ class TestNlp(unittest.TestCase):
 
         self.assertEqual(nlp.name, nlp2.name)
 
+    def test_static_solver_args__are_cached_readonly_and_invalidated(self):
+        nlp = Nlp(sym_type=self.sym_type)
+        x = nlp.variable("x", (2, 1), lb=[[-1], [-np.inf]], ub=1)[0]
+        nlp.constraint("c1", x[0] + x[1], "==", 1)
+        args = nlp._static_solver_args
+        self.assertIs(args, nlp._static_solver_args)
+        for arr in args.values():
+            self.assertFalse(arr.flags.writeable)
+            self.assertTrue(arr.flags.c_contiguous)
+        np.testing.assert_array_equal(args["lbx"], [-1, -np.inf])
+        np.testing.assert_array_equal(args["lbg"], [0])
+
+        nlp.constraint("c2", x[0], "<=", 0.5)
+        args2 = nlp._static_solver_args
+        self.assertIsNot(args, args2)
+        np.testing.assert_array_equal(args2["lbg"], [0, -np.inf])
+        np.testing.assert_array_equal(args2["ubg"], [0, 0])
+        nlp.remove_variable_bounds("x", "ub", (1, 0))
+        np.testing.assert_array_equal(nlp._static_solver_args["ubx"], [1, np.inf])
+
+    def test_remove_variable_bounds__keeps_other_direction_untouched(self):
+        nlp = Nlp(sym_type=self.sym_type)
+        nlp.variable("u", (2, 1), lb=-1, ub=1)
+        nlp.variable("x", (3, 2), lb=-1, ub=1)
+        nlp.remove_variable_bounds("x", "lb", [(0, 0), (2, 1)])
+        self.assertEqual(nlp.lam_lbx.shape, (6, 1))
+        self.assertEqual(nlp.h_lbx.shape, nlp.lam_lbx.shape)
+        self.assertEqual(nlp.lam_ubx.shape, (8, 1))
+        self.assertEqual(nlp.h_ubx.shape, nlp.lam_ubx.shape)
+        np.testing.assert_array_equal(np.ma.getmaskarray(nlp.ubx), False)
+        np.testing.assert_array_equal(
+            np.flatnonzero(np.ma.getmaskarray(nlp.lbx)), [2, 7]
+        )
+
     @parameterized.expand(product(("both", "lb", "ub"), (True, False)))
     def test_remove_variable_bounds__remove_bounds_correctly(
         self, direction: str, all_idx: bool
@@ -13,7 +13,7 @@ from parameterized import parameterized
 from scipy.stats import norm
 
 from csnlp import Nlp
-from csnlp.core.solutions import subsevalf
+from csnlp.core.solutions import CompactSolution, subsevalf
 from csnlp.util import io, math
 
 TMPFILENAME: str = ""
@@ -77,6 +77,37 @@ class TestIo(unittest.TestCase):
         self.assertIsNot(data2, dict)
         self.assertEqual(data["x"], data2)
 
+    def test_solution_archive__appends_and_loads_memory_mapped_columns(self):
+        nlp = Nlp()
+        x = nlp.variable("x", (2, 1), lb=0)[0]
+        p = nlp.parameter("p")
+        nlp.constraint("c", x[0] - x[1], "<=", p)
+        nlp.minimize(cs.sumsqr(x - p))
+        nlp.init_solver({"print_time": False, "ipopt": {"print_level": 0}})
+        sols = [
+            CompactSolution.from_solution(nlp.solve({"p": p_}), nlp)
+            for p_ in np.linspace(-1, 1, 8)
+        ]
+
+        with tempfile.TemporaryDirectory() as directory:
+            with io.SolutionArchive(directory, chunk_size=3) as archive:
+                for sol in sols[:5]:
+                    archive.append(sol)
+                self.assertEqual(len(archive), 5)
+            with io.SolutionArchive(directory, chunk_size=2) as archive:
+                for sol in sols[5:]:
+                    archive.append(sol)
+            data = io.load(directory)
+
+            self.assertIsInstance(data["x"], np.memmap)
+            for name in ("x", "lam_g", "lam_x", "p", "f", "success", "iter_count"):
+                expected = np.asarray([getattr(sol, name) for sol in sols])
+                np.testing.assert_array_equal(data[name], expected)
+            statuses = [data["status_names"][i] for i in data["status"]]
+            self.assertListEqual(statuses, [sol.status for sol in sols])
+            self.assertEqual(data["layout"].x.shapes, {"x": (2, 1)})
+            del data
+
     def tearDown(self) -> None:
         try:
             os.remove(TMPFILENAME)
@@ -84,6 +84,49 @@ class TestWrapper(unittest.TestCase):
         self.assertEqual(str(wrapped), str(wrapped_copied))
         self.assertEqual(repr(wrapped), repr(wrapped_copied))
 
+    def test_solve_hooks__fire_in_order_across_wrapper_chain(self):
+        nlp = Nlp(name="hooked")
+        scaler = scaling.Scaler({"x": (0, 2)})
+        scaled = NlpScaling[cs.SX](nlp, scaler=scaler, warns=False)
+        wrapped = Wrapper[cs.SX](scaled)
+        x = scaled.variable("x", lb=-1, ub=1)[0]
+        p = scaled.parameter("p")
+        scaled.minimize((x - p) ** 2)
+        scaled.init_solver(OPTS)
+        events = []
+
+        def hook(stage: str, name: str, timestamp: float) -> None:
+            events.append((stage, name, timestamp))
+
+        for layer in (nlp, scaled, wrapped):
+            layer.add_solve_hook(hook)
+        wrapped.solve({"p": 0.5})
+
+        # the plain wrapper has no inputs to process, and no wrapper builds solutions
+        expected = [
+            ("before_solver", "Wrapper:hooked"),
+            ("before_pack", "NlpScaling:hooked"),
+            ("before_solver", "NlpScaling:hooked"),
+            ("before_pack", "hooked"),
+            ("before_solver", "hooked"),
+            ("after_solver", "hooked"),
+            ("after_solution", "hooked"),
+            ("after_solver", "NlpScaling:hooked"),
+            ("after_solver", "Wrapper:hooked"),
+        ]
+        self.assertListEqual([e[:2] for e in events], expected)
+        timestamps = [e[2] for e in events]
+        self.assertListEqual(timestamps, sorted(timestamps))
+
+        for layer in (nlp, scaled, wrapped):
+            layer.remove_solve_hook(hook)
+            self.assertTupleEqual(layer.solve_hooks, ())
+        events.clear()
+        wrapped.solve({"p": 0.5})
+        self.assertListEqual(events, [])
+        with self.assertRaises(ValueError):
+            nlp.remove_solve_hook(hook)
+
 
 class TestNonRetroactiveWrapper(unittest.TestCase):
     def test_init__raises__with_variable_already_defined(self):
@@ -10,8 +10,14 @@ import numpy as np
 from parameterized import parameterized
 
 from csnlp import Nlp
-from csnlp.core.solutions import subsevalf
-from csnlp.wrappers import Mpc, PwaMpc, PwaRegion
+from csnlp.core.solutions import CompactSolution, EagerSolution, subsevalf
+from csnlp.wrappers import (
+    Mpc,
+    PwaMpc,
+    PwaRegion,
+    simulate_closed_loop,
+    simulate_closed_loop_ensemble,
+)
 from csnlp.wrappers import ScenarioBasedMpc as SCMPC
 from csnlp.wrappers.mpc.scenario_based_mpc import _n
 
@@ -339,6 +345,329 @@ class TestMpc(unittest.TestCase):
         self.assertIn("x", mpc.states.keys())
         self.assertEqual(mpc.states["x"].shape, (ns, N + 1))
 
+    @parameterized.expand(product(("single", "multi"), (1, 2)))
+    def test_shift__shifts_primal_and_dual_variables(
+        self, shooting: str, input_spacing: int
+    ):
+        N, Nc = 6, 5
+        A = np.asarray([[1.0, 0.1], [0.0, 1.0]])
+        B = np.asarray([[0.0], [0.1]])
+        mpc = Mpc(Nlp(), N, Nc, input_spacing, shooting)
+        mpc.state("x", 2)
+        u, _ = mpc.action("u", 1, lb=-1, ub=1)
+        mpc.set_affine_dynamics(A, B)
+        x = mpc.states["x"]
+        _, _, slack = mpc.constraint("x_ub", x[0, :], "<=", 0.5, soft=True)
+        mpc.minimize(cs.sumsqr(x) + cs.sumsqr(u) + 1e2 * cs.sum2(slack))
+        mpc.init_solver(OPTS)
+        sol = mpc.solve({"x_0": [1.0, 1.0]})
+        self.assertTrue(sol.success)
+
+        vals0, duals0 = mpc.shift(sol)
+
+        self.assertEqual(vals0.keys(), mpc.variables.keys())
+        self.assertEqual(duals0.keys(), mpc.dual_variables.keys())
+        for n, lam in mpc.dual_variables.items():
+            self.assertEqual(duals0[n].size, lam.numel(), n)
+        u_opt = sol.vals["u"].full()
+        idx = [
+            min(j * input_spacing + 1, Nc - 1) // input_spacing
+            for j in range(ceil(Nc / input_spacing))
+        ]
+        np.testing.assert_array_equal(vals0["u"], u_opt[:, idx])
+        slack_opt = sol.vals["slack_x_ub"].full()
+        tail = slack_opt[:, -1:]
+        np.testing.assert_array_equal(
+            vals0["slack_x_ub"], np.hstack((slack_opt[:, 1:], tail))
+        )
+        lam_h = sol.dual_vals["lam_h_x_ub"].full().flatten()
+        np.testing.assert_array_equal(
+            duals0["lam_h_x_ub"], np.append(lam_h[1:], lam_h[-1])
+        )
+        if shooting == "multi":
+            x_opt = sol.vals["x"].full()
+            np.testing.assert_array_equal(
+                vals0["x"], np.hstack((x_opt[:, 1:], x_opt[:, -1:]))
+            )
+            lam_dyn = sol.dual_vals["lam_g_dyn"].full().reshape(2, N, order="F")
+            np.testing.assert_array_equal(
+                duals0["lam_g_dyn"].reshape(2, N, order="F"),
+                np.hstack((lam_dyn[:, 1:], lam_dyn[:, -1:])),
+            )
+            np.testing.assert_array_equal(
+                duals0["lam_g_x_0"], sol.dual_vals["lam_g_x_0"].full().flatten()
+            )
+
+        # the shifted guesses can be fed back to the next solve
+        x_next = A @ [1.0, 1.0] + B @ u_opt[:, 0]
+        sol2 = mpc.solve({"x_0": x_next}, vals0, duals0)
+        self.assertTrue(sol2.success)
+
+    def test_shift__handles_masked_bounds_and_scenarios(self):
+        N, K = 4, 3
+        scmpc = SCMPC(Nlp(), K, N, shooting="multi")
+        x, _, _ = scmpc.state("x", 1, lb=-2, ub=2, bound_initial=False)
+        u, _ = scmpc.action("u", 1, lb=-1, ub=1)
+        d, _ = scmpc.disturbance("d", 1)
+        scmpc.set_nonlinear_dynamics(lambda x, u, d: 0.9 * x + u + d)
+        scmpc.minimize_from_single(cs.sumsqr(x) + cs.sumsqr(u))
+        scmpc.init_solver(OPTS)
+        pars = {"x_0": 1.5}
+        pars.update({_n("d", i): np.full((1, N), 0.1 * i) for i in range(K)})
+        sol = scmpc.solve(pars)
+
+        vals0, duals0 = scmpc.shift(sol)
+
+        for i in range(K):
+            name = _n("x", i)
+            x_opt = sol.vals[name].full()
+            np.testing.assert_array_equal(
+                vals0[name], np.hstack((x_opt[:, 1:], x_opt[:, -1:]))
+            )
+            # the initial state is unbounded, so its multiplier is dropped when shifting
+            lam_lb = sol.dual_vals[f"lam_lb_{name}"].full().flatten()
+            self.assertEqual(lam_lb.size, N)
+            np.testing.assert_array_equal(
+                duals0[f"lam_lb_{name}"], np.append(lam_lb[1:], lam_lb[-1])
+            )
+
+    def test_solve__with_deadline__falls_back_to_shifted_previous_solution(self):
+        N = 5
+        mpc = Mpc(Nlp(), N)
+        mpc.state("x", 2)
+        u, _ = mpc.action("u", 1, lb=-1, ub=1)
+        A = np.asarray([[1.0, 0.1], [0.0, 1.0]])
+        B = np.asarray([[0.0], [0.1]])
+        mpc.set_affine_dynamics(A, B)
+        x = mpc.states["x"]
+        mpc.constraint("x_lb", x[0, :], ">=", -0.5)
+        mpc.minimize(cs.sumsqr(x) + cs.sumsqr(u))
+        mpc.init_solver(OPTS)
+        sol = mpc.solve({"x_0": [1.0, 0.0]}, deadline=10.0)
+        self.assertTrue(sol.success)
+
+        out = mpc.solve({"x_0": [0.9, -0.1]}, deadline=1e-9, fallback="previous")
+
+        self.assertIsNot(out, sol)
+        self.assertEqual(mpc.deadline_misses, 1)
+        vals0, duals0 = mpc.shift(sol)
+        for name, val in vals0.items():
+            np.testing.assert_allclose(out.vals[name], val)
+        for name, val in duals0.items():
+            np.testing.assert_allclose(
+                np.asarray(out.dual_vals[name]).reshape(-1), val.reshape(-1)
+            )
+        np.testing.assert_allclose(np.asarray(out.p).reshape(-1), [0.9, -0.1])
+        self.assertTrue(out.success)
+
+        # the same holds for a previous solution that is not lazy
+        current = mpc.solve({"x_0": [0.9, -0.1]})
+        fallback = mpc._deadline_fallback("previous")
+        compact = CompactSolution.from_solution(sol, mpc)
+        eager = EagerSolution.from_casadi_solution(
+            {
+                "x": cs.DM(compact.x),
+                "lam_g": cs.DM(compact.lam_g),
+                "lam_x": cs.DM(compact.lam_x),
+                "f": compact.f,
+                "p": cs.DM(compact.p),
+                "stats": sol.stats.copy(),
+            },
+            mpc.nlp,
+        )
+        for previous in (compact, eager):
+            out_ = fallback(current, previous)
+            np.testing.assert_allclose(out_.x, out.x)
+            np.testing.assert_allclose(out_.lam_g_and_h, out.lam_g_and_h)
+            np.testing.assert_allclose(out_.lam_lbx_and_ubx, out.lam_lbx_and_ubx)
+            self.assertTrue(out_.success)
+
+    @parameterized.expand([(False,), (True,)])
+    def test_simulate_closed_loop__fills_preallocated_trajectories(
+        self, use_function: bool
+    ):
+        N, T = 5, 8
+        A = np.asarray([[1.0, 0.1], [0.0, 1.0]])
+        B = np.asarray([[0.0], [0.1]])
+        mpc = Mpc(Nlp(), N)
+        mpc.state("x", 2)
+        u, _ = mpc.action("u", 1, lb=-1, ub=1)
+        r = mpc.parameter("r", (1, 1))
+        mpc.set_affine_dynamics(A, B)
+        x = mpc.states["x"]
+        mpc.minimize(cs.sumsqr(x[0, :] - r) + cs.sumsqr(u))
+        mpc.init_solver(OPTS)
+        if use_function:
+            x_, u_ = cs.SX.sym("x", 2), cs.SX.sym("u", 1)
+            plant = cs.Function("F", [x_, u_], [A @ x_ + B @ u_])
+        else:
+            plant = lambda x, u: A @ x + B @ u  # noqa: E731
+        references = np.linspace(0, 1, T)
+
+        res = simulate_closed_loop(
+            mpc, plant, [1.0, 0.0], T, forecasts=lambda k: {"r": references[k]}
+        )
+
+        self.assertEqual(res.states.shape, (T + 1, 2))
+        self.assertEqual(res.actions.shape, (T, 1))
+        self.assertEqual(res.costs.shape, (T,))
+        self.assertEqual(res.n_steps, T)
+        self.assertFalse(res.aborted)
+        self.assertTrue(res.success.all())
+        self.assertTrue((res.solve_times > 0).all())
+        np.testing.assert_allclose(
+            res.states[1:], res.states[:-1] @ A.T + res.actions @ B.T
+        )
+        # the first step must match a standalone solve from the initial state
+        sol = mpc.solve({"x_0": [1.0, 0.0], "r": references[0]})
+        np.testing.assert_allclose(res.actions[0], sol.vals["u"][:, 0].full().flatten())
+        np.testing.assert_allclose(res.costs[0], float(sol.f))
+
+    def test_simulate_closed_loop__aborts_after_consecutive_failures(self):
+        N, T = 3, 10
+        mpc = Mpc(Nlp(), N)
+        mpc.state("x", 1)
+        u, _ = mpc.action("u", 1, lb=-1, ub=1)
+        mpc.set_affine_dynamics(np.ones((1, 1)), np.ones((1, 1)))
+        x = mpc.states["x"]
+        mpc.constraint("x_ub", x, "<=", 2)  # infeasible from x0 = 5
+        mpc.minimize(cs.sumsqr(x) + cs.sumsqr(u))
+        mpc.init_solver(OPTS)
+        plant = lambda x, u: x + u  # noqa: E731
+
+        res = simulate_closed_loop(mpc, plant, 5.0, T, max_consecutive_failures=2)
+
+        self.assertTrue(res.aborted)
+        self.assertEqual(res.n_steps, 2)
+        self.assertFalse(res.success[:2].any())
+        self.assertTrue(np.isnan(res.states[3:]).all())
+        self.assertTrue(np.isnan(res.actions[2:]).all())
+        self.assertTrue(all(s is None for s in res.status[2:]))
+        self.assertTrue(res.failed_action_applied[:2].all())
+        with self.assertRaisesRegex(ValueError, "Expected initial state of size 1"):
+            simulate_closed_loop(mpc, plant, [1.0, 2.0], T)
+        with self.assertRaisesRegex(ValueError, "Invalid on_failure"):
+            simulate_closed_loop(mpc, plant, 5.0, T, on_failure="zero")
+
+    def test_simulate_closed_loop__holds_last_good_action_and_resets_forecasts(self):
+        N, T = 3, 4
+        mpc = Mpc(Nlp(), N)
+        mpc.state("x", 1)
+        u, _ = mpc.action("u", 1, lb=-1, ub=1)
+        r = mpc.parameter("r", (1, 1))
+        mpc.set_affine_dynamics(np.ones((1, 1)), np.ones((1, 1)))
+        x = mpc.states["x"]
+        mpc.constraint("x_ub", x, "<=", 2)  # infeasible once the drift pushes x over
+        mpc.minimize(cs.sumsqr(x - r) + cs.sumsqr(u))
+        mpc.init_solver(OPTS)
+        plant = lambda x, u: x + u + 1.5  # noqa: E731
+
+        res = simulate_closed_loop(
+            mpc,
+            plant,
+            0.0,
+            T,
+            {"r": 0.0},
+            forecasts=lambda k: {"r": -1.0} if k == 0 else {},
+            on_failure="hold",
+        )
+
+        np.testing.assert_array_equal(res.success, [True, True, True, False])
+        self.assertFalse(res.failed_action_applied.any())
+        np.testing.assert_array_equal(res.actions[3], res.actions[2])
+        # the forecast of the first step must not leak into the second one
+        sol = mpc.solve({"x_0": res.states[1], "r": 0.0})
+        u_1 = sol.vals["u"][:, 0].full().flatten()
+        np.testing.assert_allclose(res.actions[1], u_1, atol=1e-6)
+
+    @parameterized.expand(product(("map", "parallel"), (False, True)))
+    def test_simulate_closed_loop_ensemble__matches_single_loops(
+        self, mode: str, use_function: bool
+    ):
+        N, T, M = 5, 6, 4
+        A = np.asarray([[1.0, 0.1], [0.0, 1.0]])
+        B = np.asarray([[0.0], [0.1]])
+        mpc = Mpc(Nlp(), N, input_spacing=2)
+        mpc.state("x", 2)
+        u, _ = mpc.action("u", 1, lb=-1, ub=1)
+        r = mpc.parameter("r", (1, 1))
+        mpc.set_affine_dynamics(A, B)
+        x = mpc.states["x"]
+        _, _, slack = mpc.constraint("x_ub", x[0, :], "<=", 1.5, soft=True)
+        mpc.minimize(cs.sumsqr(x[0, :] - r) + cs.sumsqr(u) + 1e2 * cs.sum2(slack))
+        mpc.init_solver(OPTS)
+        if use_function:
+            x_, u_, d_ = cs.SX.sym("x", 2), cs.SX.sym("u", 1), cs.SX.sym("d", 2)
+            plant = cs.Function("F", [x_, u_, d_], [A @ x_ + B @ u_ + d_])
+        else:
+            plant = lambda x, u, d: A @ x + B @ u + d  # noqa: E731
+        np_random = np.random.default_rng(42)
+        x0 = np_random.normal(size=(M, 2))
+        D = np_random.normal(scale=0.01, size=(M, T, 2))
+        refs = np_random.uniform(size=(M, T))
+
+        res = simulate_closed_loop_ensemble(
+            mpc,
+            plant,
+            x0,
+            T,
+            forecasts=lambda i, k: {"r": refs[i, k]},
+            disturbances=D,
+            mode=mode,
+            parallel_kwargs={"n_jobs": 2},
+        )
+
+        self.assertEqual(res.states.shape, (M, T + 1, 2))
+        self.assertEqual(res.actions.shape, (M, T, 1))
+        self.assertEqual(res.costs.shape, (M, T))
+        self.assertTrue(res.success.all())
+        for i in range(M):
+            X = [x0[i]]
+            vals0 = duals0 = None
+            for k in range(T):
+                sol = mpc.solve({"x_0": X[-1], "r": refs[i, k]}, vals0, duals0)
+                vals0, duals0 = mpc.shift(sol)
+                u_k = sol.vals["u"][:, 0].full().flatten()
+                np.testing.assert_allclose(res.actions[i, k], u_k, atol=1e-6)
+                np.testing.assert_allclose(res.costs[i, k], float(sol.f), atol=1e-6)
+                X.append(np.asarray(plant(X[-1], u_k, D[i, k])).flatten())
+            np.testing.assert_allclose(res.states[i], X, atol=1e-6)
+
+    def test_simulate_closed_loop_ensemble__in_map_mode__flags_infeasible_solves(
+        self,
+    ):
+        mpc = Mpc(Nlp(), 3)
+        mpc.state("x", 1)
+        u, _ = mpc.action("u", 1, lb=-1, ub=1)
+        mpc.set_affine_dynamics(np.ones((1, 1)), np.ones((1, 1)))
+        x = mpc.states["x"]
+        mpc.constraint("x_ub", x, "<=", 2)  # infeasible from x0 = 5
+        mpc.minimize(cs.sumsqr(x) + cs.sumsqr(u))
+        mpc.init_solver(OPTS)
+        plant = lambda x, u: x + u  # noqa: E731
+
+        res = simulate_closed_loop_ensemble(mpc, plant, [[0.0], [5.0]], 2)
+
+        np.testing.assert_array_equal(res.success, [[True, True], [False, False]])
+
+    def test_simulate_closed_loop_ensemble__raises__with_unspecified_parameters(
+        self,
+    ):
+        mpc = Mpc(Nlp(), 3)
+        mpc.state("x", 1)
+        u, _ = mpc.action("u", 1)
+        r = mpc.parameter("r", (1, 1))
+        mpc.set_affine_dynamics(np.ones((1, 1)), np.ones((1, 1)))
+        mpc.minimize(cs.sumsqr(mpc.states["x"] - r) + cs.sumsqr(u))
+        plant = lambda x, u: x + u  # noqa: E731
+        with self.assertRaisesRegex(RuntimeError, "Solver uninitialized."):
+            simulate_closed_loop_ensemble(mpc, plant, np.zeros((2, 1)), 2)
+        mpc.init_solver(OPTS)
+        with self.assertRaisesRegex(RuntimeError, "unspecified parameters"):
+            simulate_closed_loop_ensemble(mpc, plant, np.zeros((2, 1)), 2)
+        with self.assertRaisesRegex(ValueError, "Expected initial states of shape"):
+            simulate_closed_loop_ensemble(mpc, plant, np.zeros(2), 2, {"r": 0})
+
     @parameterized.expand([("SX",), ("MX",)])
     def test_can_be_pickled(self, sym_type: str):
         N = 10